@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 from pathlib import Path
 import os
 from datetime import timedelta
+from celery.schedules import crontab
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -42,6 +43,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'core',
     'user',
     'rest_framework',
@@ -51,6 +53,8 @@ INSTALLED_APPS = [
     'team',
     'evaluation',
     'meeting',
+    'search',
+    'sync',
     'crispy_forms',
     'crispy_bootstrap5',
     'formset'
@@ -154,8 +158,22 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES':(
         'rest_framework_simplejwt.authentication.JWTAuthentication',
         ),
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.KeysetCursorPagination',
+    'PAGE_SIZE': 50,
+    # Reverse proxies in front of the app, whose X-Forwarded-For entries
+    # are trusted to find the client IP of throttles.
+    'NUM_PROXIES': int(os.environ.get('NUM_PROXIES', 0)),
 }
 
+API_MAX_PAGE_SIZE = 500
+TASK_BULK_MAX_SIZE = 5000
+TASK_BOARD_COLUMN_LIMIT = 20
+TASK_COMMENTS_PAGE_SIZE = 50
+SYNC_PAGE_SIZE = 500
+# Deletes are kept for sync this long, older tokens need a full sync.
+SYNC_TOMBSTONE_RETENTION_DAYS = 30
+EXPORT_CHUNK_SIZE = 2000
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=5),
     'REFRESH_TOKEN_LIFETIME': timedelta(minutes=5)
@@ -166,8 +184,64 @@ LOGOUT_REDIRECT_URL = 'home'
 CRISPY_ALLOWED_TEMPLATE_PACKS = 'bootstrap5'
 CRISPY_TEMPLATE_PACK = 'bootstrap5'
 
+if os.environ.get('REDIS_CACHE_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ.get('REDIS_CACHE_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+DASHBOARD_CACHE_TIMEOUT = 60 * 5
+WORKLOAD_CACHE_TIMEOUT = 60
+
+# Redis for change events streamed to clients, unset disables the stream.
+EVENTS_REDIS_URL = os.environ.get('EVENTS_REDIS_URL')
+EVENTS_QUEUE_SIZE = 100
+EVENTS_KEEPALIVE = 15
+EVENTS_RETRY_MS = 5000
+
+# Redis shared by throttles of all processes, unset keeps buckets in memory.
+THROTTLE_REDIS_URL = os.environ.get('THROTTLE_REDIS_URL')
+# Token bucket rates of writes per authenticated user, per client IP and
+# per submitted email.
+THROTTLE_RATES = {
+    'comment': {'user': '30/min', 'ip': '120/min'},
+    'task_create': {'user': '120/min', 'ip': '300/min'},
+    'meeting': {'user': '20/min', 'ip': '60/min'},
+    'login': {'ip': '10/min', 'email': '10/hour'},
+}
+
+# Runs tests without throttles, tests of them set THROTTLE_RATES.
+TEST_RUNNER = 'core.test_runner.TestRunner'
+
 CELERY_BROKER_URL = "redis://redis:6379/0"
 CELERY_RESULT_BACKEND = "redis://redis:6379/0"
+CELERY_BEAT_SCHEDULE = {
+    'send-agenda-digests': {
+        'task': 'core.tasks.send_agenda_digests',
+        'schedule': crontab(hour=7, minute=0),
+    },
+    # Upcoming meetings count from the start of the day.
+    'reconcile-user-stats': {
+        'task': 'core.tasks.reconcile_user_stats',
+        'schedule': crontab(hour=0, minute=5),
+    },
+    'prune-tombstones': {
+        'task': 'core.tasks.prune_tombstones',
+        'schedule': crontab(hour=0, minute=15),
+    },
+}
+
+# Digest emails sent per batch over the shared SMTP connection.
+DIGEST_CHUNK_SIZE = 100
+USER_STATS_BATCH_SIZE = 1000
 
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = 'smtp.gmail.com'
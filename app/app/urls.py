@@ -33,5 +33,7 @@ urlpatterns = [
     path('api/teams/', include('team.urls')),
     path('api/evaluations/', include('evaluation.urls')),
     path('api/meetings/', include('meeting.urls')),
+    path('api/search/', include('search.urls')),
+    path('api/sync/', include('sync.urls')),
     path('', include('core.urls'))
 ]
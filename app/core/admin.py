@@ -1,18 +1,70 @@
 """
 Django admin customation.
 """
-from django.contrib import admin
+import io
+from django.contrib import admin, messages
+from django.shortcuts import redirect, render
+from django.urls import path
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.translation import gettext_lazy as _
 from user.models import User
-from task.models import Task, Comment
+from task.models import Task, Comment, TaskEvent
 from team.models import Team
 from evaluation.models import Evaluation
 from meeting.models import Meeting
+from core.forms import CsvImportForm
+from core.html import sanitize_html
+from core.importers import read_header
+from core.tasks import import_csv_file
 
 
-class UserAdmin(BaseUserAdmin):
+class CsvImportMixin:
+    """Add a CSV upload page that imports rows in the background."""
+    change_list_template = 'admin/csv_import_change_list.html'
+    import_kind = None
+
+    def get_urls(self):
+        opts = self.model._meta
+        return [
+            path(
+                'import-csv/',
+                self.admin_site.admin_view(self.import_csv_view),
+                name=f'{opts.app_label}_{opts.model_name}_import_csv'
+            ),
+        ] + super().get_urls()
+
+    def import_csv_view(self, request):
+        """Validate uploaded CSV header and queue the import."""
+        form = CsvImportForm(request.POST or None, request.FILES or None)
+        if form.is_valid():
+            content = form.cleaned_data['file'].read().decode('utf-8-sig')
+            try:
+                read_header(self.import_kind, io.StringIO(content))
+            except ValueError as error:
+                form.add_error('file', str(error))
+            else:
+                import_csv_file.delay(
+                    self.import_kind, content, request.user.email)
+                self.message_user(
+                    request,
+                    'Import started, the report will be sent by email.',
+                    messages.SUCCESS
+                )
+                return redirect(
+                    f'admin:{self.opts.app_label}_'
+                    f'{self.opts.model_name}_changelist')
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.opts,
+            'form': form,
+            'title': f'Import {self.import_kind}',
+        }
+        return render(request, 'admin/csv_import.html', context)
+
+
+class UserAdmin(CsvImportMixin, BaseUserAdmin):
     """Define the admin pages for users."""
+    import_kind = 'users'
     ordering = ['id']
     list_display = ['email', 'name']
     fieldsets = (
@@ -50,14 +102,37 @@ class UserAdmin(BaseUserAdmin):
     )
 
 
-class TaskAdmin(admin.ModelAdmin):
+class TaskAdmin(CsvImportMixin, admin.ModelAdmin):
+    import_kind = 'tasks'
     list_display = ('description',)
     list_filter = ('status', 'deadline')
 
 
+class CommentAdmin(admin.ModelAdmin):
+    list_display = ('task', 'user', 'date')
+
+    def save_model(self, request, obj, form, change):
+        obj.text_html = sanitize_html(obj.text)
+        super().save_model(request, obj, form, change)
+
+
+class TaskEventAdmin(admin.ModelAdmin):
+    list_display = (
+        'task', 'from_status', 'to_status', 'assign_to', 'actor',
+        'created_at')
+    list_filter = ('to_status',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 admin.site.register(User, UserAdmin)
 admin.site.register(Task, TaskAdmin)
-admin.site.register(Comment)
+admin.site.register(TaskEvent, TaskEventAdmin)
+admin.site.register(Comment, CommentAdmin)
 admin.site.register(Team)
 admin.site.register(Evaluation)
 admin.site.register(Meeting)
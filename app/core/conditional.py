@@ -0,0 +1,101 @@
+"""
+Conditional GET support for API viewsets.
+"""
+from hashlib import md5
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+
+class ConditionalGetMixin:
+    """Answer list and detail requests with ETags and 304 responses.
+
+    The version of a resource is the `updated_at` of its rows, read with
+    one query before anything is serialized. Lists are tagged with the ids
+    and versions of the page they serve, read through the same index
+    range as the page itself, so deletes on the page change the tag too.
+    Details are tagged per row and also get `Last-Modified`. Related
+    rows rendered inline on detail are listed in `etag_related`, relations
+    whose rendered fields all bump the version of the resource in
+    `etag_expand`.
+    Other `?expand=` requests are always answered in full.
+    """
+    etag_related = ()
+    etag_expand = ()
+
+    def is_conditional(self):
+        """Return whether response is fully versioned by updated_at."""
+        expand = self.request.query_params.get('expand', '')
+        allowed = {*self.etag_related, *self.etag_expand}
+        return all(path.strip() in allowed
+                   for path in expand.split(',') if path.strip())
+
+    def get_etag(self, *parts):
+        """Return strong ETag for the requesting user and parts."""
+        key = ':'.join(str(part) for part in (
+            self.request.user.pk, self.request.get_full_path(), *parts))
+        return '"%s"' % md5(key.encode()).hexdigest()
+
+    def conditional_response(self, etag, last_modified=None):
+        """Return 304 response if client has current version."""
+        return get_conditional_response(
+            self.request._request, etag=etag,
+            last_modified=last_modified and int(last_modified.timestamp()))
+
+    def finalize_conditional(self, response, etag, last_modified=None):
+        """Set validators on a full or 304 response."""
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        patch_vary_headers(response, ['Authorization'])
+        return response
+
+    def list(self, request, *args, **kwargs):
+        if not self.is_conditional():
+            return super().list(request, *args, **kwargs)
+        etag = self.get_etag(*self.get_list_version(
+            self.filter_queryset(self.get_queryset())),
+            *self.get_list_extra_version())
+        response = self.conditional_response(etag) or \
+            super().list(request, *args, **kwargs)
+        return self.finalize_conditional(response, etag)
+
+    def get_list_version(self, queryset):
+        """Return (id, updated_at) of served rows and page links."""
+        queryset = queryset.prefetch_related(None).values_list(
+            'pk', 'updated_at')
+        if self.paginator is None:
+            return list(queryset.order_by('pk'))
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(queryset, self.request, view=self)
+        if page is None:
+            return list(queryset.order_by('pk'))
+        return [*page, paginator.has_previous, paginator.has_next]
+
+    def get_list_extra_version(self):
+        """Return versions of list data not read from the served rows."""
+        return ()
+
+    def retrieve(self, request, *args, **kwargs):
+        if not self.is_conditional():
+            return super().retrieve(request, *args, **kwargs)
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}).order_by()
+        aggregates = {'updated_at': Max('updated_at')}
+        for related in self.etag_related:
+            aggregates[f'{related}_updated_at'] = Max(
+                f'{related}__updated_at')
+            aggregates[f'{related}_count'] = Count(related, distinct=True)
+        version = queryset.aggregate(**aggregates)
+        if version['updated_at'] is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        last_modified = max(
+            value for key, value in version.items()
+            if key.endswith('updated_at') and value is not None)
+        etag = self.get_etag(*version.values())
+        response = self.conditional_response(etag, last_modified) or \
+            super().retrieve(request, *args, **kwargs)
+        return self.finalize_conditional(response, etag, last_modified)
@@ -0,0 +1,86 @@
+"""
+Daily agenda digests built for every user with set-based queries.
+"""
+from datetime import date, datetime, time, timedelta
+from itertools import islice
+from typing import Dict, Iterator, List, Optional
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from meeting.models import Meeting
+from task.models import Task
+from user.models import User
+
+
+def build_agendas(day: date) -> Dict[int, dict]:
+    """Return agendas of users who want a digest and have anything due.
+
+    Four queries cover the whole company whatever its size: recipients,
+    open tasks due by day, meetings on day and done tasks awaiting
+    evaluation by their creator.
+    """
+    recipients = User.objects.filter(
+        is_active=True, receive_digest=True).exclude(email='')
+    agendas = {
+        row['id']: {**row, 'tasks': [], 'meetings': [], 'to_evaluate': []}
+        for row in recipients.values('id', 'email', 'name')
+    }
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    end = start + timedelta(days=1)
+
+    sections = (
+        ('tasks', 'assign_to_id', Task.objects.filter(
+            assign_to__in=recipients, deadline__lte=day
+            ).exclude(status='done').order_by('deadline', 'id').values(
+                'assign_to_id', 'id', 'description', 'deadline', 'status')),
+        ('meetings', 'user_id', Meeting.participants.through.objects.filter(
+            user__in=recipients, meeting__date__gte=start,
+            meeting__date__lt=end
+            ).order_by('meeting__date', 'meeting_id').values(
+                'user_id', 'meeting_id', 'meeting__title', 'meeting__date')),
+        ('to_evaluate', 'user_id', Task.objects.filter(
+            user__in=recipients, status='done', evaluation=None
+            ).order_by('deadline', 'id').values(
+                'user_id', 'id', 'description', 'deadline')),
+    )
+    for section, owner, rows in sections:
+        for row in rows.iterator():
+            agendas[row[owner]][section].append(row)
+
+    return {
+        pk: agenda for pk, agenda in agendas.items()
+        if agenda['tasks'] or agenda['meetings'] or agenda['to_evaluate']
+    }
+
+
+def build_digest(agenda: dict, day: date) -> EmailMessage:
+    """Return digest email of one agenda."""
+    body = render_to_string(
+        'emails/agenda_digest.txt', {'agenda': agenda, 'day': day})
+    return EmailMessage(
+        subject=f'Your agenda for {day:%d %B %Y}',
+        body=body,
+        from_email=settings.EMAIL_HOST_USER,
+        to=[agenda['email']],
+    )
+
+
+def chunked(items: Iterator, size: int) -> Iterator[List]:
+    """Yield lists of up to size items."""
+    while chunk := list(islice(items, size)):
+        yield chunk
+
+
+def send_agenda_digests(day: Optional[date] = None) -> int:
+    """Send agenda digests over one SMTP connection, return count sent."""
+    day = day or timezone.localdate()
+    agendas = build_agendas(day)
+    messages = (build_digest(agenda, day) for agenda in agendas.values())
+    sent = 0
+    with get_connection() as connection:
+        for chunk in chunked(messages, settings.DIGEST_CHUNK_SIZE):
+            sent += connection.send_messages(chunk) or 0
+    return sent
@@ -0,0 +1,69 @@
+"""
+Streaming export of querysets to CSV and NDJSON.
+"""
+import csv
+import json
+from typing import Dict, Iterator
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models.query import QuerySet
+from django.http import StreamingHttpResponse
+
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+EXPORT_FORMATS = '|'.join(CONTENT_TYPES)
+
+
+class Echo:
+    """File-like object that returns written value instead of storing it."""
+    def write(self, value):
+        return value
+
+
+def csv_lines(fields: Dict, rows: Iterator) -> Iterator[str]:
+    """Yield CSV header and rows."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow(
+            ' '.join(map(str, v)) if isinstance(v, list) else v
+            for v in row)
+
+
+def ndjson_lines(fields: Dict, rows: Iterator) -> Iterator[str]:
+    """Yield one JSON object per row."""
+    for row in rows:
+        yield json.dumps(dict(zip(fields, row)), cls=DjangoJSONEncoder) + '\n'
+
+
+def export_chunks(queryset: QuerySet, fields: Dict,
+                  file_format: str) -> Iterator[str]:
+    """Yield exported rows joined into chunks."""
+    rows = queryset.values_list(*fields.values()).iterator(
+        chunk_size=settings.EXPORT_CHUNK_SIZE)
+    lines = csv_lines if file_format == 'csv' else ndjson_lines
+    chunk = []
+    for line in lines(fields, rows):
+        chunk.append(line)
+        if len(chunk) >= settings.EXPORT_CHUNK_SIZE:
+            yield ''.join(chunk)
+            chunk = []
+    if chunk:
+        yield ''.join(chunk)
+
+
+def stream_export(queryset: QuerySet, fields: Dict, file_format: str,
+                  name: str) -> StreamingHttpResponse:
+    """Return response streaming queryset rows in constant memory.
+
+    `fields` maps output column names to queryset lookups.
+    """
+    response = StreamingHttpResponse(
+        export_chunks(queryset, fields, file_format),
+        content_type=CONTENT_TYPES[file_format])
+    response['Content-Disposition'] = \
+        f'attachment; filename="{name}.{file_format}"'
+    return response
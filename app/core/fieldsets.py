@@ -0,0 +1,151 @@
+"""
+Sparse fieldsets and opt-in expansion of nested relations.
+"""
+from django.conf import settings
+from django.db.models import F, Prefetch, Window, prefetch_related_objects
+from django.db.models.functions import RowNumber
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+def split_names(value):
+    """Return list of names from comma separated value or None."""
+    if value is None:
+        return None
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def nested_expand(expand, name):
+    """Return expansions below relation name."""
+    prefix = f'{name}.'
+    return [path[len(prefix):] for path in expand or []
+            if path.startswith(prefix)]
+
+
+class ExpandableFieldsMixin:
+    """Render relations as ids unless expanded and allow picking fields.
+
+    `expandable_fields` maps a relation to the serializer used when the
+    relation is listed in `expand`, dotted paths expand deeper levels.
+    `fields` keeps only the given top level fields. `related_limits` maps
+    a many relation to the setting holding how many of its newest rows
+    are rendered.
+    """
+    expandable_fields = {}
+    related_limits = {}
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.requested_fields = fields
+        self.expand = expand or []
+
+    def is_expanded(self, name):
+        return any(path.split('.')[0] == name for path in self.expand)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        for name, serializer_class in self.expandable_fields.items():
+            relation = self.Meta.model._meta.get_field(name)
+            many = relation.many_to_many or relation.one_to_many
+            if self.is_expanded(name):
+                fields[name] = serializer_class(
+                    many=many, read_only=True,
+                    expand=nested_expand(self.expand, name))
+            else:
+                fields[name] = serializers.PrimaryKeyRelatedField(
+                    many=many, read_only=True)
+        if self.requested_fields is not None:
+            unknown = set(self.requested_fields) - set(fields)
+            if unknown:
+                raise serializers.ValidationError({'fields': [
+                    f'Unknown field "{name}".' for name in sorted(unknown)]})
+            fields = {name: field for name, field in fields.items()
+                      if name in self.requested_fields}
+        return fields
+
+    def to_representation(self, instance):
+        """Load limited relations of an instance read without them."""
+        cache = getattr(instance, '_prefetched_objects_cache', {})
+        missing = [
+            self.get_prefetch(type(instance), name, self.is_expanded(name),
+                              nested_expand(self.expand, name))
+            for name in self.related_limits
+            if name in self.fields and name not in cache
+        ]
+        if missing:
+            prefetch_related_objects([instance], *missing)
+        return super().to_representation(instance)
+
+    @classmethod
+    def optimize_queryset(cls, queryset, fields=None, expand=None,
+                          link_fields=()):
+        """Return queryset reading only columns and relations rendered."""
+        model = queryset.model
+        serializer = cls(fields=fields, expand=expand)
+        rendered = serializer.get_fields()
+        concrete = {field.name for field in model._meta.concrete_fields}
+        only = {model._meta.pk.name, *link_fields}
+        prefetches = []
+        for name, field in rendered.items():
+            if field.write_only:
+                continue
+            source = field.source or name
+            if name in cls.expandable_fields:
+                prefetches.append(cls.get_prefetch(
+                    model, name, serializer.is_expanded(name),
+                    nested_expand(serializer.expand, name)))
+            elif source in concrete:
+                only.add(source)
+        return queryset.only(*only).prefetch_related(*prefetches)
+
+    @classmethod
+    def get_prefetch(cls, model, name, expanded, expand):
+        """Return prefetch of relation reading ids or nested fields."""
+        relation = model._meta.get_field(name)
+        related_model = relation.related_model
+        link_fields = [relation.field.name] if relation.one_to_many else []
+        queryset = related_model.objects.all()
+        if expanded:
+            queryset = cls.expandable_fields[name].optimize_queryset(
+                queryset, expand=expand, link_fields=link_fields)
+        else:
+            queryset = queryset.only(
+                related_model._meta.pk.name, *link_fields)
+        if name in cls.related_limits:
+            # A window instead of a slice, the relation manager has to
+            # filter the queryset further.
+            queryset = queryset.annotate(position=Window(
+                RowNumber(), partition_by=F(relation.field.name),
+                order_by=F('pk').desc(),
+            )).filter(
+                position__lte=getattr(settings, cls.related_limits[name])
+            ).order_by('-pk')
+        return Prefetch(name, queryset=queryset)
+
+
+class SparseFieldsetMixin:
+    """Pass `?fields=` and `?expand=` to serializer and queryset."""
+    sparse_actions = ('list', 'retrieve')
+
+    def get_fieldset_params(self):
+        return {
+            'fields': split_names(self.request.query_params.get('fields')),
+            'expand': split_names(self.request.query_params.get('expand')),
+        }
+
+    def get_serializer(self, *args, **kwargs):
+        serializer_class = self.get_serializer_class()
+        if self.request.method in SAFE_METHODS and \
+                issubclass(serializer_class, ExpandableFieldsMixin):
+            for key, value in self.get_fieldset_params().items():
+                kwargs.setdefault(key, value)
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        serializer_class = self.get_serializer_class()
+        if getattr(self, 'action', None) in self.sparse_actions and \
+                issubclass(serializer_class, ExpandableFieldsMixin):
+            queryset = serializer_class.optimize_queryset(
+                queryset, **self.get_fieldset_params())
+        return queryset
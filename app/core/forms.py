@@ -4,6 +4,7 @@ from meeting.models import Meeting
 from task.models import Task, Comment
 from evaluation.models import Evaluation
 from formset.widgets import DateTimeTextbox, DateTextbox
+from core.html import sanitize_html
 
 
 class TeamForm(forms.Form):
@@ -54,9 +55,19 @@ class CommentForm(forms.ModelForm):
             'test': forms.Textarea(attrs={'rows': 4, 'cols': 4})
         }
 
+    def clean(self):
+        cleaned_data = super().clean()
+        if 'text' in cleaned_data:
+            self.instance.text_html = sanitize_html(cleaned_data['text'])
+        return cleaned_data
+
 
 class EvaluationForm(forms.ModelForm):
 
     class Meta:
         model = Evaluation
         exclude = ['user', 'task_id']
+
+
+class CsvImportForm(forms.Form):
+    file = forms.FileField(label='CSV file')
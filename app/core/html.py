@@ -0,0 +1,19 @@
+"""
+Allowlist sanitizing of HTML written by users.
+"""
+import nh3
+
+ALLOWED_TAGS = {
+    'a', 'b', 'blockquote', 'br', 'code', 'em', 'h1', 'h2', 'h3', 'h4',
+    'hr', 'i', 'li', 'ol', 'p', 'pre', 's', 'strong', 'sub', 'sup', 'u',
+    'ul',
+}
+ALLOWED_ATTRIBUTES = {'a': {'href', 'title'}}
+URL_SCHEMES = {'http', 'https', 'mailto'}
+
+
+def sanitize_html(text: str) -> str:
+    """Return text without tags, attributes and urls off the allowlist."""
+    return nh3.clean(
+        text, tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRIBUTES,
+        url_schemes=URL_SCHEMES, link_rel='noopener noreferrer nofollow')
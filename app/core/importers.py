@@ -0,0 +1,241 @@
+"""
+Bulk import of users and tasks from CSV files.
+
+Rows are loaded with PostgreSQL COPY into a temporary staging table,
+validated and resolved with set-based SQL and merged into the model
+tables in one transaction. Rejected rows are reported with the CSV line
+number and the reason.
+"""
+import csv
+from typing import Dict, IO, List
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+
+from core.services import (
+    invalidate_dashboards, invalidate_task_dashboards,
+    invalidate_team_workload, refresh_user_stats
+)
+
+IMPORT_COLUMNS = {
+    'users': ['email', 'name', 'team', 'is_manager', 'password'],
+    'tasks': ['description', 'deadline', 'status', 'creator', 'assign_to'],
+}
+REQUIRED_COLUMNS = {
+    'users': {'email'},
+    'tasks': {'description', 'deadline'},
+}
+
+# Temporary functions live as long as the connection, not the transaction.
+TRY_DATE_SQL = """
+CREATE OR REPLACE FUNCTION pg_temp.try_date(value text) RETURNS date
+LANGUAGE plpgsql IMMUTABLE AS $$
+BEGIN
+    RETURN value::date;
+EXCEPTION WHEN others THEN
+    RETURN NULL;
+END
+$$
+"""
+
+USER_CHECKS = [
+    ("email IS NULL OR email !~ '^[^@[:space:]]+@[^@[:space:]]+$'",
+     'Invalid email.'),
+    ("""line > (SELECT min(s.line) FROM import_users s
+                WHERE s.email = import_users.email)""",
+     'Duplicate email in file.'),
+    ("""team IS NOT NULL AND team_id IS NULL""",
+     'Unknown team.'),
+    ("""lower(coalesce(is_manager, 'false')) NOT IN
+        ('true', 'false', '1', '0', 'yes', 'no')""",
+     'is_manager must be true or false.'),
+    ("length(password) < 5", 'Password must have at least 5 characters.'),
+]
+
+TASK_CHECKS = [
+    ("description IS NULL", 'Description is required.'),
+    ("pg_temp.try_date(deadline) IS NULL", 'Invalid deadline.'),
+    ("""lower(coalesce(status, 'opened')) NOT IN
+        ('opened', 'in_progress', 'in progress', 'done')""",
+     'Invalid status.'),
+    ("creator IS NOT NULL AND user_id IS NULL", 'Unknown creator.'),
+    ("assign_to IS NOT NULL AND assign_to_id IS NULL",
+     'Unknown assignee.'),
+]
+
+
+def read_header(kind: str, file: IO) -> List[str]:
+    """Read and validate CSV header, return staging columns."""
+    header = next(csv.reader([file.readline()]), [])
+    columns = [column.strip().lower() for column in header]
+    unknown = set(columns) - set(IMPORT_COLUMNS[kind])
+    if unknown:
+        raise ValueError(f'Unknown columns: {", ".join(sorted(unknown))}.')
+    missing = REQUIRED_COLUMNS[kind] - set(columns)
+    if missing:
+        raise ValueError(f'Missing columns: {", ".join(sorted(missing))}.')
+    return columns
+
+
+def copy_to_staging(cursor, kind: str, file: IO):
+    """Create staging table for kind and COPY file rows into it."""
+    columns = read_header(kind, file)
+    table = f'import_{kind}'
+    # ON COMMIT DROP does not fire when called inside an outer transaction.
+    cursor.execute(f'DROP TABLE IF EXISTS pg_temp.{table}')
+    cursor.execute(
+        f'CREATE TEMP TABLE {table} (line serial, '
+        + ', '.join(f'{c} text' for c in IMPORT_COLUMNS[kind])
+        + ', error text) ON COMMIT DROP')
+    cursor.copy_expert(
+        f'COPY {table} ({", ".join(columns)}) '
+        "FROM STDIN WITH (FORMAT csv, NULL '')", file)
+
+
+def reject(cursor, table: str, checks: List):
+    """Mark rows failing checks with the first error found."""
+    for condition, message in checks:
+        cursor.execute(
+            f'UPDATE {table} SET error = %s '
+            f'WHERE error IS NULL AND ({condition})', [message])
+
+
+def rejected_rows(cursor, table: str) -> List:
+    """Return (CSV line, error) pairs of rejected rows."""
+    cursor.execute(
+        f'SELECT line + 1, error FROM {table} '
+        'WHERE error IS NOT NULL ORDER BY line')
+    return cursor.fetchall()
+
+
+def hash_passwords(cursor):
+    """Replace passwords of valid staged users with their hashes."""
+    cursor.execute(
+        'SELECT line, password FROM import_users '
+        'WHERE error IS NULL AND password IS NOT NULL')
+    cursor.executemany(
+        'UPDATE import_users SET password = %s WHERE line = %s',
+        [(make_password(password), line)
+         for line, password in cursor.fetchall()])
+
+
+def import_users(file: IO) -> Dict:
+    """Create or update users from CSV and return import report.
+
+    Users created without a password get an unusable one and cannot log
+    in until it is set, their count is reported as `without_password`.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        copy_to_staging(cursor, 'users', file)
+        cursor.execute("""
+            ALTER TABLE import_users
+                ADD COLUMN team_id bigint, ADD COLUMN manager boolean;
+            UPDATE import_users SET
+                email = split_part(trim(email), '@', 1) || '@'
+                    || lower(split_part(trim(email), '@', 2)),
+                team_id = (SELECT min(t.id) FROM team_team t
+                           WHERE t.name = trim(import_users.team))
+        """)
+        reject(cursor, 'import_users', USER_CHECKS)
+        cursor.execute("""
+            UPDATE import_users SET
+                manager = lower(is_manager) IN ('true', '1', 'yes')
+            WHERE error IS NULL
+        """)
+        hash_passwords(cursor)
+        cursor.execute("""
+            INSERT INTO user_user (
+                password, is_superuser, email, name, is_manager,
+                is_staff, is_active, receive_digest, team_id)
+            SELECT coalesce(password, '!' || md5(random()::text)), false,
+                email, coalesce(name, ''), coalesce(manager, false),
+                false, true, true, team_id
+            FROM import_users WHERE error IS NULL
+            ON CONFLICT (email) DO UPDATE SET
+                name = CASE WHEN EXCLUDED.name = '' THEN user_user.name
+                            ELSE EXCLUDED.name END,
+                -- A blank or missing is_manager keeps the current role.
+                is_manager = coalesce((
+                    SELECT s.manager FROM import_users s
+                    WHERE s.email = EXCLUDED.email AND s.error IS NULL
+                ), user_user.is_manager),
+                team_id = coalesce(EXCLUDED.team_id, user_user.team_id),
+                -- So does a blank password.
+                password = coalesce((
+                    SELECT s.password FROM import_users s
+                    WHERE s.email = EXCLUDED.email AND s.error IS NULL
+                ), user_user.password)
+            RETURNING id, password LIKE '!%'
+        """)
+        rows = cursor.fetchall()
+        user_ids = [user_id for user_id, _ in rows]
+        report = {
+            'imported': len(user_ids),
+            'without_password': sum(unusable for _, unusable in rows),
+            'rejected': rejected_rows(cursor, 'import_users'),
+        }
+        invalidate_dashboards(user_ids)
+        cursor.execute(
+            'SELECT id FROM user_user WHERE is_superuser AND id <> ALL(%s)',
+            [user_ids])
+        invalidate_dashboards(row[0] for row in cursor.fetchall())
+        invalidate_team_workload()
+        refresh_user_stats(user_ids)
+    return report
+
+
+def import_tasks(file: IO) -> Dict:
+    """Create tasks from CSV and return import report."""
+    with transaction.atomic(), connection.cursor() as cursor:
+        copy_to_staging(cursor, 'tasks', file)
+        cursor.execute(TRY_DATE_SQL)
+        cursor.execute("""
+            ALTER TABLE import_tasks
+                ADD COLUMN user_id bigint, ADD COLUMN assign_to_id bigint;
+            UPDATE import_tasks SET
+                user_id = (SELECT u.id FROM user_user u
+                           WHERE lower(u.email) = lower(trim(creator))),
+                assign_to_id = (SELECT u.id FROM user_user u
+                                WHERE lower(u.email) = lower(trim(assign_to)))
+        """)
+        reject(cursor, 'import_tasks', TASK_CHECKS)
+        cursor.execute("""
+            INSERT INTO task_task (
+                description, status, deadline, user_id, assign_to_id,
+                updated_at, comment_count, last_activity_at)
+            SELECT description,
+                replace(lower(coalesce(status, 'opened')), ' ', '_'),
+                pg_temp.try_date(deadline), user_id, assign_to_id, now(),
+                0, now()
+            FROM import_tasks WHERE error IS NULL
+            ORDER BY line
+            RETURNING user_id, assign_to_id
+        """)
+        owners = set(cursor.fetchall())
+        report = {
+            'imported': cursor.rowcount,
+            'rejected': rejected_rows(cursor, 'import_tasks'),
+        }
+        for user_id, assign_to_id in owners:
+            invalidate_task_dashboards(user_id, assign_to_id)
+        refresh_user_stats(
+            {assign_to_id for _, assign_to_id in owners if assign_to_id})
+    return report
+
+
+IMPORTERS = {
+    'users': import_users,
+    'tasks': import_tasks,
+}
+
+
+def format_report(kind: str, report: Dict) -> str:
+    """Return import report as plain text."""
+    lines = [f'Imported {report["imported"]} {kind}, '
+             f'rejected {len(report["rejected"])} rows.']
+    if report.get('without_password'):
+        lines.append(
+            f'{report["without_password"]} users have no password and '
+            'cannot log in until one is set in the Admin panel.')
+    lines += [f'Line {line}: {error}' for line, error in report['rejected']]
+    return '\n'.join(lines)
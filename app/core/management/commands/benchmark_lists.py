@@ -0,0 +1,95 @@
+"""
+Django command to compare list serialization with the values() fast path.
+"""
+import time
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from core.values import build_rows, compile_row_converters
+from evaluation.models import Evaluation
+from evaluation.serializers import EvaluationSerializer
+from task.models import Task, Comment
+from task.serializers import TaskSerializer, CommentSerializer
+
+
+class Command(BaseCommand):
+    """Django command to benchmark list serialization."""
+    help = 'Check output parity and speed of the values() list path.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        """Entry point for command."""
+        with transaction.atomic():
+            self.create_rows(options['rows'])
+            for serializer_class, queryset in (
+                (TaskSerializer, Task.objects.order_by('-id')),
+                (CommentSerializer, Comment.objects.order_by('-id')),
+                (EvaluationSerializer, Evaluation.objects.order_by('-id')),
+            ):
+                self.compare(serializer_class, queryset, options['repeat'])
+            transaction.set_rollback(True)
+
+    def create_rows(self, rows):
+        """Create sample tasks, comments and evaluations."""
+        self.stdout.write(f'Creating {rows} rows of each model...')
+        user = get_user_model().objects.create_user(
+            email='benchmark@example.com', is_manager=True)
+        statuses = [status for status, _ in Task.task_status]
+        tasks = Task.objects.bulk_create([
+            Task(
+                user=user,
+                description=f'Benchmark task {i}',
+                status=statuses[i % len(statuses)],
+                deadline=date.today() + timedelta(days=i % 60),
+                assign_to=user if i % 2 else None,
+            ) for i in range(rows)
+        ], batch_size=2000)
+        Comment.objects.bulk_create([
+            Comment(user=user, task=task, text=f'Comment {task.id}')
+            for task in tasks
+        ], batch_size=2000)
+        Evaluation.objects.bulk_create([
+            Evaluation(user=user, task_id=task, grade=task.id % 5 + 1)
+            for task in tasks
+        ], batch_size=2000)
+
+    def compare(self, serializer_class, queryset, repeat):
+        """Time both paths and fail if their JSON differs."""
+        serializer = serializer_class(many=True)
+        converters = compile_row_converters(serializer.child, queryset.model)
+        if converters is None:
+            raise CommandError(
+                f'{serializer_class.__name__} has no values() path.')
+        lookups = {lookup for lookup, _, _ in converters}
+
+        model_time, model_data = self.measure(repeat, lambda: serializer_class(
+            list(queryset), many=True).data)
+        values_time, values_data = self.measure(repeat, lambda: build_rows(
+            queryset.values(*lookups), converters))
+
+        renderer = JSONRenderer()
+        if renderer.render(model_data) != renderer.render(values_data):
+            raise CommandError(
+                f'{serializer_class.__name__} output differs.')
+        self.stdout.write(
+            f'{serializer_class.__name__}: {len(values_data)} rows, '
+            f'serializer {model_time * 1000:.0f} ms, '
+            f'values {values_time * 1000:.0f} ms, '
+            f'{model_time / values_time:.1f}x faster')
+
+    def measure(self, repeat, func):
+        """Return best time of repeat runs and the last result."""
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
@@ -0,0 +1,28 @@
+"""
+Django command to bulk import users or tasks from a CSV file.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DataError
+from core.importers import IMPORTERS, format_report
+
+
+class Command(BaseCommand):
+    """Django command to import CSV file with COPY."""
+    help = 'Import users or tasks from CSV file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(IMPORTERS))
+        parser.add_argument('path')
+
+    def handle(self, *args, **options):
+        """Entry point for command."""
+        kind = options['kind']
+        try:
+            with open(options['path'], newline='',
+                      encoding='utf-8-sig') as file:
+                report = IMPORTERS[kind](file)
+        except (OSError, ValueError, DataError) as error:
+            raise CommandError(error)
+        self.stdout.write(format_report(kind, report))
+        if not report['rejected']:
+            self.stdout.write(self.style.SUCCESS('Import finished!'))
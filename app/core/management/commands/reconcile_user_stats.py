@@ -0,0 +1,17 @@
+"""
+Django command to rebuild user stats from tasks, evaluations and meetings.
+"""
+from django.core.management.base import BaseCommand
+
+from core.services import refresh_user_stats
+
+
+class Command(BaseCommand):
+    """Django command to reconcile user stats."""
+    help = 'Rebuild every user stats row set-wise from the source tables.'
+
+    def handle(self, *args, **options):
+        """Entry point for command."""
+        count = refresh_user_stats()
+        self.stdout.write(self.style.SUCCESS(
+            f'Reconciled stats of {count} users.'))
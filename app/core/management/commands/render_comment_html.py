@@ -0,0 +1,36 @@
+"""
+Django command to store sanitized HTML of existing comments.
+"""
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.html import sanitize_html
+from task.models import Comment
+
+
+class Command(BaseCommand):
+    """Django command to backfill comment text_html in batches."""
+    help = 'Render sanitized text_html of comments that do not have it.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--all', action='store_true',
+                            help='Render again comments already rendered.')
+
+    def handle(self, *args, **options):
+        """Entry point for command."""
+        comments = Comment.objects.only('id', 'text').order_by('id')
+        if not options['all']:
+            comments = comments.filter(text_html='')
+        last_id = 0
+        rendered = 0
+        while batch := list(comments.filter(
+                id__gt=last_id)[:options['batch_size']]):
+            now = timezone.now()
+            for comment in batch:
+                comment.text_html = sanitize_html(comment.text)
+                comment.updated_at = now
+            Comment.objects.bulk_update(batch, ['text_html', 'updated_at'])
+            last_id = batch[-1].id
+            rendered += len(batch)
+        self.stdout.write(self.style.SUCCESS(f'Rendered {rendered} comments.'))
@@ -0,0 +1,266 @@
+"""
+Django command to stress the claim, complete and evaluate task flows.
+"""
+import logging
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.messages import get_messages
+from django.core.management.base import BaseCommand, CommandError
+from django.core.signals import got_request_exception
+from django.db import IntegrityError, OperationalError, connection
+from django.test import Client
+from django.test.utils import (
+    setup_test_environment, teardown_test_environment
+)
+from django.urls import reverse
+from django.utils import timezone
+
+from evaluation.models import Evaluation
+from task.models import Task
+from team.models import Team
+
+OPERATIONS = ('take_task', 'mark_task_as_done', 'evaluate_task')
+
+# The request signal is global, so exceptions are kept per thread.
+request_errors = threading.local()
+
+
+def store_request_error(sender, **kwargs):
+    request_errors.error = sys.exc_info()[1]
+
+
+def percentile(values, share):
+    """Return value below which share of sorted values fall."""
+    if not values:
+        return 0
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+class Stats:
+    """Thread safe collector of request outcomes and latencies."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.outcomes = defaultdict(lambda: defaultdict(int))
+        self.claims = defaultdict(list)
+
+    def record(self, operation, outcome, elapsed):
+        with self.lock:
+            self.latencies[operation].append(elapsed)
+            self.outcomes[operation][outcome] += 1
+
+    def record_claim(self, task_id, user_id):
+        with self.lock:
+            self.claims[task_id].append(user_id)
+
+
+class Command(BaseCommand):
+    """Django command to benchmark concurrent task writes."""
+    help = ('Drive take_task, mark_task_as_done and evaluate_task from many '
+            'threads and report throughput, latency and anomalies.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, default=200)
+        parser.add_argument('--managers', type=int, default=5)
+        parser.add_argument('--tasks', type=int, default=400)
+        parser.add_argument('--attempts', type=int, default=5,
+                            help='Claims each employee tries.')
+        parser.add_argument('--concurrency', type=int, default=50,
+                            help='Threads, keep below max_connections.')
+        parser.add_argument('--seed', type=int, default=None)
+        parser.add_argument('--strict', action='store_true',
+                            help='Fail on deadlocks and integrity errors.')
+
+    def handle(self, *args, **options):
+        """Entry point for command."""
+        self.random = random.Random(options['seed'])
+        try:
+            setup_test_environment()
+            own_environment = True
+        except RuntimeError:
+            own_environment = False
+        prefix = f'stress-{uuid.uuid4().hex[:8]}'
+        request_logger = logging.getLogger('django.request')
+        log_level = request_logger.level
+        request_logger.setLevel(logging.CRITICAL)
+        got_request_exception.connect(store_request_error)
+        try:
+            manager, employees = self.create_data(prefix, options)
+            stats = Stats()
+            elapsed = self.run(manager, employees, stats, options)
+            lost_updates = self.count_lost_updates(stats)
+            self.report(stats, elapsed, lost_updates)
+        finally:
+            self.delete_data(prefix)
+            got_request_exception.disconnect(store_request_error)
+            request_logger.setLevel(log_level)
+            if own_environment:
+                teardown_test_environment()
+
+        errors = sum(outcomes['integrity_error'] + outcomes['deadlock']
+                     for outcomes in stats.outcomes.values())
+        if lost_updates:
+            raise CommandError(f'{lost_updates} lost updates.')
+        if options['strict'] and errors:
+            raise CommandError(f'{errors} deadlocks or integrity errors.')
+
+    def create_data(self, prefix, options):
+        """Create team, employees and unassigned tasks."""
+        users = get_user_model().objects
+        manager = users.create_user(
+            email=f'{prefix}-manager@example.com', is_manager=True)
+        team = Team.objects.create(name=prefix[:25], manager=manager)
+        employees = users.bulk_create([
+            get_user_model()(
+                email=f'{prefix}-{i}@example.com', name=f'Employee {i}',
+                team=team, password='!')
+            for i in range(options['employees'])
+        ])
+        deadline = timezone.localdate()
+        Task.objects.bulk_create([
+            Task(user=manager, description=f'{prefix} task {i}',
+                 deadline=deadline + timedelta(days=i % 30))
+            for i in range(options['tasks'])
+        ])
+        return manager, employees
+
+    def delete_data(self, prefix):
+        """Delete everything the run created."""
+        Task.objects.filter(description__startswith=prefix).delete()
+        get_user_model().objects.filter(email__startswith=prefix).delete()
+        Team.objects.filter(name=prefix[:25]).delete()
+
+    def run(self, manager, employees, stats, options):
+        """Run employee and manager flows concurrently, return seconds."""
+        task_ids = list(Task.objects.filter(
+            user=manager).values_list('id', flat=True))
+        done = threading.Event()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(options['concurrency']) as pool:
+            evaluators = [
+                pool.submit(self.manager_flow, manager, stats, done)
+                for _ in range(min(options['managers'],
+                                   options['concurrency'] - 1))
+            ]
+            workers = [
+                pool.submit(self.employee_flow, employee, task_ids,
+                            options['attempts'], stats)
+                for employee in employees
+            ]
+            for future in workers:
+                future.result()
+            done.set()
+            for future in evaluators:
+                future.result()
+        return time.perf_counter() - start
+
+    def request(self, stats, operation, send):
+        """Send request, record outcome and return response or None."""
+        request_errors.error = None
+        start = time.perf_counter()
+        response = send()
+        elapsed = time.perf_counter() - start
+        error = request_errors.error
+        if isinstance(error, IntegrityError):
+            outcome = 'integrity_error'
+        elif isinstance(error, OperationalError):
+            outcome = 'deadlock' if 'deadlock' in str(error) else \
+                'operational_error'
+        elif response.status_code >= 400:
+            outcome = 'http_error'
+        else:
+            outcome = 'ok'
+        stats.record(operation, outcome, elapsed)
+        return response if outcome == 'ok' else None
+
+    def employee_flow(self, employee, task_ids, attempts, stats):
+        """Claim random tasks and complete the ones won."""
+        client = Client(raise_request_exception=False)
+        client.force_login(employee)
+        try:
+            for _ in range(attempts):
+                task_id = self.random.choice(task_ids)
+                response = self.request(
+                    stats, 'take_task',
+                    lambda: client.get(reverse('take_task', args=[task_id])))
+                if response is None or any(
+                        message.level_tag == 'error'
+                        for message in get_messages(response.wsgi_request)):
+                    continue
+                stats.record_claim(task_id, employee.id)
+                self.request(
+                    stats, 'mark_task_as_done',
+                    lambda: client.get(reverse('task_done', args=[task_id])))
+        finally:
+            connection.close()
+
+    def manager_flow(self, manager, stats, done):
+        """Evaluate done tasks until employees are finished."""
+        client = Client(raise_request_exception=False)
+        client.force_login(manager)
+        try:
+            while True:
+                finished = done.is_set()
+                task_ids = list(Task.objects.filter(
+                    user=manager, status='done', evaluation=None
+                ).values_list('id', flat=True)[:20])
+                for task_id in task_ids:
+                    self.request(
+                        stats, 'evaluate_task',
+                        lambda: client.post(
+                            reverse('evaluate_task', args=[task_id]),
+                            {'grade': self.random.randint(1, 5)}))
+                if finished and not task_ids:
+                    break
+                if not task_ids:
+                    time.sleep(0.01)
+        finally:
+            connection.close()
+
+    def count_lost_updates(self, stats):
+        """Return claims a client won that the database does not show."""
+        final = dict(Task.objects.filter(
+            id__in=stats.claims).values_list('id', 'assign_to_id'))
+        lost = 0
+        for task_id, winners in stats.claims.items():
+            lost += len(winners) - (final[task_id] in winners)
+        return lost
+
+    def report(self, stats, elapsed, lost_updates):
+        """Write summary table."""
+        total = sum(len(values) for values in stats.latencies.values())
+        self.stdout.write(
+            f'{"operation":<20}{"requests":>10}{"ok":>8}{"errors":>8}'
+            f'{"p50 ms":>10}{"p99 ms":>10}')
+        for operation in OPERATIONS:
+            latencies = sorted(stats.latencies[operation])
+            outcomes = stats.outcomes[operation]
+            self.stdout.write(
+                f'{operation:<20}{len(latencies):>10}{outcomes["ok"]:>8}'
+                f'{len(latencies) - outcomes["ok"]:>8}'
+                f'{percentile(latencies, 0.5) * 1000:>10.1f}'
+                f'{percentile(latencies, 0.99) * 1000:>10.1f}')
+        self.stdout.write(
+            f'Throughput: {total / elapsed:.1f} requests/s '
+            f'over {elapsed:.1f} s')
+        evaluations = Evaluation.objects.filter(
+            task_id__in=stats.claims).count()
+        self.stdout.write(
+            f'Claims won: {sum(map(len, stats.claims.values()))}, '
+            f'evaluations: {evaluations}')
+        self.stdout.write(f'Lost updates: {lost_updates}')
+        for outcome in ('integrity_error', 'deadlock', 'operational_error',
+                        'http_error'):
+            count = sum(outcomes[outcome]
+                        for outcomes in stats.outcomes.values())
+            self.stdout.write(f'{outcome.replace("_", " ").capitalize()}s: '
+                              f'{count}')
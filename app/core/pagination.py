@@ -0,0 +1,164 @@
+"""
+Keyset pagination for API list views.
+"""
+import datetime
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as Base64Error
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, Cursor
+from rest_framework.utils.urls import replace_query_param
+
+
+def get_cursor_ordering(view, default='-id'):
+    """Return ordering key chosen by view for the request."""
+    if hasattr(view, 'get_cursor_ordering'):
+        return view.get_cursor_ordering()
+    return getattr(view, 'cursor_ordering', default)
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """JSON encoder keeping microseconds of datetimes and times.
+
+    DjangoJSONEncoder cuts them to milliseconds, which moves the cursor
+    before rows within the same millisecond.
+    """
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+class KeysetCursorPagination(CursorPagination):
+    """Paginate with an opaque cursor on (ordering key, id).
+
+    Views choose the ordering key with a `cursor_ordering` attribute,
+    e.g. `'-id'` or `'date'`, or a `get_cursor_ordering()` method when
+    it depends on the request. The primary key is always added as a
+    tie-breaker, so every page is a plain index range scan.
+    """
+    ordering = '-id'
+    page_size_query_param = 'page_size'
+
+    @property
+    def max_page_size(self):
+        return settings.API_MAX_PAGE_SIZE
+
+    def get_ordering(self, request, queryset, view):
+        """Return ordering as (key, id) with a common direction."""
+        key = get_cursor_ordering(view, self.ordering)
+        if key.lstrip('-') in ('id', 'pk'):
+            return (key.replace('pk', 'id'),)
+        return (key, '-id' if key.startswith('-') else 'id')
+
+    def position_filter(self, position, descending):
+        """Return predicate selecting rows after position."""
+        fields = [order.lstrip('-') for order in self.ordering]
+        op = 'lt' if descending else 'gt'
+        if len(fields) == 1:
+            return Q(**{f'{fields[0]}__{op}': position[0]})
+        key, pk = fields
+        value, pk_value = position
+        # The redundant bound on the key lets the planner use it as
+        # an index condition for the OR below.
+        return Q(**{f'{key}__{op}e': value}) & (
+            Q(**{f'{key}__{op}': value}) |
+            Q(**{key: value, f'{pk}__{op}': pk_value})
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = bool(self.cursor and self.cursor.reverse)
+        position = self.cursor.position if self.cursor else None
+
+        descending = self.ordering[0].startswith('-') != reverse
+        if reverse:
+            queryset = queryset.order_by(
+                *[o[1:] if o.startswith('-') else f'-{o}'
+                  for o in self.ordering])
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            try:
+                queryset = queryset.filter(
+                    self.position_filter(position, descending))
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        position = self._get_position_from_instance(
+            self.page[-1], self.ordering) if self.page else \
+            self.cursor.position
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = self._get_position_from_instance(
+            self.page[0], self.ordering) if self.page else \
+            self.cursor.position
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=True, position=position))
+
+    def decode_cursor(self, request):
+        """Return `Cursor` decoded from request or None."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            tokens = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            reverse = bool(tokens.get('r', False))
+            position = tokens['p']
+        except (TypeError, ValueError, KeyError, AttributeError,
+                Base64Error):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or \
+                len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return Cursor(offset=0, reverse=reverse, position=position)
+
+    def encode_cursor(self, cursor):
+        """Return url with cursor encoded as base64 JSON."""
+        tokens = {'p': cursor.position}
+        if cursor.reverse:
+            tokens['r'] = 1
+        encoded = urlsafe_b64encode(json.dumps(
+            tokens, cls=CursorEncoder).encode('ascii')).decode('ascii')
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded)
+
+    def _get_position_from_instance(self, instance, ordering):
+        fields = [order.lstrip('-') for order in ordering]
+        if isinstance(instance, dict):
+            return [instance[field] for field in fields]
+        return [getattr(instance, field) for field in fields]
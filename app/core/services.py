@@ -1,16 +1,25 @@
 from django.utils import timezone
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
 from django.db.models.query import QuerySet
-from django.db.models import Subquery, Avg
+from django.db.models import Subquery, Q, Count, Sum, Prefetch, F
+from django.db.models.functions import Coalesce
 
 from team.models import Team
-from user.models import User
-from task.models import Task
+from user.models import User, UserStats
+from task.models import Task, Comment, TaskEvent
 from meeting.models import Meeting
 from evaluation.models import Evaluation
+from sync.models import Tombstone
 from user.serializers import UserSerializer
-from typing import Optional, Dict
+from collections import Counter, defaultdict
+from typing import Optional, Dict, Iterable, Tuple
+from datetime import date, datetime, time, timedelta
 from .forms import TeamForm, TaskForm
+from core.digests import chunked
 from core.tasks import send_information_email
+from sync.events import publish_event
 
 
 def select_all_teams() -> QuerySet:
@@ -19,44 +28,91 @@ def select_all_teams() -> QuerySet:
     return teams
 
 
+def day_range() -> Tuple[datetime, datetime]:
+    """Return half-open [start, end) bounds of current local day."""
+    start = timezone.localtime().replace(
+        hour=0, minute=0, second=0, microsecond=0)
+    return start, start + timedelta(days=1)
+
+
+def month_range() -> Tuple[date, date]:
+    """Return half-open [start, end) bounds of current local month."""
+    start = timezone.localdate().replace(day=1)
+    end = (start + timedelta(days=32)).replace(day=1)
+    return start, end
+
+
 def select_meetings_for_month(user: User) -> QuerySet:
     """Select and return user's meetings for current month."""
+    month_end = timezone.make_aware(
+        datetime.combine(month_range()[1], time.min))
     month_meetings = user.meetings.filter(
-            date__month=timezone.now().month, date__gte=timezone.now()
+            date__gte=timezone.now(), date__lt=month_end
             ).all().order_by('date')
     return month_meetings
 
 
 def select_meetings_for_today(user: User) -> QuerySet:
     """Select user's meetings for today."""
+    start, end = day_range()
     today_meetings = user.meetings.filter(
-            date__day=timezone.now().day,
+            date__gte=start, date__lt=end
             ).order_by('date')
     return today_meetings
 
 
 def select_tasks_for_month(user: User) -> QuerySet:
     """Select and return user's tasks for month"""
+    start, end = month_range()
     if user.is_manager:
         month_tasks = user.created_tasks.filter(
-            deadline__month=timezone.now().month).order_by('deadline')
+            deadline__gte=start, deadline__lt=end).order_by('deadline')
     else:
         month_tasks = user.tasks.filter(
-            deadline__month=timezone.now().month).order_by('deadline')
+            deadline__gte=start, deadline__lt=end).order_by('deadline')
     return month_tasks
 
 
 def select_tasks_for_today(user: User) -> QuerySet:
     """Select and return user's tasks for today."""
+    today = timezone.localdate()
     if user.is_manager:
         today_tasks = user.created_tasks.filter(
-            deadline__day=timezone.now().day).order_by('deadline')
+            deadline=today).order_by('deadline')
     else:
         today_tasks = user.tasks.filter(
-            deadline__day=timezone.now().day).order_by('deadline')
+            deadline=today).order_by('deadline')
     return today_tasks
 
 
+def select_task_for_detail(task_id: int,
+                           before: Optional[int] = None) -> Optional[Task]:
+    """Select task with people, evaluation and a page of comments.
+
+    Comments older than the `before` comment id are read newest first,
+    one page of TASK_COMMENTS_PAGE_SIZE. The page is stored oldest first
+    in `task.comment_page`, `task.older_comments_before` is the id to
+    pass for the previous page or None on the first comment.
+    """
+    size = settings.TASK_COMMENTS_PAGE_SIZE
+    comments = Comment.objects.select_related('user').order_by('-id')
+    if before is not None:
+        comments = comments.filter(id__lt=before)
+    task = Task.objects.select_related(
+        'evaluation', 'assign_to', 'user'
+    ).prefetch_related(
+        Prefetch('comments', queryset=comments[:size + 1],
+                 to_attr='latest_comments')
+    ).filter(id=task_id).first()
+    if task is None:
+        return None
+    page = task.latest_comments[:size]
+    task.older_comments_before = page[-1].id \
+        if len(task.latest_comments) > size else None
+    task.comment_page = page[::-1]
+    return task
+
+
 def select_all_manager_tasks(user: User) -> Optional[QuerySet]:
     """Select and return all tasks created by manager, except rated."""
     if user.is_manager:
@@ -91,30 +147,295 @@ def select_user_evaluations(user: User):
                     assign_to=user, status='done'
                     ).values('pk'))
             ).select_related('task_id').order_by('-id')
-    avg_evaluation = evaluations.aggregate(
-            avg_grade=Avg('grade')).get('avg_grade')
+    avg_evaluation = get_user_stats(user).average_grade
     return {'evaluations': evaluations, 'avg_evaluation': avg_evaluation}
 
 
+def dashboard_cache_key(user_id: int) -> str:
+    """Return cache key of user's dashboard snapshot for today."""
+    return f'dashboard:{user_id}:{timezone.localdate().isoformat()}'
+
+
+def build_dashboard_snapshot(user: User) -> dict:
+    """Evaluate and return dashboard querysets for user."""
+    snapshot = {
+        'month_meetings': select_meetings_for_month(user),
+        'today_meetings': select_meetings_for_today(user),
+    }
+    if user.is_superuser:
+        snapshot['teams'] = select_all_teams().select_related('manager')
+    else:
+        snapshot['month_tasks'] = select_tasks_for_month(user)
+        snapshot['today_tasks'] = select_tasks_for_today(user)
+        if user.is_manager:
+            snapshot['tasks'] = select_all_manager_tasks(
+                user).select_related('assign_to')
+        else:
+            snapshot['tasks'] = sellect_all_available_employee_tasks(user)
+            snapshot['todo_tasks'] = select_all_emploee_tasks_todo(
+                user).select_related('assign_to')
+    return {k: list(v) for k, v in snapshot.items()}
+
+
+def get_dashboard_snapshot(user: User) -> dict:
+    """Return cached dashboard snapshot, build it on cache miss."""
+    key = dashboard_cache_key(user.id)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = build_dashboard_snapshot(user)
+        cache.set(key, snapshot, settings.DASHBOARD_CACHE_TIMEOUT)
+    return snapshot
+
+
+def invalidate_dashboards(user_ids: Iterable[Optional[int]]):
+    """Drop dashboard snapshots of users after transaction commit."""
+    keys = {dashboard_cache_key(pk) for pk in user_ids if pk}
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def invalidate_task_dashboards(user_id: Optional[int],
+                               assign_to_id: Optional[int]):
+    """Invalidate dashboards of task creator, assignee and candidates."""
+    invalidate_dashboards([user_id, assign_to_id])
+    invalidate_team_workload()
+    if assign_to_id is None:
+        invalidate_dashboards(User.objects.filter(
+            Q(team__manager_id=user_id) | Q(team=None), is_manager=False
+            ).values_list('id', flat=True))
+
+
+def invalidate_team_workload():
+    """Drop cached team workload after transaction commit."""
+    key = team_workload_cache_key()
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def team_workload_cache_key() -> str:
+    """Return cache key of team workload for today."""
+    return f'team-workload:{timezone.localdate().isoformat()}'
+
+
+def build_team_workload() -> list:
+    """Return task counts and average grade per team and member.
+
+    One GROUP BY query over teams, members, their assigned tasks and
+    evaluations, team totals are summed from the member rows.
+    """
+    today = timezone.localdate()
+    overdue = ~Q(members__tasks__status='done') & Q(
+        members__tasks__deadline__lt=today)
+    rows = Team.objects.values(
+        'id', 'name', 'manager_id', 'members__id', 'members__name',
+        'members__email'
+    ).annotate(
+        opened=Count('members__tasks',
+                     filter=Q(members__tasks__status='opened')),
+        in_progress=Count('members__tasks',
+                          filter=Q(members__tasks__status='in_progress')),
+        done=Count('members__tasks',
+                   filter=Q(members__tasks__status='done')),
+        overdue=Count('members__tasks', filter=overdue),
+        graded=Count('members__tasks__evaluation'),
+        grade_sum=Sum('members__tasks__evaluation__grade'),
+    ).order_by('name', 'id', 'members__name', 'members__id')
+
+    counters = ('opened', 'in_progress', 'done', 'overdue')
+    teams = {}
+    for row in rows:
+        team = teams.setdefault(row['id'], {
+            'id': row['id'], 'name': row['name'],
+            'manager': row['manager_id'], 'members': [],
+            'graded': 0, 'grade_sum': 0,
+            **{counter: 0 for counter in counters},
+        })
+        if row['members__id'] is None:
+            continue
+        for counter in (*counters, 'graded'):
+            team[counter] += row[counter]
+        team['grade_sum'] += row['grade_sum'] or 0
+        team['members'].append({
+            'id': row['members__id'], 'name': row['members__name'],
+            'email': row['members__email'],
+            'average_grade': row['grade_sum'] / row['graded']
+            if row['graded'] else None,
+            **{counter: row[counter] for counter in counters},
+        })
+    for team in teams.values():
+        graded, grade_sum = team.pop('graded'), team.pop('grade_sum')
+        team['average_grade'] = grade_sum / graded if graded else None
+    return list(teams.values())
+
+
+def get_team_workload(user: User) -> list:
+    """Return cached workload of teams the user may see."""
+    key = team_workload_cache_key()
+    workload = cache.get(key)
+    if workload is None:
+        workload = build_team_workload()
+        cache.set(key, workload, settings.WORKLOAD_CACHE_TIMEOUT)
+    if user.is_superuser:
+        return workload
+    return [team for team in workload
+            if team['manager'] == user.id or team['id'] == user.team_id]
+
+
+TASK_STATS_COUNTERS = {
+    'opened': 'open_tasks',
+    'in_progress': 'in_progress_tasks',
+    'done': 'done_tasks',
+}
+
+
+def task_stats(assign_to_id: Optional[int], status: str,
+               grade: Optional[int] = None,
+               sign: int = 1) -> Tuple[Optional[int], Counter]:
+    """Return (assignee id, counters) a task adds to user stats."""
+    counters = Counter()
+    if assign_to_id is not None and status in TASK_STATS_COUNTERS:
+        counters[TASK_STATS_COUNTERS[status]] = sign
+        if status == 'done' and grade is not None:
+            counters.update(graded_tasks=sign, grade_sum=sign * grade)
+    return assign_to_id, counters
+
+
+def change_user_stats(changes: Iterable[Tuple[Optional[int], Dict]]):
+    """Add (user id, counters) changes to stats with one UPDATE per user."""
+    totals = defaultdict(Counter)
+    for user_id, counters in changes:
+        if user_id is not None:
+            totals[user_id].update(counters)
+    for user_id, counters in totals.items():
+        fields = {name: F(name) + value
+                  for name, value in counters.items() if value}
+        if fields:
+            UserStats.objects.filter(user_id=user_id).update(**fields)
+
+
+def change_upcoming_meetings(user_ids: Iterable[int], count: int = 1):
+    """Add count to upcoming meetings of users."""
+    change_user_stats(
+        (pk, {'upcoming_meetings': count}) for pk in user_ids)
+
+
+def refresh_user_stats(user_ids: Optional[Iterable[int]] = None) -> int:
+    """Rebuild stats of users, all by default, return count of users.
+
+    Three queries per batch of users: task counters and grades grouped
+    by assignee, meetings from today on grouped by participant and one
+    upsert of the rows.
+    """
+    users = User.objects.order_by('id').values_list('id', flat=True)
+    if user_ids is not None:
+        users = users.filter(id__in=list(user_ids))
+    start, _ = day_range()
+    done = Q(status='done')
+    refreshed = 0
+    for ids in chunked(users.iterator(), settings.USER_STATS_BATCH_SIZE):
+        tasks = {
+            row.pop('assign_to_id'): row
+            for row in Task.objects.filter(assign_to_id__in=ids).values(
+                'assign_to_id').annotate(
+                open_tasks=Count('id', filter=Q(status='opened')),
+                in_progress_tasks=Count('id', filter=Q(status='in_progress')),
+                done_tasks=Count('id', filter=done),
+                graded_tasks=Count('evaluation', filter=done),
+                grade_sum=Coalesce(Sum('evaluation__grade', filter=done), 0),
+            ).order_by()
+        }
+        meetings = dict(Meeting.participants.through.objects.filter(
+            user_id__in=ids, meeting__date__gte=start
+        ).values('user_id').annotate(
+            count=Count('id')).values_list('user_id', 'count').order_by())
+        UserStats.objects.bulk_create(
+            [UserStats(user_id=pk, upcoming_meetings=meetings.get(pk, 0),
+                       **tasks.get(pk, {})) for pk in ids],
+            update_conflicts=True, unique_fields=['user'],
+            update_fields=[*TASK_STATS_COUNTERS.values(), 'graded_tasks',
+                           'grade_sum', 'upcoming_meetings'])
+        refreshed += len(ids)
+    return refreshed
+
+
+def get_user_stats(user: User) -> UserStats:
+    """Return stats of user, rebuilt first if the row is missing."""
+    stats = UserStats.objects.filter(user_id=user.pk).first()
+    if stats is None:
+        refresh_user_stats([user.pk])
+        stats = UserStats.objects.get(user_id=user.pk)
+    return stats
+
+
+def task_event(task: Task, actor_id: Optional[int], from_status: str,
+               from_assign_to_id: Optional[int] = None
+               ) -> Optional[TaskEvent]:
+    """Return event for changed status or assignee of task, else None."""
+    if from_status == task.status and \
+            from_assign_to_id == task.assign_to_id:
+        return None
+    return TaskEvent(
+        task_id=task.pk, actor_id=actor_id, from_status=from_status,
+        to_status=task.status, assign_to_id=task.assign_to_id)
+
+
+def record_task_events(events: Iterable[Optional[TaskEvent]]):
+    """Save task events with one INSERT once the transaction commits."""
+    events = [event for event in events if event is not None]
+    if events:
+        transaction.on_commit(
+            lambda: TaskEvent.objects.bulk_create(events))
+
+
+def claim_task(task_id: int, user: User) -> bool:
+    """Assign task to user if nobody has taken it, return success."""
+    table = Task._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'UPDATE {table} task '
+            'SET assign_to_id = %s, status = %s, updated_at = %s '
+            f'FROM {table} old WHERE old.id = task.id '
+            'AND task.id = %s AND task.assign_to_id IS NULL '
+            'RETURNING task.user_id, old.status',
+            [user.id, 'in_progress', timezone.now(), task_id])
+        row = cursor.fetchone()
+    if row is None:
+        return False
+    creator_id, from_status = row
+    invalidate_task_dashboards(creator_id, None)
+    invalidate_dashboards([user.id])
+    change_user_stats([task_stats(user.id, 'in_progress')])
+    record_task_events([TaskEvent(
+        task_id=task_id, actor_id=user.id, from_status=from_status,
+        to_status='in_progress', assign_to_id=user.id)])
+    publish_event([creator_id, user.id],
+                  {'type': 'task', 'action': 'updated', 'id': task_id})
+    return True
+
+
+def claim_next_task(user: User) -> Optional[Task]:
+    """Assign available task with the earliest deadline to user."""
+    with transaction.atomic():
+        task = sellect_all_available_employee_tasks(user).order_by(
+            'deadline', 'id').select_for_update(skip_locked=True).first()
+        if task is None:
+            return None
+        from_status = task.status
+        task.assign_to = user
+        task.status = 'in_progress'
+        task.save(update_fields=['assign_to', 'status', 'updated_at'])
+        record_task_events([task_event(task, user.id, from_status)])
+    return task
+
+
 def get_context_for_starting_page(user: User) -> dict:
     """Get and return context for starting page"""
     context = {}
     if user.is_authenticated:
-        context['month_meetings'] = select_meetings_for_month(user)
-        context['today_meetings'] = select_meetings_for_today(user)
+        context.update(get_dashboard_snapshot(user))
         if user.is_superuser:
             context['team_form'] = TeamForm()
-            context['teams'] = select_all_teams()
-            return context
-        context['month_tasks'] = select_tasks_for_month(user)
-        context['today_tasks'] = select_tasks_for_today(user)
-        if user.is_authenticated and user.is_manager:
-            context['tasks'] = select_all_manager_tasks(user)
+        elif user.is_manager:
             context['task_form'] = TaskForm()
-            return context
-        context['tasks'] = sellect_all_available_employee_tasks(user)
-        context['todo_tasks'] = select_all_emploee_tasks_todo(user)
-        return context
     return context
 
 
@@ -139,6 +460,7 @@ def update_profile(user: User, data: Dict):
         return {'error': 'Please fill out your name.'}
 
     user.name = data['name']
+    user.receive_digest = data.get('receive_digest', user.receive_digest)
     user.set_password(data['password'])
     user.save()
     return {'user': user, 'message': 'You profile has apdated!'}
@@ -163,23 +485,26 @@ def unpin_manager(manager: User):
 def save_team(data: Dict):
     """Save team to database."""
     members = data.pop('members', [])
-    team = Team.objects.create(**data)
-    team.members.set(members)
-    appoint_manager(team, team.manager)
+    with transaction.atomic():
+        team = Team.objects.create(**data)
+        team.members.set(members)
+        appoint_manager(team, team.manager)
 
 
 def update_team(team: Team, data: Dict):
     """Update team."""
     team_manager = team.manager
-    if team.manager != data['manager']:
-        unpin_manager(team_manager)
+    with transaction.atomic():
+        invalidate_dashboards(team.members.values_list('id', flat=True))
+        if team.manager != data['manager']:
+            unpin_manager(team_manager)
 
-    team.name = data['name']
-    team.manager = data['manager']
-    team.members.set(data['members'])
-    team.save()
+        team.name = data['name']
+        team.manager = data['manager']
+        team.members.set(data['members'])
+        team.save()
 
-    appoint_manager(team, data['manager'])
+        appoint_manager(team, data['manager'])
     return team
 
 
@@ -226,3 +551,14 @@ def cancel_meeting(meeting: Meeting):
         title = f'{meeting.title} canceled'
         meeting.delete()
         send_information_email.delay(title, message, emails)
+
+
+def prune_tombstones() -> int:
+    """Delete tombstones older than the sync token lifetime.
+
+    Tokens older than SYNC_TOMBSTONE_RETENTION_DAYS are refused by the
+    sync API, so no client needs these deletes any more.
+    """
+    cutoff = timezone.now() - timedelta(
+        days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    return Tombstone.objects.filter(created_at__lt=cutoff).delete()[0]
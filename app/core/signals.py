@@ -0,0 +1,252 @@
+"""
+Signal handlers that keep cached dashboard snapshots, API versions and
+user stats up to date.
+"""
+from django.db.models.signals import (
+    pre_save, post_save, pre_delete, post_delete, m2m_changed
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from user.models import User, UserStats
+from task.models import Task, Comment
+from team.models import Team
+from meeting.models import Meeting
+from evaluation.models import Evaluation
+from core.services import (
+    invalidate_dashboards, invalidate_task_dashboards,
+    invalidate_team_workload, task_stats, change_user_stats,
+    change_upcoming_meetings, day_range
+)
+
+
+def superuser_ids():
+    """Return ids of users that see the teams list."""
+    return User.objects.filter(is_superuser=True).values_list('id', flat=True)
+
+
+@receiver(pre_save, sender=Task)
+def remember_task_owners(sender, instance, **kwargs):
+    """Store owners, status and grade the task had before saving."""
+    if instance._state.adding:
+        return
+    previous = Task.objects.filter(pk=instance.pk).values_list(
+        'user_id', 'assign_to_id', 'status', 'evaluation__grade').first()
+    instance._dashboard_previous = previous and previous[:2]
+    instance._stats_previous = previous and previous[1:]
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def task_changed(sender, instance, **kwargs):
+    invalidate_task_dashboards(instance.user_id, instance.assign_to_id)
+    previous = getattr(instance, '_dashboard_previous', None)
+    if previous and previous != (instance.user_id, instance.assign_to_id):
+        invalidate_task_dashboards(*previous)
+
+
+@receiver(post_save, sender=Task)
+def task_stats_saved(sender, instance, **kwargs):
+    """Move task from the stats it had to the ones it has now."""
+    previous = getattr(instance, '_stats_previous', None)
+    if previous:
+        change_user_stats([
+            task_stats(*previous, sign=-1),
+            task_stats(instance.assign_to_id, instance.status, previous[2]),
+        ])
+    else:
+        change_user_stats(
+            [task_stats(instance.assign_to_id, instance.status)])
+
+
+@receiver(post_delete, sender=Task)
+def task_stats_deleted(sender, instance, **kwargs):
+    """Remove task from stats, its evaluation is removed before it."""
+    change_user_stats(
+        [task_stats(instance.assign_to_id, instance.status, sign=-1)])
+
+
+def comment_task_owners(comment):
+    """Return (user_id, assign_to_id) of the comment's task or ().
+
+    Read once per task of the comment and shared by its signal handlers.
+    """
+    cached = getattr(comment, '_task_owners', None)
+    if cached is None or cached[0] != comment.task_id:
+        owners = Task.objects.filter(pk=comment.task_id).values_list(
+            'user_id', 'assign_to_id').first() or ()
+        cached = comment._task_owners = (comment.task_id, owners)
+    return cached[1]
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    """Refresh comment counters shown on dashboards."""
+    owners = comment_task_owners(instance)
+    if owners:
+        invalidate_task_dashboards(*owners)
+
+
+@receiver(post_save, sender=Evaluation)
+@receiver(post_delete, sender=Evaluation)
+def evaluation_changed(sender, instance, **kwargs):
+    invalidate_dashboards(Task.objects.filter(
+        pk=instance.task_id_id).values_list('user_id', flat=True))
+    invalidate_team_workload()
+
+
+@receiver(pre_save, sender=Evaluation)
+def remember_grade(sender, instance, **kwargs):
+    """Store grade the evaluation had before saving."""
+    if not instance._state.adding:
+        instance._previous_grade = Evaluation.objects.filter(
+            pk=instance.pk).values_list('grade', flat=True).first()
+
+
+def change_grade_stats(evaluation, old, new):
+    """Swap old grade of evaluation for new one in stats of assignee."""
+    task = Task.objects.filter(pk=evaluation.task_id_id).values_list(
+        'assign_to_id', 'status').first()
+    if task:
+        change_user_stats([
+            task_stats(*task, old, sign=-1), task_stats(*task, new)])
+
+
+@receiver(post_save, sender=Evaluation)
+def evaluation_stats_saved(sender, instance, created, **kwargs):
+    previous = None if created else getattr(instance, '_previous_grade', None)
+    change_grade_stats(instance, previous, instance.grade)
+
+
+@receiver(post_delete, sender=Evaluation)
+def evaluation_stats_deleted(sender, instance, **kwargs):
+    change_grade_stats(instance, instance.grade, None)
+
+
+@receiver(post_save, sender=Meeting)
+@receiver(pre_delete, sender=Meeting)
+def meeting_changed(sender, instance, **kwargs):
+    invalidate_dashboards([instance.user_id])
+    invalidate_dashboards(
+        instance.participants.values_list('id', flat=True))
+
+
+@receiver(m2m_changed, sender=Meeting.participants.through)
+def meeting_participants_changed(sender, instance, action, reverse,
+                                 pk_set, **kwargs):
+    if reverse:
+        if action in ('post_add', 'post_remove', 'pre_clear'):
+            meetings = Meeting.objects.filter(
+                pk__in=pk_set if pk_set else instance.meetings.values('pk'))
+            meetings.update(updated_at=timezone.now())
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            invalidate_dashboards([instance.pk])
+        return
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        Meeting.objects.filter(pk=instance.pk).update(
+            updated_at=timezone.now())
+    if action in ('post_add', 'post_remove'):
+        invalidate_dashboards(pk_set)
+    elif action == 'pre_clear':
+        invalidate_dashboards(
+            instance.participants.values_list('id', flat=True))
+
+
+def upcoming_meetings(meetings):
+    """Return meetings from today on."""
+    return meetings.filter(date__gte=day_range()[0])
+
+
+@receiver(pre_save, sender=Meeting)
+def remember_meeting_date(sender, instance, **kwargs):
+    """Store date the meeting had before saving."""
+    if not instance._state.adding:
+        instance._previous_date = Meeting.objects.filter(
+            pk=instance.pk).values_list('date', flat=True).first()
+
+
+@receiver(post_save, sender=Meeting)
+def meeting_stats_saved(sender, instance, created, **kwargs):
+    """Count meeting for participants when moved to or from the past."""
+    previous = getattr(instance, '_previous_date', None)
+    if created or previous is None:
+        return
+    upcoming = upcoming_meetings(
+        Meeting.objects.filter(pk=instance.pk)).exists()
+    if upcoming != (previous >= day_range()[0]):
+        change_upcoming_meetings(
+            instance.participants.values_list('id', flat=True),
+            1 if upcoming else -1)
+
+
+@receiver(pre_delete, sender=Meeting)
+def meeting_stats_deleted(sender, instance, **kwargs):
+    if upcoming_meetings(Meeting.objects.filter(pk=instance.pk)).exists():
+        change_upcoming_meetings(
+            instance.participants.values_list('id', flat=True), -1)
+
+
+@receiver(m2m_changed, sender=Meeting.participants.through)
+def meeting_participants_stats(sender, instance, action, reverse,
+                               pk_set, **kwargs):
+    """Count upcoming meetings of participants added or removed."""
+    if action not in ('post_add', 'pre_remove', 'pre_clear'):
+        return
+    sign = 1 if action == 'post_add' else -1
+    if reverse:
+        meetings = Meeting.objects.filter(pk__in=pk_set) \
+            if action == 'post_add' else instance.meetings.all()
+        if action == 'pre_remove':
+            meetings = meetings.filter(pk__in=pk_set)
+        change_upcoming_meetings(
+            [instance.pk], sign * upcoming_meetings(meetings).count())
+        return
+    if not upcoming_meetings(Meeting.objects.filter(pk=instance.pk)).exists():
+        return
+    if action == 'post_add':
+        user_ids = pk_set
+    else:
+        participants = instance.participants.all()
+        if action == 'pre_remove':
+            participants = participants.filter(pk__in=pk_set)
+        user_ids = list(participants.values_list('id', flat=True))
+    change_upcoming_meetings(user_ids, sign)
+
+
+@receiver(post_save, sender=Team)
+@receiver(pre_delete, sender=Team)
+def team_changed(sender, instance, **kwargs):
+    invalidate_dashboards(superuser_ids())
+    invalidate_dashboards(instance.members.values_list('id', flat=True))
+    invalidate_team_workload()
+
+
+@receiver(pre_save, sender=User)
+def remember_user_team(sender, instance, update_fields=None, **kwargs):
+    """Store team the user had before saving."""
+    if instance._state.adding or \
+            (update_fields and set(update_fields) == {'last_login'}):
+        return
+    instance._previous_team_id = User.objects.filter(
+        pk=instance.pk).values_list('team_id', flat=True).first()
+
+
+@receiver(post_save, sender=User)
+def create_user_stats(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        UserStats.objects.create(user=instance)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+    invalidate_dashboards([instance.pk])
+    invalidate_dashboards(superuser_ids())
+    invalidate_team_workload()
+    # Team detail lists its members, so both teams get a new version.
+    Team.objects.filter(pk__in=[
+        instance.team_id, getattr(instance, '_previous_team_id', None)
+    ]).update(updated_at=timezone.now())
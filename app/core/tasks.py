@@ -1,3 +1,4 @@
+import io
 from django.core.mail import send_mail
 from celery import shared_task
 from django.conf import settings
@@ -13,3 +14,36 @@ def send_information_email(subject: str, message, recipients_email: List):
         recipient_list=recipients_email,
         fail_silently=False
     )
+
+
+@shared_task
+def import_csv_file(kind: str, content: str, recipient_email: str):
+    from core.importers import IMPORTERS, format_report
+
+    report = IMPORTERS[kind](io.StringIO(content))
+    send_information_email(
+        f'Import of {kind} finished',
+        format_report(kind, report),
+        [recipient_email]
+    )
+
+
+@shared_task
+def send_agenda_digests():
+    from core.digests import send_agenda_digests
+
+    return send_agenda_digests()
+
+
+@shared_task
+def reconcile_user_stats():
+    from core.services import refresh_user_stats
+
+    return refresh_user_stats()
+
+
+@shared_task
+def prune_tombstones():
+    from core.services import prune_tombstones
+
+    return prune_tombstones()
@@ -0,0 +1,17 @@
+"""
+Test runner of the project.
+"""
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+
+
+class TestRunner(DiscoverRunner):
+    """Run tests without write throttles unless a test sets their rates.
+
+    Local buckets live as long as the process, so tokens taken by one
+    test would otherwise be missing in the tests run after it.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        settings.THROTTLE_RATES = {}
@@ -0,0 +1,79 @@
+"""
+Tests for sanitized comment HTML.
+"""
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from core.html import sanitize_html
+from task.models import Task, Comment
+
+
+class SanitizeHtmlTests(TestCase):
+    """Test the allowlist sanitizer."""
+
+    def test_unsafe_markup_removed(self):
+        """Test scripts, handlers and javascript urls are dropped."""
+        html = sanitize_html(
+            '<p onclick="steal()">Hi <script>steal()</script>'
+            '<a href="javascript:steal()">x</a>'
+            '<a href="https://example.com">y</a></p>')
+
+        self.assertEqual(
+            html,
+            '<p>Hi <a rel="noopener noreferrer nofollow">x</a>'
+            '<a href="https://example.com" '
+            'rel="noopener noreferrer nofollow">y</a></p>')
+
+    def test_text_escaped(self):
+        """Test plain text comparisons stay text."""
+        self.assertEqual(sanitize_html('1 < 2 & 3'), '1 &lt; 2 &amp; 3')
+
+
+class CommentHtmlTests(TestCase):
+    """Test text_html is stored on write and backfilled."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='testpass123')
+        self.task = Task.objects.create(
+            user=self.user, description='Task', deadline='2025-06-01')
+
+    def test_comment_form_stores_html(self):
+        """Test comment posted on task detail is stored sanitized."""
+        self.client.force_login(self.user)
+
+        self.client.post(reverse('task_detail', args=[self.task.id]),
+                         {'text': '<b>Done</b><img src=x onerror=alert(1)>'})
+
+        self.assertEqual(Comment.objects.get().text_html, '<b>Done</b>')
+
+    def test_render_command_backfills_missing_html(self):
+        """Test command renders old comments without task activity."""
+        comments = [
+            Comment.objects.create(
+                user=self.user, task=self.task, text=f'<i>{i}</i><script>')
+            for i in range(3)
+        ]
+        rendered = Comment.objects.create(
+            user=self.user, task=self.task, text='New',
+            text_html='<p>Kept</p>')
+        self.task.refresh_from_db()
+        activity = (self.task.last_activity_at, self.task.updated_at)
+        out = StringIO()
+
+        call_command('render_comment_html', batch_size=2, stdout=out)
+
+        self.assertIn('Rendered 3 comments.', out.getvalue())
+        self.assertEqual(
+            [comment.text_html for comment in Comment.objects.filter(
+                pk__in=[comment.pk for comment in comments]).order_by('id')],
+            ['<i>0</i>', '<i>1</i>', '<i>2</i>'])
+        rendered.refresh_from_db()
+        self.assertEqual(rendered.text_html, '<p>Kept</p>')
+        self.task.refresh_from_db()
+        self.assertEqual(
+            (self.task.last_activity_at, self.task.updated_at), activity)
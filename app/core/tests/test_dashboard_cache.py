@@ -0,0 +1,114 @@
+"""
+Tests for the cached dashboard snapshot.
+"""
+
+from django.test import TestCase
+from django.core.cache import cache
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from core.services import get_context_for_starting_page, save_meeting
+from unittest.mock import patch
+from datetime import timedelta
+from task.models import Task
+from team.models import Team
+from meeting.models import Meeting
+from evaluation.models import Evaluation
+
+
+class DashboardCacheTests(TestCase):
+    """Tests for dashboard snapshot caching and invalidation."""
+    def setUp(self):
+        cache.clear()
+        self.admin = get_user_model().objects.create_superuser(
+            email='admin@example.com',
+            password='testpass123'
+        )
+        self.manager = get_user_model().objects.create_user(
+            email='manager@example.com',
+            password='testpass123',
+            is_manager=True
+        )
+        self.team = Team.objects.create(
+            name='Test team', manager=self.manager)
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='testpass123',
+            team=self.team
+        )
+
+    def create_task(self, **params):
+        """Create a task and run commit callbacks."""
+        defaults = {
+            'user': self.manager,
+            'description': 'Sample task',
+            'deadline': timezone.localdate(),
+        }
+        defaults.update(params)
+        with self.captureOnCommitCallbacks(execute=True):
+            return Task.objects.create(**defaults)
+
+    def test_repeat_visit_uses_cache(self):
+        """Test second dashboard request runs no queries."""
+        get_context_for_starting_page(self.user)
+        with self.assertNumQueries(0):
+            get_context_for_starting_page(self.user)
+
+    def test_new_task_invalidates_manager_and_employees(self):
+        """Test creating a task refreshes creator and candidates."""
+        get_context_for_starting_page(self.manager)
+        get_context_for_starting_page(self.user)
+        self.create_task()
+
+        manager_context = get_context_for_starting_page(self.manager)
+        user_context = get_context_for_starting_page(self.user)
+        self.assertEqual(len(manager_context['tasks']), 1)
+        self.assertEqual(len(user_context['tasks']), 1)
+
+    def test_take_task_invalidates_assignee(self):
+        """Test assigning a task refreshes employee's todo list."""
+        task = self.create_task()
+        get_context_for_starting_page(self.user)
+        task.assign_to = self.user
+        with self.captureOnCommitCallbacks(execute=True):
+            task.save()
+
+        context = get_context_for_starting_page(self.user)
+        self.assertEqual(context['tasks'], [])
+        self.assertEqual(context['todo_tasks'], [task])
+
+    def test_evaluation_invalidates_manager(self):
+        """Test evaluated task is removed from manager's dashboard."""
+        task = self.create_task(status='done')
+        self.assertEqual(
+            len(get_context_for_starting_page(self.manager)['tasks']), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            Evaluation.objects.create(
+                user=self.manager, grade=5, task_id=task)
+
+        context = get_context_for_starting_page(self.manager)
+        self.assertEqual(context['tasks'], [])
+
+    @patch('core.services.send_information_email.delay')
+    def test_meeting_participants_invalidated(self, mock_delay):
+        """Test new meeting shows up for its participants."""
+        get_context_for_starting_page(self.user)
+        meeting = Meeting(
+            title='Sample meeting',
+            date=timezone.now() + timedelta(minutes=1)
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            save_meeting(
+                meeting, self.manager,
+                get_user_model().objects.filter(id=self.user.id))
+
+        context = get_context_for_starting_page(self.user)
+        self.assertEqual(context['today_meetings'], [meeting])
+
+    def test_team_change_invalidates_admin(self):
+        """Test new team shows up on admin dashboard."""
+        get_context_for_starting_page(self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            Team.objects.create(name='Other team')
+
+        context = get_context_for_starting_page(self.admin)
+        self.assertEqual(len(context['teams']), 2)
@@ -0,0 +1,108 @@
+"""
+Tests for the daily agenda digests.
+"""
+from datetime import date, datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.digests import build_agendas, send_agenda_digests
+from evaluation.models import Evaluation
+from meeting.models import Meeting
+from task.models import Task
+
+DAY = date(2026, 5, 4)
+
+
+def at(day, hour):
+    return timezone.make_aware(datetime(day.year, day.month, day.day, hour))
+
+
+class AgendaDigestTests(TestCase):
+    """Tests for building and sending agenda digests."""
+    def setUp(self):
+        users = get_user_model().objects
+        self.manager = users.create_user(
+            email='manager@example.com', name='Manager', is_manager=True)
+        self.user = users.create_user(email='user@example.com', name='User')
+        self.quiet = users.create_user(email='quiet@example.com')
+
+    def create_task(self, **fields):
+        fields.setdefault('user', self.manager)
+        fields.setdefault('assign_to', self.user)
+        fields.setdefault('deadline', DAY)
+        fields.setdefault('description', 'Task')
+        return Task.objects.create(**fields)
+
+    def test_agenda_sections(self):
+        """Test agenda lists due tasks, meetings and evaluations."""
+        due = self.create_task(description='Due today')
+        overdue = self.create_task(
+            description='Overdue', deadline=DAY - timedelta(days=2))
+        self.create_task(deadline=DAY + timedelta(days=1))
+        done = self.create_task(status='done')
+        to_evaluate = self.create_task(
+            description='Finished', status='done',
+            deadline=DAY - timedelta(days=1))
+        evaluated = self.create_task(status='done')
+        Evaluation.objects.create(user=self.manager, grade=4,
+                                  task_id=evaluated)
+        meeting = Meeting.objects.create(
+            user=self.manager, title='Planning', date=at(DAY, 10))
+        meeting.participants.add(self.user, self.manager)
+        tomorrow = Meeting.objects.create(
+            user=self.manager, title='Later', date=at(DAY, 10) +
+            timedelta(days=1))
+        tomorrow.participants.add(self.user)
+
+        agendas = build_agendas(DAY)
+
+        self.assertEqual(set(agendas), {self.user.id, self.manager.id})
+        agenda = agendas[self.user.id]
+        self.assertEqual([task['id'] for task in agenda['tasks']],
+                         [overdue.id, due.id])
+        self.assertEqual([row['meeting_id'] for row in agenda['meetings']],
+                         [meeting.id])
+        self.assertEqual(agenda['to_evaluate'], [])
+        self.assertEqual(
+            [task['id'] for task in agendas[self.manager.id]['to_evaluate']],
+            [to_evaluate.id, done.id])
+
+    def test_query_count_does_not_grow_with_users(self):
+        """Test agendas are built with a fixed number of queries."""
+        for i in range(5):
+            employee = get_user_model().objects.create_user(
+                email=f'employee{i}@example.com')
+            self.create_task(assign_to=employee)
+
+        with self.assertNumQueries(4):
+            agendas = build_agendas(DAY)
+
+        self.assertEqual(len(agendas), 5)
+
+    def test_opted_out_user_skipped(self):
+        """Test users who turned digests off get none."""
+        self.create_task()
+        self.user.receive_digest = False
+        self.user.save()
+
+        self.assertNotIn(self.user.id, build_agendas(DAY))
+
+    @override_settings(DIGEST_CHUNK_SIZE=1)
+    def test_send_digests(self):
+        """Test one email is sent per user with an agenda."""
+        self.create_task(description='Write report')
+        self.create_task(description='Review code', status='done')
+
+        sent = send_agenda_digests(DAY)
+
+        self.assertEqual(sent, 2)
+        messages = {message.to[0]: message for message in mail.outbox}
+        self.assertEqual(set(messages),
+                         {'user@example.com', 'manager@example.com'})
+        self.assertIn('Write report', messages['user@example.com'].body)
+        self.assertIn('Review code', messages['manager@example.com'].body)
+        self.assertIn('04 May 2026',
+                      messages['user@example.com'].subject)
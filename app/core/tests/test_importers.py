@@ -0,0 +1,198 @@
+"""
+Tests for CSV bulk import.
+"""
+import io
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from unittest.mock import patch
+from datetime import date
+from core.importers import format_report, import_users, import_tasks
+from task.models import Task
+from team.models import Team
+
+
+class ImportUsersTests(TestCase):
+    """Tests for importing users."""
+    def setUp(self):
+        self.team = Team.objects.create(name='Sales')
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='testpass123',
+            name='Old name'
+        )
+
+    def test_import_users(self):
+        """Test users are created, merged and invalid rows rejected."""
+        content = (
+            'email,name,team,is_manager\n'
+            'new@EXAMPLE.com,New User,Sales,true\n'
+            'user@example.com,Test User,Sales,\n'
+            'new@example.com,Duplicate,,\n'
+            'wrong-email,Wrong,,\n'
+            'other@example.com,Other,Unknown,\n'
+        )
+        report = import_users(io.StringIO(content))
+
+        self.assertEqual(report['imported'], 2)
+        self.assertEqual(report['rejected'], [
+            (4, 'Duplicate email in file.'),
+            (5, 'Invalid email.'),
+            (6, 'Unknown team.'),
+        ])
+        new_user = get_user_model().objects.get(email='new@example.com')
+        self.assertTrue(new_user.is_manager)
+        self.assertEqual(new_user.team, self.team)
+        self.assertFalse(new_user.has_usable_password())
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.name, 'Test User')
+        self.assertEqual(self.user.team, self.team)
+        self.assertTrue(self.user.check_password('testpass123'))
+
+    def test_import_users_with_passwords(self):
+        """Test passwords are hashed and reported when missing."""
+        content = (
+            'email,password\n'
+            'new@example.com,secret123\n'
+            'user@example.com,\n'
+            'nopass@example.com,\n'
+            'short@example.com,abc\n'
+        )
+        report = import_users(io.StringIO(content))
+
+        self.assertEqual(report['imported'], 3)
+        self.assertEqual(report['without_password'], 1)
+        self.assertEqual(report['rejected'], [
+            (5, 'Password must have at least 5 characters.')])
+        new_user = get_user_model().objects.get(email='new@example.com')
+        self.assertTrue(new_user.check_password('secret123'))
+        self.assertNotIn('secret123', new_user.password)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('testpass123'))
+        self.assertIn('1 users have no password',
+                      format_report('users', report))
+
+    def test_import_keeps_role_without_is_manager(self):
+        """Test merged users keep their role when is_manager is blank."""
+        self.user.is_manager = True
+        self.user.save()
+
+        import_users(io.StringIO('email,name\nuser@example.com,Renamed\n'))
+        import_users(io.StringIO(
+            'email,is_manager\nuser@example.com,\n'))
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.is_manager)
+        self.assertEqual(self.user.name, 'Renamed')
+        import_users(io.StringIO(
+            'email,is_manager\nuser@example.com,no\n'))
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_manager)
+
+    def test_unknown_column_rejected(self):
+        """Test file with unknown column raises error."""
+        with self.assertRaises(ValueError):
+            import_users(io.StringIO('email,phone\n'))
+
+
+class ImportTasksTests(TestCase):
+    """Tests for importing tasks."""
+    def setUp(self):
+        self.manager = get_user_model().objects.create_user(
+            email='manager@example.com',
+            password='testpass123',
+            is_manager=True
+        )
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='testpass123',
+        )
+
+    def test_import_tasks(self):
+        """Test tasks are created with resolved users."""
+        content = (
+            'description,deadline,status,creator,assign_to\n'
+            'First task,2030-01-15,in progress,manager@example.com,'
+            'User@example.com\n'
+            'Second task,2030-02-30,,manager@example.com,\n'
+            ',2030-01-15,,,\n'
+            'Third task,2030-01-16,,missing@example.com,\n'
+            '"Fourth, task",2030-01-17,,,\n'
+        )
+        report = import_tasks(io.StringIO(content))
+
+        self.assertEqual(report['imported'], 2)
+        self.assertEqual(report['rejected'], [
+            (3, 'Invalid deadline.'),
+            (4, 'Description is required.'),
+            (5, 'Unknown creator.'),
+        ])
+        task = Task.objects.get(description='First task')
+        self.assertEqual(task.status, 'in_progress')
+        self.assertEqual(task.deadline, date(2030, 1, 15))
+        self.assertEqual(task.user, self.manager)
+        self.assertEqual(task.assign_to, self.user)
+        self.assertTrue(Task.objects.filter(
+            description='Fourth, task', status='opened').exists())
+
+    def test_import_twice_on_one_connection(self):
+        """Test imports back to back reuse the temporary functions."""
+        content = 'description,deadline\nSample task,2030-01-15\n'
+
+        for _ in range(2):
+            report = import_tasks(io.StringIO(content))
+
+        self.assertEqual(report['imported'], 1)
+        self.assertEqual(Task.objects.count(), 2)
+
+    def test_import_command(self):
+        """Test command imports tasks from file."""
+        content = 'description,deadline\nSample task,2030-01-15\n'
+        out = io.StringIO()
+        with patch('builtins.open', return_value=io.StringIO(content)):
+            call_command('import_csv', 'tasks', 'tasks.csv', stdout=out)
+
+        self.assertIn('Imported 1 tasks', out.getvalue())
+        self.assertEqual(Task.objects.count(), 1)
+
+
+class AdminImportTests(TestCase):
+    """Tests for CSV upload in admin."""
+    def setUp(self):
+        self.admin = get_user_model().objects.create_superuser(
+            email='admin@example.com',
+            password='testpass123'
+        )
+        self.client.force_login(self.admin)
+
+    @patch('core.admin.import_csv_file.delay')
+    def test_upload_queues_import(self, mock_delay):
+        """Test uploaded file is imported in background."""
+        content = 'email,name\nnew@example.com,New User\n'
+        url = reverse('admin:user_user_import_csv')
+        res = self.client.post(url, {'file': SimpleUploadedFile(
+            'users.csv', content.encode())})
+
+        self.assertRedirects(res, reverse('admin:user_user_changelist'))
+        mock_delay.assert_called_once_with(
+            'users', content, self.admin.email)
+
+    @patch('core.admin.import_csv_file.delay')
+    def test_upload_invalid_header(self, mock_delay):
+        """Test file with invalid header is not imported."""
+        url = reverse('admin:task_task_import_csv')
+        res = self.client.post(url, {'file': SimpleUploadedFile(
+            'tasks.csv', b'title\nSample\n')})
+
+        self.assertEqual(res.status_code, 200)
+        self.assertContains(res, 'Unknown columns: title.')
+        mock_delay.assert_not_called()
+
+    def test_changelist_links_import(self):
+        """Test changelist shows import link."""
+        res = self.client.get(reverse('admin:task_task_changelist'))
+
+        self.assertContains(res, reverse('admin:task_task_import_csv'))
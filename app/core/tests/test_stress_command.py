@@ -0,0 +1,26 @@
+"""
+Tests for the task flow stress command.
+"""
+from io import StringIO
+
+from django.test import TransactionTestCase
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from task.models import Task
+
+
+class StressTaskFlowsTests(TransactionTestCase):
+    """Test stress command against the test database."""
+
+    def test_small_run_reports_and_cleans_up(self):
+        """Test command reports results and deletes its data."""
+        out = StringIO()
+        call_command(
+            'stress_task_flows', employees=4, managers=2, tasks=4,
+            attempts=3, concurrency=6, seed=1, stdout=out)
+
+        output = out.getvalue()
+        self.assertIn('take_task', output)
+        self.assertIn('Lost updates: 0', output)
+        self.assertFalse(Task.objects.exists())
+        self.assertFalse(get_user_model().objects.exists())
@@ -2,14 +2,17 @@
 Tests for the task and evaluation services.
 """
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.urls import reverse
 from unittest.mock import patch
 from core.services import (
     select_tasks_for_month, select_tasks_for_today,
     select_all_manager_tasks, sellect_all_available_employee_tasks,
-    select_all_emploee_tasks_todo, select_user_evaluations
+    select_all_emploee_tasks_todo, select_user_evaluations,
+    claim_task, claim_next_task, select_task_for_detail
 )
-from task.models import Task
+from task.models import TaskEvent
+from task.models import Task, Comment
 from team.models import Team
 from evaluation.models import Evaluation
 from django.contrib.auth import get_user_model
@@ -94,6 +97,26 @@ class TaskTests(TestCase):
         res2 = select_tasks_for_month(self.manager)
         self.assertEqual(len(res2), 2)
 
+    @patch('core.services.timezone.now')
+    def test_select_tasks_for_today_ignores_other_months(self, mock_now):
+        """Test tasks due on the same day of another month are excluded."""
+        mock_now.return_value = datetime(2025, 5, 1, 8, 30, tzinfo=pytz.UTC)
+        Task.objects.create(
+            user=self.manager,
+            description='some description',
+            deadline=datetime(2025, 6, 1, tzinfo=pytz.UTC),
+            assign_to=self.user
+        )
+        Task.objects.create(
+            user=self.manager,
+            description='some description',
+            deadline=datetime(2024, 5, 1, tzinfo=pytz.UTC),
+            assign_to=self.user
+        )
+
+        self.assertEqual(len(select_tasks_for_today(self.user)), 0)
+        self.assertEqual(len(select_tasks_for_month(self.user)), 0)
+
     def test_select_all_manager_tasks(self):
         """Test retrieving all manager created tasks."""
         task = Task.objects.create(
@@ -150,6 +173,85 @@ class TaskTests(TestCase):
         self.assertEqual(len(res), 1)
         self.assertEqual(res[0].description, 'My task.')
 
+    def test_claim_task_only_once(self):
+        """Test second claim of a task fails and keeps the first one."""
+        task = Task.objects.create(
+            user=self.manager, description='Task', deadline='2025-06-01')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(claim_task(task.id, self.user))
+            self.assertFalse(claim_task(task.id, self.other_user))
+
+        task.refresh_from_db()
+        self.assertEqual(task.assign_to, self.user)
+        self.assertEqual(task.status, 'in_progress')
+        event = TaskEvent.objects.get()
+        self.assertEqual(event.task, task)
+        self.assertEqual(event.actor, self.user)
+        self.assertEqual(event.assign_to, self.user)
+        self.assertEqual(
+            (event.from_status, event.to_status), ('opened', 'in_progress'))
+
+    def test_claim_next_task(self):
+        """Test claim next takes earliest available task of manager."""
+        other_manager = get_user_model().objects.create_user(
+            email='manager2@example.com',
+            password='testpass123',
+            is_manager=True
+        )
+        Task.objects.create(
+            user=other_manager, description='Other', deadline='2025-05-01')
+        Task.objects.create(
+            user=self.manager, description='Taken', deadline='2025-05-01',
+            assign_to=self.other_user)
+        later = Task.objects.create(
+            user=self.manager, description='Later', deadline='2025-06-02')
+        first = Task.objects.create(
+            user=self.manager, description='First', deadline='2025-06-01')
+
+        self.assertEqual(claim_next_task(self.user), first)
+        self.assertEqual(claim_next_task(self.user), later)
+        self.assertIsNone(claim_next_task(self.user))
+        first.refresh_from_db()
+        self.assertEqual(first.assign_to, self.user)
+
+    @override_settings(TASK_COMMENTS_PAGE_SIZE=2)
+    def test_select_task_for_detail_pages_comments(self):
+        """Test comments are paged newest first and shown in order."""
+        task = Task.objects.create(
+            user=self.manager, description='Task', deadline='2025-06-01')
+        comments = [
+            Comment.objects.create(task=task, user=self.user, text=str(i))
+            for i in range(3)
+        ]
+
+        first = select_task_for_detail(task.id)
+        older = select_task_for_detail(task.id, first.older_comments_before)
+
+        self.assertEqual(first.comment_page, comments[1:])
+        self.assertEqual(first.older_comments_before, comments[1].id)
+        self.assertEqual(older.comment_page, comments[:1])
+        self.assertIsNone(older.older_comments_before)
+        self.assertIsNone(select_task_for_detail(task.id + 1))
+
+    def test_task_detail_query_count_is_fixed(self):
+        """Test task detail queries do not grow with comments."""
+        task = Task.objects.create(
+            user=self.manager, description='Task', deadline='2025-06-01',
+            assign_to=self.user)
+        self.client.force_login(self.manager)
+        url = reverse('task_detail', args=[task.id])
+        Comment.objects.create(task=task, user=self.user, text='First')
+        with self.assertNumQueries(4) as first:
+            self.client.get(url)
+        for user in (self.manager, self.other_user):
+            Comment.objects.create(task=task, user=user, text='More')
+
+        with self.assertNumQueries(len(first)):
+            res = self.client.get(url)
+
+        self.assertContains(res, 'More', count=2)
+
 
 class EvaluationTests(TestCase):
     """Tests for evaluation."""
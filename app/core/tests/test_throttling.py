@@ -0,0 +1,150 @@
+"""
+Tests for token bucket throttles.
+"""
+from unittest.mock import patch
+
+import redis
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.throttling import LocalBuckets, get_buckets, parse_rate, take_token
+from task.models import Task
+
+RATES = {
+    'comment': {'user': '2/min', 'ip': '3/min'},
+    'login': {'ip': '1/hour', 'email': '2/hour'},
+}
+
+
+class TokenBucketTests(SimpleTestCase):
+    """Test bucket arithmetic."""
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('30/min'), (30, 0.5))
+        self.assertEqual(parse_rate('10/s'), (10, 10))
+
+    @patch('core.throttling.time.monotonic')
+    def test_bucket_refills_over_time(self, monotonic):
+        buckets = LocalBuckets()
+        monotonic.return_value = 100.0
+
+        self.assertEqual(
+            [buckets.take('key', 2, 0.5) for _ in range(3)], [0, 0, 2.0])
+        monotonic.return_value = 101.0
+        self.assertEqual(buckets.take('key', 2, 0.5), 1.0)
+        monotonic.return_value = 102.0
+        self.assertEqual(buckets.take('key', 2, 0.5), 0)
+
+    @override_settings(THROTTLE_REDIS_URL='redis://redis:6379/3',
+                       THROTTLE_RATES=RATES)
+    def test_redis_failure_lets_requests_through(self):
+        with patch('core.throttling.RedisBuckets.take',
+                   side_effect=redis.ConnectionError), \
+                self.assertLogs('core.throttling', 'WARNING'):
+            self.assertEqual(take_token('comment', 'user', 1), 0)
+
+
+@override_settings(THROTTLE_REDIS_URL=None, THROTTLE_RATES=RATES)
+class ThrottledViewTests(TestCase):
+    """Test API and HTML writes answer 429 when over the rate."""
+
+    def setUp(self):
+        get_buckets().clear()
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='testpass123')
+        self.task = Task.objects.create(
+            user=self.user, description='Task', deadline='2025-06-01')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def post_comment(self):
+        return self.client.post(reverse('task:comment-list'), {
+            'task': self.task.id, 'user': self.user.id, 'text': 'Hi'})
+
+    def test_comment_api_throttled_per_user(self):
+        """Test user over the rate gets 429 with Retry-After."""
+        responses = [self.post_comment() for _ in range(3)]
+
+        self.assertEqual(
+            [res.status_code for res in responses],
+            [status.HTTP_201_CREATED] * 2 +
+            [status.HTTP_429_TOO_MANY_REQUESTS])
+        self.assertEqual(responses[-1]['Retry-After'], '30')
+        self.assertEqual(
+            self.client.get(reverse('task:comment-list')).status_code,
+            status.HTTP_200_OK)
+
+    def test_comment_api_throttled_per_ip(self):
+        """Test users sharing an IP share its bucket."""
+        self.post_comment()
+        self.post_comment()
+        self.client.force_authenticate(get_user_model().objects.create_user(
+            email='other@example.com'))
+
+        self.assertEqual(self.post_comment().status_code,
+                         status.HTTP_201_CREATED)
+        self.assertEqual(self.post_comment().status_code,
+                         status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_login_page_throttled_per_ip(self):
+        """Test login attempts over the rate get 429."""
+        data = {'email': 'user@example.com', 'password': 'wrong'}
+        self.client.post(reverse('login'), data)
+
+        res = self.client.post(reverse('login'), data)
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(res['Retry-After'], '3600')
+
+    def test_forwarded_for_does_not_reset_ip_bucket(self):
+        """Test a spoofed X-Forwarded-For shares the peer bucket."""
+        data = {'email': 'user@example.com', 'password': 'wrong'}
+        self.client.post(reverse('login'), data,
+                         HTTP_X_FORWARDED_FOR='10.0.0.1')
+
+        res = self.client.post(reverse('login'), data,
+                               HTTP_X_FORWARDED_FOR='10.0.0.2')
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_forwarded_for_of_trusted_proxy(self):
+        """Test clients behind a trusted proxy get their own buckets."""
+        data = {'email': 'user@example.com', 'password': 'wrong'}
+        rest_framework = {**settings.REST_FRAMEWORK, 'NUM_PROXIES': 1}
+
+        with override_settings(REST_FRAMEWORK=rest_framework):
+            responses = [
+                self.client.post(reverse('login'), data,
+                                 HTTP_X_FORWARDED_FOR=f'10.0.0.{i}')
+                for i in (1, 2, 2)]
+
+        self.assertEqual(
+            [res.status_code for res in responses],
+            [status.HTTP_200_OK] * 2 + [status.HTTP_429_TOO_MANY_REQUESTS])
+
+    def test_login_throttled_per_email(self):
+        """Test attempts on one email from many IPs get 429."""
+        responses = [
+            self.client.post(reverse('user:token'), {
+                'email': email, 'password': 'wrong'},
+                REMOTE_ADDR=f'10.0.0.{i}')
+            for i, email in enumerate(
+                ('user@example.com', ' User@Example.com', 'USER@example.com'))
+        ]
+
+        self.assertEqual(
+            [res.status_code for res in responses],
+            [status.HTTP_401_UNAUTHORIZED] * 2 +
+            [status.HTTP_429_TOO_MANY_REQUESTS])
+
+
+class ThrottleDefaultsTests(SimpleTestCase):
+    """Test other tests run without throttles."""
+
+    def test_no_rates_outside_throttle_tests(self):
+        self.assertEqual(settings.THROTTLE_RATES, {})
+        self.assertEqual(take_token('login', 'ip', '127.0.0.1'), 0)
@@ -3,6 +3,7 @@ Tests for the user services.
 """
 
 from django.test import TestCase
+from django.urls import reverse
 from core.services import (
     get_context_for_starting_page,
     save_user, update_profile
@@ -127,6 +128,41 @@ class UserTests(TestCase):
             authenticate(email=user.email, password=data['password'])
             )
 
+    def test_register_page_digest_choice(self):
+        """Test sign up keeps digest opt-in unless it is unchecked."""
+        form = self.client.get(reverse('register'))
+        self.assertContains(form, 'name="receive_digest"')
+        data = {'password': 'testpass123', 'name': 'test'}
+
+        self.client.post(reverse('register'), {
+            **data, 'email': 'in@example.com', 'digest_choice': '1',
+            'receive_digest': 'on'})
+        self.client.post(reverse('register'), {
+            **data, 'email': 'out@example.com', 'digest_choice': '1'})
+        self.client.post(reverse('register'), {
+            **data, 'email': 'old@example.com'})
+
+        self.assertEqual(
+            dict(User.objects.values_list('email', 'receive_digest')),
+            {'in@example.com': True, 'out@example.com': False,
+             'old@example.com': True})
+
+    def test_update_profile_digest_opt_out(self):
+        """Test turning off daily agenda digest."""
+        user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='testpass123',
+            name='test'
+        )
+        data = {
+            'name': 'test',
+            'password': 'newpassword',
+            'receive_digest': False
+        }
+        update_profile(user, data)
+        user.refresh_from_db()
+        self.assertFalse(user.receive_digest)
+
     def test_update_profile_invalid_data(self):
         """Test updating profile with invalid data."""
         user = get_user_model().objects.create_user(
@@ -0,0 +1,160 @@
+"""
+Tests for the user stats rollup.
+"""
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.services import claim_task, refresh_user_stats
+from evaluation.models import Evaluation
+from meeting.models import Meeting
+from task.models import Task
+from user.models import UserStats
+
+
+class UserStatsTests(TestCase):
+    """Test stats kept by signals and bulk writes match a rebuild."""
+
+    def setUp(self):
+        users = get_user_model().objects
+        self.manager = users.create_user(
+            email='manager@example.com', is_manager=True)
+        self.user = users.create_user(email='user@example.com')
+        self.other = users.create_user(email='other@example.com')
+
+    def assertStatsRebuilt(self):
+        """Assert stored stats equal the ones rebuilt from scratch."""
+        stats = list(UserStats.objects.order_by('user_id').values())
+        refresh_user_stats()
+        self.assertEqual(
+            stats, list(UserStats.objects.order_by('user_id').values()))
+
+    def stats(self, user):
+        return UserStats.objects.get(user=user)
+
+    def test_task_changes_counted(self):
+        """Test task status, assignee and grade changes move counters."""
+        task = Task.objects.create(
+            user=self.manager, description='Task', deadline='2025-06-01',
+            assign_to=self.user)
+        Task.objects.create(
+            user=self.manager, description='Open', deadline='2025-06-01',
+            assign_to=self.user)
+        task.status = 'done'
+        task.save()
+        evaluation = Evaluation.objects.create(grade=4, task_id=task)
+        evaluation.grade = 2
+        evaluation.save()
+
+        stats = self.stats(self.user)
+        self.assertEqual(
+            (stats.open_tasks, stats.done_tasks, stats.graded_tasks),
+            (1, 1, 1))
+        self.assertEqual(stats.average_grade, 2)
+        self.assertStatsRebuilt()
+
+        task.assign_to = self.other
+        task.save()
+        self.assertEqual(self.stats(self.other).average_grade, 2)
+        self.assertIsNone(self.stats(self.user).average_grade)
+        self.assertStatsRebuilt()
+
+        task.delete()
+        self.assertEqual(self.stats(self.other).done_tasks, 0)
+        self.assertEqual(self.stats(self.other).graded_tasks, 0)
+        self.assertStatsRebuilt()
+
+    def test_bulk_task_writes_counted(self):
+        """Test bulk API writes and claims keep stats in step."""
+        client = APIClient()
+        client.force_authenticate(self.manager)
+        res = client.post(reverse('task:bulk'), [
+            {'description': str(i), 'deadline': '2025-06-01',
+             'assign_to': self.user.id} for i in range(3)
+        ], format='json')
+        ids = [task['id'] for task in res.data]
+        Evaluation.objects.create(grade=5, task_id=Task.objects.get(
+            id=ids[0]))
+        client.post(reverse('task:bulk-status'),
+                    {'ids': ids[:2], 'status': 'done'}, format='json')
+        client.post(reverse('task:bulk-assign'),
+                    {'ids': ids[1:], 'assign_to': self.other.id},
+                    format='json')
+        client.patch(reverse('task:bulk'),
+                     [{'id': ids[0], 'status': 'in_progress'}],
+                     format='json')
+        claim_task(Task.objects.create(
+            user=self.manager, description='Free',
+            deadline='2025-06-01').id, self.user)
+
+        self.assertEqual(self.stats(self.user).in_progress_tasks, 2)
+        self.assertEqual(self.stats(self.other).done_tasks, 1)
+        self.assertStatsRebuilt()
+
+    def test_meeting_participation_counted(self):
+        """Test upcoming meetings follow participants, dates and deletes."""
+        now = timezone.now()
+        meeting = Meeting.objects.create(
+            title='Planning', date=now + timedelta(days=1))
+        Meeting.objects.create(
+            title='Past', date=now - timedelta(days=2)
+        ).participants.add(self.user)
+        meeting.participants.add(self.user, self.other)
+        self.other.meetings.add(Meeting.objects.create(
+            title='Review', date=now + timedelta(days=2)))
+        self.assertEqual(self.stats(self.user).upcoming_meetings, 1)
+        self.assertEqual(self.stats(self.other).upcoming_meetings, 2)
+
+        meeting.participants.remove(self.user, self.manager)
+        self.other.meetings.clear()
+        self.assertEqual(self.stats(self.user).upcoming_meetings, 0)
+        self.assertEqual(self.stats(self.other).upcoming_meetings, 0)
+        self.assertStatsRebuilt()
+
+        meeting.participants.add(self.user)
+        meeting.date = now - timedelta(days=3)
+        meeting.save()
+        self.assertEqual(self.stats(self.user).upcoming_meetings, 0)
+        meeting.date = now + timedelta(days=3)
+        meeting.save()
+        self.assertEqual(self.stats(self.user).upcoming_meetings, 1)
+        meeting.delete()
+        self.assertEqual(self.stats(self.user).upcoming_meetings, 0)
+        self.assertStatsRebuilt()
+
+    def test_reconcile_command_rebuilds_stats(self):
+        """Test command restores drifted and missing rows."""
+        Task.objects.create(
+            user=self.manager, description='Task', deadline='2025-06-01',
+            assign_to=self.user)
+        UserStats.objects.filter(user=self.user).update(open_tasks=7)
+        UserStats.objects.filter(user=self.other).delete()
+        out = StringIO()
+
+        call_command('reconcile_user_stats', stdout=out)
+
+        self.assertIn('Reconciled stats of 3 users.', out.getvalue())
+        self.assertEqual(self.stats(self.user).open_tasks, 1)
+        self.assertTrue(UserStats.objects.filter(user=self.other).exists())
+
+    def test_stats_endpoint(self):
+        """Test user reads own stats with one primary key lookup."""
+        task = Task.objects.create(
+            user=self.manager, description='Task', deadline='2025-06-01',
+            assign_to=self.user, status='done')
+        Evaluation.objects.create(grade=3, task_id=task)
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        res = client.get(reverse('user:me-stats'))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['done_tasks'], 1)
+        self.assertEqual(res.data['average_grade'], 3.0)
@@ -0,0 +1,166 @@
+"""
+Token bucket throttles shared by API views and HTML views.
+"""
+import logging
+import math
+import threading
+import time
+from functools import wraps
+
+import redis
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle
+
+logger = logging.getLogger(__name__)
+
+# Refill, take a token and store the bucket in one atomic round trip.
+# Returns seconds to wait as a string, Lua numbers are sent as integers.
+TOKEN_BUCKET_SCRIPT = '''
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'at')
+local tokens = tonumber(bucket[1]) or capacity
+local at = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - at) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'at', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return tostring(wait)
+'''
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate: str) -> tuple[int, float]:
+    """Return (capacity, tokens per second) of a rate like '30/min'."""
+    count, period = rate.split('/')
+    capacity = int(count)
+    return capacity, capacity / PERIODS[period[0]]
+
+
+class RedisBuckets:
+    """Buckets shared by every process through a Redis script."""
+
+    def __init__(self, url: str):
+        self.script = redis.Redis.from_url(url).register_script(
+            TOKEN_BUCKET_SCRIPT)
+
+    def take(self, key: str, capacity: int, rate: float) -> float:
+        """Take a token, return 0 or seconds until one is available."""
+        return float(self.script(keys=[key], args=[capacity, rate]))
+
+
+class LocalBuckets:
+    """Buckets kept in process memory when Redis is not configured."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets = {}
+
+    def take(self, key: str, capacity: int, rate: float) -> float:
+        """Take a token, return 0 or seconds until one is available."""
+        now = time.monotonic()
+        with self.lock:
+            tokens, at = self.buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - at) * rate)
+            wait = 0 if tokens >= 1 else (1 - tokens) / rate
+            self.buckets[key] = (tokens - 1 if not wait else tokens, now)
+        return wait
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+_buckets = {}
+
+
+def get_buckets():
+    """Return buckets of the configured THROTTLE_REDIS_URL."""
+    url = settings.THROTTLE_REDIS_URL
+    if url not in _buckets:
+        _buckets[url] = RedisBuckets(url) if url else LocalBuckets()
+    return _buckets[url]
+
+
+def take_token(scope: str, kind: str, ident) -> float:
+    """Take a token of scope for ident, return seconds to wait or 0.
+
+    Requests are let through when Redis is down, throttling is a
+    safeguard and must not take the site down with it.
+    """
+    rate = settings.THROTTLE_RATES.get(scope, {}).get(kind)
+    if rate is None:
+        return 0
+    capacity, per_second = parse_rate(rate)
+    try:
+        return get_buckets().take(
+            f'throttle:{scope}:{kind}:{ident}', capacity, per_second)
+    except redis.RedisError:
+        logger.warning('Could not check throttle.', exc_info=True)
+        return 0
+
+
+def check_request(request, scope: str) -> float:
+    """Return seconds the request has to wait under user, IP and email
+    limits.
+
+    The client IP is read from X-Forwarded-For entries added by the
+    REST_FRAMEWORK['NUM_PROXIES'] trusted proxies, else the peer address.
+    """
+    waits = [take_token(scope, 'ip', BaseThrottle().get_ident(request))]
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        waits.append(take_token(scope, 'user', user.pk))
+    if 'email' in settings.THROTTLE_RATES.get(scope, {}):
+        data = getattr(request, 'data', request.POST)
+        email = str(data.get('email') or '').strip().lower()
+        if email:
+            waits.append(take_token(scope, 'email', email))
+    return max(waits)
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Throttle writes per user and per IP with `throttle_scope` rates.
+
+    Views set `throttle_scope` to a key of THROTTLE_RATES, which maps
+    'user', 'ip' and 'email' to rates like '30/min'. Reads are not
+    throttled.
+    """
+
+    def allow_request(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        if scope is None or request.method in SAFE_METHODS:
+            return True
+        self.delay = check_request(request, scope)
+        return not self.delay
+
+    def wait(self):
+        return self.delay
+
+
+def throttle(scope: str):
+    """Decorate HTML view to answer 429 when writes exceed scope rates."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in SAFE_METHODS:
+                delay = check_request(request, scope)
+                if delay:
+                    response = HttpResponse(
+                        'Too many requests, please try again later.',
+                        status=429, content_type='text/plain')
+                    response['Retry-After'] = str(math.ceil(delay))
+                    return response
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
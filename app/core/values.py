@@ -0,0 +1,121 @@
+"""
+Read-only serialization of list rows straight from values().
+"""
+from datetime import date
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import fields as drf_fields, relations
+from rest_framework.response import Response
+from rest_framework.serializers import BaseSerializer
+from rest_framework.settings import api_settings
+
+from core.pagination import get_cursor_ordering
+
+# Fields whose representation of a database value is the value itself.
+IDENTITY_FIELDS = (
+    drf_fields.IntegerField,
+    drf_fields.CharField,
+    drf_fields.BooleanField,
+    relations.PrimaryKeyRelatedField,
+)
+
+
+def get_converter(field):
+    """Return callable converting a database value, None for identity."""
+    if isinstance(field, drf_fields.ChoiceField):
+        mapping = field.choice_strings_to_values
+        if all(key == value for key, value in mapping.items()):
+            return None
+        return field.to_representation
+    if isinstance(field, IDENTITY_FIELDS):
+        return None
+    if isinstance(field, drf_fields.DateField):
+        output_format = getattr(field, 'format', api_settings.DATE_FORMAT)
+        if output_format is None:
+            return None
+        if output_format.lower() == drf_fields.ISO_8601:
+            return date.isoformat
+    if isinstance(field, drf_fields.DateTimeField):
+        output_format = getattr(
+            field, 'format', api_settings.DATETIME_FORMAT)
+        if output_format is None:
+            return None
+        tz = getattr(field, 'timezone', None) or field.default_timezone()
+        if tz is not None and output_format.lower() == drf_fields.ISO_8601:
+            return iso_datetime(tz)
+    return field.to_representation
+
+
+def iso_datetime(tz):
+    """Return converter of aware datetimes to ISO 8601 in tz."""
+    def convert(value):
+        value = value.astimezone(tz).isoformat()
+        if value.endswith('+00:00'):
+            return value[:-6] + 'Z'
+        return value
+    return convert
+
+
+def compile_row_converters(serializer, model):
+    """Return (lookup, name, converter) for each field or None.
+
+    None means the serializer renders something `values()` cannot
+    provide, e.g. nested serializers, many relations or method fields.
+    """
+    converters = []
+    for field in serializer._readable_fields:
+        if isinstance(field, (BaseSerializer, relations.ManyRelatedField,
+                              drf_fields.SerializerMethodField,
+                              drf_fields.ListField)) or \
+                '.' in field.source or field.source == '*':
+            return None
+        if isinstance(field, relations.RelatedField) and \
+                not isinstance(field, relations.PrimaryKeyRelatedField):
+            return None
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return None
+        if not model_field.concrete:
+            return None
+        converters.append(
+            (model_field.attname, field.field_name, get_converter(field)))
+    return converters
+
+
+def build_rows(rows, converters):
+    """Return representations of value rows."""
+    return [
+        {name: row[lookup] if convert is None or row[lookup] is None
+         else convert(row[lookup])
+         for lookup, name, convert in converters}
+        for row in rows
+    ]
+
+
+class ValuesListMixin:
+    """Serve list action from values() rows instead of model instances.
+
+    Falls back to the serializer when it renders anything that is not a
+    plain column of the model.
+    """
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_serializer(many=True)
+        queryset = self.filter_queryset(self.get_queryset())
+        converters = compile_row_converters(serializer.child, queryset.model)
+        if converters is None:
+            return super().list(request, *args, **kwargs)
+
+        lookups = {lookup for lookup, _, _ in converters}
+        lookups.update(order.lstrip('-') for order in self.get_row_ordering())
+        queryset = queryset.prefetch_related(None).values(*lookups)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(build_rows(page, converters))
+        return Response(build_rows(queryset, converters))
+
+    def get_row_ordering(self):
+        """Return fields the paginator reads from each row."""
+        key = get_cursor_ordering(self)
+        return (key, 'id')
@@ -6,13 +6,16 @@ from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.utils import timezone
-from django.http import HttpResponseRedirect
+from django.http import HttpResponseRedirect, Http404
 from django.urls import reverse
+from django.utils.decorators import method_decorator
 from .services import (
     get_context_for_starting_page, save_user,
     update_profile, save_team, update_team, have_meeting,
-    select_user_evaluations, save_meeting, cancel_meeting
+    select_user_evaluations, save_meeting, cancel_meeting, claim_task,
+    task_event, record_task_events, select_task_for_detail
 )
+from .throttling import throttle
 from .forms import TeamForm, MeetingForm, TaskForm, CommentForm, EvaluationForm
 from team.models import Team
 from meeting.models import Meeting
@@ -25,6 +28,7 @@ def starting_page(request):
     return render(request, 'index.html', context)
 
 
+@throttle('login')
 def sign_in(request):
     """View for login."""
     if request.method == 'POST':
@@ -47,7 +51,10 @@ def register(request):
         data = {
             'email': request.POST['email'],
             'password': request.POST['password'],
-            'name': request.POST['name']
+            'name': request.POST['name'],
+            # Forms without the checkbox keep the default opt-in.
+            'receive_digest': 'receive_digest' in request.POST or
+            'digest_choice' not in request.POST
         }
         result = save_user(data)
 
@@ -72,7 +79,8 @@ def update_user(request):
     if request.method == 'POST':
         data = {
             'password': request.POST['password'],
-            'name': request.POST['name']
+            'name': request.POST['name'],
+            'receive_digest': 'receive_digest' in request.POST
         }
         result = update_profile(request.user, data)
 
@@ -155,6 +163,7 @@ def delete_team(request, id):
     return redirect('home')
 
 
+@method_decorator(throttle('meeting'), name='post')
 class MeetingView(LoginRequiredMixin, View):
     """View for meetings."""
     def get(self, request):
@@ -200,15 +209,21 @@ def create_task(request):
             task = form.save(commit=False)
             task.user = request.user
             task.save()
+            record_task_events([task_event(task, request.user.id, '')])
             return redirect('home')
 
 
 @login_required
+@throttle('comment')
 def task_detail(request, id):
     """View for task detail."""
     evaluation_form = EvaluationForm()
     comment_form = CommentForm()
-    task = get_object_or_404(Task, id=int(id))
+    before = request.GET.get('before', '')
+    task = select_task_for_detail(
+        int(id), int(before) if before.isdigit() else None)
+    if task is None:
+        raise Http404('No Task matches the given query.')
     if request.method == 'GET':
         return render(
             request, 'task_detail.html',
@@ -233,6 +248,7 @@ def update_task(request, id):
     """Update task."""
     if request.user.is_manager:
         task = get_object_or_404(Task, id=int(id))
+        previous = (task.status, task.assign_to_id)
         inital = {
                 'user': task.user,
                 'description': task.description,
@@ -249,6 +265,8 @@ def update_task(request, id):
             form = TaskForm(request.POST, instance=task)
             if form.is_valid():
                 form.save()
+                record_task_events([task_event(
+                    task, request.user.id, *previous)])
                 return redirect('home')
             return render(request, 'update_task.html', {'form': form})
     return redirect('home')
@@ -291,10 +309,9 @@ def evaluate_task(request, id):
 @login_required
 def take_task(request, id):
     """Assign task."""
-    task = get_object_or_404(Task, id=id)
-    task.assign_to = request.user
-    task.status = 'in progress'
-    task.save()
+    if not claim_task(int(id), request.user):
+        get_object_or_404(Task, id=id)
+        messages.error(request, 'Task has already been taken.')
     return redirect('home')
 
 
@@ -303,8 +320,11 @@ def mark_task_as_done(request, id):
     """Change task status to done."""
     task = get_object_or_404(Task, id=id)
     if task.assign_to == request.user:
+        from_status = task.status
         task.status = 'done'
         task.save()
+        record_task_events([task_event(
+            task, request.user.id, from_status, task.assign_to_id)])
     return redirect('home')
 
 
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluation', '0004_alter_evaluation_user'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evaluation',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -23,6 +23,7 @@ class Evaluation(models.Model):
         Task, on_delete=models.CASCADE,
         related_name='evaluation'
         )
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f'task {self.task_id} - {self.grade}'
@@ -87,7 +87,7 @@ class PrivateManagerEvaluationAPITests(TestCase):
         evs = Evaluation.objects.all().order_by('-id')
         serializer = EvaluationSerializer(evs, many=True)
 
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_evaluations_limited_by_manager(self):
         """Test evaluations limited by manager."""
@@ -98,14 +98,14 @@ class PrivateManagerEvaluationAPITests(TestCase):
         Evaluation.objects.create(user=self.manager2, grade=1, task_id=task2)
         res = self.client.get(EVALUATION_URL)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 1)
-        self.assertEqual(res.data[0]['grade'], ev1.grade)
+        self.assertEqual(len(res.data['results']), 1)
+        self.assertEqual(res.data['results'][0]['grade'], ev1.grade)
 
     def test_empty_evaluation_list(self):
         """Test manager has no evaluations."""
         res = self.client.get(EVALUATION_URL)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, [])
+        self.assertEqual(res.data['results'], [])
 
     def test_update_evaluation_by_manager(self):
         """Test updating an evaluation."""
@@ -185,6 +185,7 @@ class EvaluetionPrivateAPITest(TestCase):
                     ).values('pk'))
                 ).order_by('-id')
         serializer = EvaluationSerializer(evs, many=True)
+        self.assertEqual(res.data['results'], serializer.data)
         self.assertEqual(res.data['result'], serializer.data)
         self.assertEqual(res.data['avg_grade'], (ev1.grade + ev2.grade)/2)
 
@@ -218,10 +219,30 @@ class EvaluetionPrivateAPITest(TestCase):
                     ).values('pk'))
                 ).order_by('-id')
         serializer = EvaluationSerializer(evs, many=True)
-        self.assertEqual(len(res.data['result']), 1)
-        self.assertEqual(res.data['result'], serializer.data)
+        self.assertEqual(len(res.data['results']), 1)
+        self.assertEqual(res.data['results'], serializer.data)
         self.assertEqual(res.data['avg_grade'], ev1.grade)
 
+    def test_avg_grade_changes_list_etag(self):
+        """Test regrading on another page changes the page ETag."""
+        tasks = [
+            Task.objects.create(
+                description=str(i), deadline='2025-06-01', status='done',
+                assign_to=self.user)
+            for i in range(2)]
+        older = Evaluation.objects.create(grade=1, task_id=tasks[0])
+        Evaluation.objects.create(grade=5, task_id=tasks[1])
+        params = {'page_size': 1}
+        etag = self.client.get(EVALUATION_URL, params)['ETag']
+
+        older.grade = 3
+        older.save()
+        res = self.client.get(EVALUATION_URL, params,
+                              HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['avg_grade'], 4)
+
     def test_create_evaluation(self):
         """Test creating an evaluation."""
         task = create_task(status='done')
@@ -243,3 +264,23 @@ class EvaluetionPrivateAPITest(TestCase):
         res = self.client.get(detail_url(ev.id))
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data, serializer.data)
+
+    def test_export_evaluations_csv(self):
+        """Test exporting user's evaluations as CSV."""
+        task = Task.objects.create(
+            description='1',
+            deadline='2025-06-01',
+            status='done',
+            assign_to=self.user
+        )
+        ev = Evaluation.objects.create(grade=4, task_id=task)
+        Evaluation.objects.create(grade=2, task_id=create_task(status='done'))
+
+        res = self.client.get(
+            reverse('evaluation:evaluation-export', args=['csv']))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        content = b''.join(res.streaming_content).decode()
+        self.assertEqual(
+            content.splitlines(),
+            ['id,grade,task_id,user', f'{ev.id},4,{task.id},'])
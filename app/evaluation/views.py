@@ -1,15 +1,22 @@
 """Views for Evaluation APIs."""
 
 from rest_framework import viewsets, permissions
+from rest_framework.decorators import action
 from evaluation.serializers import EvaluationSerializer
 from evaluation.models import Evaluation
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from core.permissions import IsManagerOrReadOnly
-from django.db.models import Subquery, Avg
+from core.export import stream_export, EXPORT_FORMATS
+from core.conditional import ConditionalGetMixin
+from core.values import ValuesListMixin
+from django.db.models import Subquery
+from django.utils.functional import cached_property
+from core.services import get_user_stats
 from task.models import Task
 
 
-class EvaluationAPIView(viewsets.ModelViewSet):
+class EvaluationAPIView(ConditionalGetMixin, ValuesListMixin,
+                        viewsets.ModelViewSet):
     """View for managing evaluation API."""
     serializer_class = EvaluationSerializer
     authentication_classes = [JWTAuthentication]
@@ -18,6 +25,12 @@ class EvaluationAPIView(viewsets.ModelViewSet):
         IsManagerOrReadOnly
         ]
     queryset = Evaluation.objects.all()
+    export_fields = {
+        'id': 'id',
+        'grade': 'grade',
+        'task_id': 'task_id_id',
+        'user': 'user_id',
+    }
 
     def get_queryset(self):
         if self.request.user.is_manager:
@@ -29,17 +42,32 @@ class EvaluationAPIView(viewsets.ModelViewSet):
                     ).values('pk'))
             ).select_related('task_id').order_by('-id')
 
+    @cached_property
+    def user_stats(self):
+        return get_user_stats(self.request.user)
+
+    def get_list_extra_version(self):
+        """Version avg_grade of employees, computed over every page."""
+        if self.request.user.is_manager:
+            return ()
+        return self.user_stats.grade_sum, self.user_stats.graded_tasks
+
     def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
         response = super().list(request, *args, **kwargs)
-        if self.request.user.is_manager:
+        if self.request.user.is_manager or response.status_code != 200:
             return response
-        response_data = {'result': response.data}
-        response_data['avg_grade'] = queryset.aggregate(
-            avg_grade=Avg('grade')).get('avg_grade')
-        response.data = response_data
+        response.data['avg_grade'] = self.user_stats.average_grade
+        # Deprecated key of the list before pagination, same rows as results.
+        response.data['result'] = response.data['results']
         return response
 
+    @action(detail=False, url_path=f'export/(?P<file_format>{EXPORT_FORMATS})')
+    def export(self, request, file_format):
+        """Stream user's evaluations as CSV or NDJSON."""
+        return stream_export(
+            self.get_queryset(), self.export_fields, file_format,
+            'evaluations')
+
     def perform_create(self, serializer):
         """Create a new evaluation."""
         serializer.save(user=self.request.user)
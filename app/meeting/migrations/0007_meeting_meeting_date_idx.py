@@ -0,0 +1,20 @@
+# Generated by Django 4.2.30 on 2026-10-17 22:54
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('meeting', '0006_remove_meeting_time_alter_meeting_date'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='meeting',
+            index=models.Index(fields=['date'], name='meeting_date_idx'),
+        ),
+    ]
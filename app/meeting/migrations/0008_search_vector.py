@@ -0,0 +1,51 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:04
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('meeting', '0007_meeting_meeting_date_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='meeting',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunSQL(
+            sql='''
+            CREATE FUNCTION meeting_search_vector_trigger() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                NEW.search_vector :=
+                    setweight(to_tsvector('pg_catalog.english',
+                        coalesce(NEW.title, '')), 'A') ||
+                    setweight(to_tsvector('pg_catalog.english',
+                        coalesce(NEW.description, '')), 'B');
+                RETURN NEW;
+            END
+            $$;
+            CREATE TRIGGER meeting_search_vector_update
+            BEFORE INSERT OR UPDATE ON meeting_meeting
+            FOR EACH ROW EXECUTE FUNCTION meeting_search_vector_trigger();
+            UPDATE meeting_meeting SET title = title;
+            ''',
+            reverse_sql='''
+            DROP TRIGGER IF EXISTS meeting_search_vector_update
+                ON meeting_meeting;
+            DROP FUNCTION IF EXISTS meeting_search_vector_trigger();
+            ''',
+        ),
+        AddIndexConcurrently(
+            model_name='meeting',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='meeting_search_idx'),
+        ),
+    ]
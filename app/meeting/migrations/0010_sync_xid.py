@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:52
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('sync', '0001_initial'),
+        ('meeting', '0009_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='meeting',
+            name='sync_xid',
+            field=models.BigIntegerField(editable=False, null=True),
+        ),
+        migrations.RunSQL(
+            sql='''
+            CREATE TRIGGER meeting_sync_xid_update
+            BEFORE INSERT OR UPDATE ON meeting_meeting
+            FOR EACH ROW EXECUTE FUNCTION sync_set_xid();
+            CREATE TRIGGER meeting_tombstone
+            AFTER DELETE ON meeting_meeting
+            FOR EACH ROW EXECUTE FUNCTION sync_record_tombstone('meeting');
+            UPDATE meeting_meeting SET sync_xid = pg_current_xact_id()::text::bigint;
+            ''',
+            reverse_sql='''
+            DROP TRIGGER IF EXISTS meeting_sync_xid_update ON meeting_meeting;
+            DROP TRIGGER IF EXISTS meeting_tombstone ON meeting_meeting;
+            ''',
+        ),
+        AddIndexConcurrently(
+            model_name='meeting',
+            index=models.Index(fields=['sync_xid'], name='meeting_sync_idx'),
+        ),
+    ]
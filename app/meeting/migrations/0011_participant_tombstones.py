@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:20
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('meeting', '0010_sync_xid'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            # Deleted meetings are tombstoned per participant by
+            # sync.signals.meeting_deleted, not for every user.
+            sql='DROP TRIGGER IF EXISTS meeting_tombstone ON meeting_meeting;',
+            reverse_sql='''
+            CREATE TRIGGER meeting_tombstone
+            AFTER DELETE ON meeting_meeting
+            FOR EACH ROW EXECUTE FUNCTION sync_record_tombstone('meeting');
+            ''',
+        ),
+    ]
@@ -4,6 +4,8 @@ Database Meeting model.
 
 from django.db import models
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from user.models import User
 
 
@@ -20,6 +22,16 @@ class Meeting(models.Model):
     participants = models.ManyToManyField(
         User, related_name='meetings'
         )
+    updated_at = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+    sync_xid = models.BigIntegerField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['date'], name='meeting_date_idx'),
+            GinIndex(fields=['search_vector'], name='meeting_search_idx'),
+            models.Index(fields=['sync_xid'], name='meeting_sync_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -5,11 +5,12 @@ Serializer for the Metting API View.
 from rest_framework import serializers
 from meeting.models import Meeting
 from user.serializers import UserSerializer
+from core.fieldsets import ExpandableFieldsMixin
 
 
-class MeetingSerializer(serializers.ModelSerializer):
+class MeetingSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     """Serializer for the meeting object."""
-    participants = UserSerializer(many=True, required=False)
+    expandable_fields = {'participants': UserSerializer}
 
     class Meta:
         model = Meeting
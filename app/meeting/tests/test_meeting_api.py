@@ -12,6 +12,7 @@ from meeting.serializers import MeetingSerializer
 from rest_framework import status
 from rest_framework.test import APIClient
 from datetime import datetime
+import json
 import pytz
 
 
@@ -60,15 +61,33 @@ class PrivateMeetingAPITests(TestCase):
         res = self.client.get(MEETING_URL)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 2)
-        serializer = MeetingSerializer(self.user.meetings, many=True)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(len(res.data['results']), 2)
+        serializer = MeetingSerializer(
+            self.user.meetings.order_by('date', 'id'), many=True)
+        self.assertEqual(res.data['results'], serializer.data)
+
+    def test_list_pages_within_one_millisecond(self):
+        """Test cursor keeps microseconds of meeting dates."""
+        meetings = []
+        for microsecond in (100, 200, 300, 400):
+            meeting = Meeting.objects.create(title='Standup', date=datetime(
+                2025, 5, 31, 14, 30, 0, microsecond, tzinfo=pytz.UTC))
+            meeting.participants.add(self.user)
+            meetings.append(meeting.id)
+
+        seen, url = [], MEETING_URL + '?page_size=1'
+        while url and len(seen) <= len(meetings):
+            res = self.client.get(url)
+            seen += [meeting['id'] for meeting in res.data['results']]
+            url = res.data['next']
+
+        self.assertEqual(seen, meetings)
 
     def test_empty_meeting_list(self):
         """Test retrieving empty meeting list."""
         res = self.client.get(MEETING_URL)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, [])
+        self.assertEqual(res.data['results'], [])
 
     def test_get_meeting_details(self):
         """Test getting meeting details."""
@@ -105,3 +124,47 @@ class PrivateMeetingAPITests(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
         self.assertEqual(res.data['title'], payload['title'])
+
+    def test_meetings_paginated_by_date_and_id(self):
+        """Test meetings with equal dates are paged without gaps."""
+        date = datetime(2025, 5, 31, 14, 30, tzinfo=pytz.UTC)
+        meetings = [
+            Meeting.objects.create(title=str(i), date=date) for i in range(3)
+            ]
+        later = Meeting.objects.create(
+            title='Later', date=datetime(2025, 6, 1, tzinfo=pytz.UTC))
+        for meeting in meetings + [later]:
+            meeting.participants.add(self.user)
+
+        ids = []
+        url = MEETING_URL + '?page_size=1'
+        while url:
+            res = self.client.get(url)
+            ids.extend(m['id'] for m in res.data['results'])
+            url = res.data['next']
+
+        self.assertEqual(ids, [m.id for m in meetings] + [later.id])
+
+    def test_export_meetings_ndjson(self):
+        """Test exporting user's meetings with all participants."""
+        other = get_user_model().objects.create_user(
+            email='other@example.com',
+            password='testpass123'
+        )
+        meeting = Meeting.objects.create(
+            title='First', date=datetime(2025, 5, 31, 14, 30, tzinfo=pytz.UTC))
+        meeting.participants.add(self.user, other)
+        Meeting.objects.create(
+            title='Not mine',
+            date=datetime(2025, 5, 31, 14, 30, tzinfo=pytz.UTC))
+
+        res = self.client.get(
+            reverse('meeting:meeting-export', args=['ndjson']))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        rows = [json.loads(line) for line in
+                b''.join(res.streaming_content).decode().splitlines()]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['title'], 'First')
+        self.assertEqual(
+            sorted(rows[0]['participants']), sorted([self.user.id, other.id]))
@@ -2,24 +2,54 @@
 View for meeting APIs.
 """
 
+from django.contrib.postgres.aggregates import ArrayAgg
 from rest_framework import viewsets, permissions
+from rest_framework.decorators import action
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from meeting.serializers import MeetingSerializer
 from meeting.models import Meeting
+from core.export import stream_export, EXPORT_FORMATS
+from core.conditional import ConditionalGetMixin
+from core.fieldsets import SparseFieldsetMixin
+from core.throttling import TokenBucketThrottle
 
 
-class MeetingAPIView(viewsets.ModelViewSet):
+class MeetingAPIView(ConditionalGetMixin, SparseFieldsetMixin,
+                     viewsets.ModelViewSet):
     """View for managing meeting APIs."""
     serializer_class = MeetingSerializer
     authentication_classes = [JWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'meeting'
     queryset = Meeting.objects.all()
+    cursor_ordering = 'date'
+    export_fields = {
+        'id': 'id',
+        'title': 'title',
+        'date': 'date',
+        'description': 'description',
+        'participants': 'participant_ids',
+    }
 
     def get_queryset(self):
         if self.action == 'list':
-            return self.request.user.meetings
+            return self.request.user.meetings.all()
+        if self.action == 'export':
+            return self.queryset.filter(
+                id__in=self.request.user.meetings.values('id')
+                ).annotate(
+                    participant_ids=ArrayAgg('participants__id')
+                ).order_by('date', 'id')
         return self.queryset
 
+    @action(detail=False, url_path=f'export/(?P<file_format>{EXPORT_FORMATS})')
+    def export(self, request, file_format):
+        """Stream user's meetings as CSV or NDJSON."""
+        return stream_export(
+            self.get_queryset(), self.export_fields, file_format,
+            'meetings')
+
     def perform_create(self, serializer):
         """Create a new meeting."""
         serializer.save(user=self.request.user)
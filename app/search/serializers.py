@@ -0,0 +1,19 @@
+"""
+Serializers for the search API View.
+"""
+
+from rest_framework import serializers
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    """Serializer for validating search query parameters."""
+    q = serializers.CharField(
+        max_length=200, help_text='Words to search for.')
+
+
+class SearchResultSerializer(serializers.Serializer):
+    """Serializer for a ranked search match."""
+    type = serializers.CharField(source='kind')
+    id = serializers.IntegerField()
+    rank = serializers.FloatField()
+    snippet = serializers.CharField()
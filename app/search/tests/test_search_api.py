@@ -0,0 +1,122 @@
+"""
+Tests for the search API.
+"""
+
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from task.models import Task, Comment
+from meeting.models import Meeting
+from datetime import datetime
+import pytz
+
+
+SEARCH_URL = reverse('search:search')
+
+
+class PublicSearchAPITests(TestCase):
+    """Test unauthenticated API requests."""
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_auth_required(self):
+        res = self.client.get(SEARCH_URL, {'q': 'report'})
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PrivateSearchAPITests(TestCase):
+    """Test authenticated API requests."""
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(self.user)
+        self.task = Task.objects.create(
+            description='Prepare quarterly report', deadline='2025-06-01')
+        self.comment = Comment.objects.create(
+            user=self.user, task=self.task,
+            text='The reports are attached')
+        self.meeting = Meeting.objects.create(
+            title='Report review', description='Discuss numbers',
+            date=datetime(2025, 5, 31, 14, 30, tzinfo=pytz.UTC))
+        self.meeting.participants.add(self.user)
+        Task.objects.create(
+            description='Buy coffee', deadline='2025-06-01')
+
+    def test_search_across_models(self):
+        """Test matches from every model are returned ranked."""
+        res = self.client.get(SEARCH_URL, {'q': 'report'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        found = {(r['type'], r['id']) for r in res.data['results']}
+        self.assertEqual(found, {
+            ('task', self.task.id),
+            ('comment', self.comment.id),
+            ('meeting', self.meeting.id),
+        })
+        ranks = [r['rank'] for r in res.data['results']]
+        self.assertEqual(ranks, sorted(ranks, reverse=True))
+        snippets = {r['type']: r['snippet'] for r in res.data['results']}
+        self.assertIn('<mark>report</mark>', snippets['task'])
+
+    def test_snippets_escape_text(self):
+        """Test snippets carry no markup of the matched text."""
+        Comment.objects.create(
+            user=self.user, task=self.task,
+            text='<img src=x onerror=alert(1)><b>Budget</b> & plans')
+        self.task.description = 'Budget <script>alert(1)</script>'
+        self.task.save()
+
+        res = self.client.get(SEARCH_URL, {'q': 'budget'})
+
+        snippets = {r['type']: r['snippet'] for r in res.data['results']}
+        self.assertNotIn('<img', snippets['comment'])
+        self.assertNotIn('<b>', snippets['comment'])
+        self.assertIn('<mark>Budget</mark>', snippets['comment'])
+        self.assertIn('&amp;', snippets['comment'])
+        self.assertNotIn('<script>', snippets['task'])
+
+    def test_search_vector_follows_updates(self):
+        """Test updated text is searchable."""
+        self.task.description = 'Order new laptops'
+        self.task.save()
+
+        res = self.client.get(SEARCH_URL, {'q': 'laptop'})
+
+        self.assertEqual(
+            [(r['type'], r['id']) for r in res.data['results']],
+            [('task', self.task.id)])
+
+    def test_meetings_limited_to_participant(self):
+        """Test other users' meetings are not found."""
+        other = Meeting.objects.create(
+            title='Report for board',
+            date=datetime(2025, 5, 31, 14, 30, tzinfo=pytz.UTC))
+
+        res = self.client.get(SEARCH_URL, {'q': 'board'})
+
+        self.assertNotIn(
+            other.id,
+            [r['id'] for r in res.data['results'] if r['type'] == 'meeting'])
+
+    def test_search_pagination(self):
+        """Test walking search results with cursors."""
+        res = self.client.get(SEARCH_URL, {'q': 'report', 'page_size': 1})
+        seen = [(r['type'], r['id']) for r in res.data['results']]
+        while res.data['next']:
+            res = self.client.get(res.data['next'])
+            seen.extend((r['type'], r['id']) for r in res.data['results'])
+
+        self.assertEqual(len(seen), 3)
+        self.assertEqual(len(set(seen)), 3)
+
+    def test_query_required(self):
+        """Test empty query is rejected."""
+        res = self.client.get(SEARCH_URL)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,12 @@
+"""
+URL mapping for the search API.
+"""
+from django.urls import path
+from search.views import SearchAPIView
+
+
+app_name = 'search'
+
+urlpatterns = [
+    path('', SearchAPIView.as_view(), name='search'),
+]
@@ -0,0 +1,141 @@
+"""
+Views for the search API.
+"""
+from django.contrib.postgres.search import (
+    SearchQuery, SearchRank, SearchHeadline
+)
+from django.db.models import (
+    F, Func, Q, Value, CharField, FloatField, TextField
+)
+from django.db.models.functions import Cast, Concat
+from django.utils.html import escape
+from drf_spectacular.utils import extend_schema
+from rest_framework import generics, permissions
+from rest_framework.exceptions import NotFound
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from core.pagination import KeysetCursorPagination
+from search.serializers import SearchQuerySerializer, SearchResultSerializer
+from task.models import Task, Comment
+
+SEARCH_CONFIG = 'english'
+# Highlight markers that cannot be typed, replaced after escaping.
+START_SEL, STOP_SEL = '\x02', '\x03'
+
+
+class StripTags(Func):
+    """Text with HTML tags replaced by spaces."""
+    template = "regexp_replace(%(expressions)s, '<[^>]*>', ' ', 'g')"
+    output_field = TextField()
+
+
+class SearchCursorPagination(KeysetCursorPagination):
+    """Paginate ranked matches from several tables with a cursor."""
+    ordering = ('-rank', 'kind', '-id')
+
+    def get_ordering(self, request, queryset, view):
+        return self.ordering
+
+    def position_filter(self, position, kind):
+        """Return predicate selecting rows of kind after position."""
+        rank, last_kind, pk = position
+        if kind > last_kind:
+            return Q(rank__lte=rank)
+        if kind < last_kind:
+            return Q(rank__lt=rank)
+        return Q(rank__lt=rank) | Q(rank=rank, id__lt=pk)
+
+    def paginate_queryset(self, sources, request, view=None):
+        """Return page of matches merged from kind to queryset mapping."""
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        position = self.cursor.position if self.cursor else None
+
+        parts = []
+        for kind, queryset in sources.items():
+            if position is not None:
+                try:
+                    queryset = queryset.filter(
+                        self.position_filter(position, kind))
+                except (TypeError, ValueError):
+                    raise NotFound(self.invalid_cursor_message)
+            parts.append(queryset.annotate(
+                kind=Value(kind, output_field=CharField())
+                ).values('id', 'rank', 'kind').order_by(
+                    '-rank', '-id')[:self.page_size + 1])
+        union = parts[0].union(*parts[1:], all=True)
+        results = list(union.order_by(*self.ordering)[:self.page_size + 1])
+
+        self.page = results[:self.page_size]
+        self.has_next = len(results) > self.page_size
+        self.has_previous = False
+        return self.page
+
+    def get_previous_link(self):
+        return None
+
+
+class SearchAPIView(generics.GenericAPIView):
+    """Rank matches across tasks, comments and meetings."""
+    serializer_class = SearchResultSerializer
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = SearchCursorPagination
+
+    def get_sources(self, query):
+        """Return matching querysets annotated with rank."""
+        sources = {
+            'task': Task.objects.all(),
+            'comment': Comment.objects.all(),
+            'meeting': self.request.user.meetings.all(),
+        }
+        # ts_rank() returns real; comparing it as double precision keeps
+        # cursor positions exact after the round trip through JSON.
+        rank = Cast(SearchRank(F('search_vector'), query), FloatField())
+        return {
+            kind: queryset.filter(search_vector=query).annotate(rank=rank)
+            for kind, queryset in sources.items()
+        }
+
+    def get_snippets(self, page, query):
+        """Return escaped snippets with matches wrapped in <mark>."""
+        documents = {
+            'task': (Task.objects, F('description')),
+            # Comment text is raw HTML, only its words are shown.
+            'comment': (Comment.objects, StripTags('text')),
+            'meeting': (
+                self.request.user.meetings,
+                Concat('title', Value(' '), 'description')),
+        }
+        snippets = {}
+        for kind, (manager, document) in documents.items():
+            ids = [row['id'] for row in page if row['kind'] == kind]
+            if not ids:
+                continue
+            rows = manager.filter(id__in=ids).annotate(
+                snippet=SearchHeadline(
+                    document, query, config=SEARCH_CONFIG,
+                    start_sel=START_SEL, stop_sel=STOP_SEL,
+                    max_fragments=2)
+                ).values_list('id', 'snippet')
+            snippets.update({
+                (kind, pk): escape(text).replace(
+                    START_SEL, '<mark>').replace(STOP_SEL, '</mark>')
+                for pk, text in rows})
+        return snippets
+
+    @extend_schema(parameters=[SearchQuerySerializer])
+    def get(self, request):
+        params = SearchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        query = SearchQuery(
+            params.validated_data['q'], config=SEARCH_CONFIG,
+            search_type='websearch')
+
+        page = self.paginate_queryset(self.get_sources(query))
+        snippets = self.get_snippets(page, query)
+        for row in page:
+            row['snippet'] = snippets.get((row['kind'], row['id']), '')
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
@@ -0,0 +1,161 @@
+"""
+Per user change events published and streamed over Redis pub/sub.
+"""
+import asyncio
+import json
+import logging
+import weakref
+from collections import defaultdict
+from typing import Iterable, Optional
+
+import redis
+import redis.asyncio
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+# Events queued for a client that stopped reading are replaced by one
+# telling it to catch up with the sync API.
+RESYNC_EVENT = {'type': 'resync'}
+
+_client = None
+_brokers = weakref.WeakKeyDictionary()
+
+
+def user_channel(user_id: int) -> str:
+    return f'events:user:{user_id}'
+
+
+def get_client():
+    """Return Redis client used for publishing."""
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.EVENTS_REDIS_URL)
+    return _client
+
+
+def send_events(messages):
+    """Publish (channel, payload) pairs in one round trip."""
+    try:
+        pipe = get_client().pipeline(transaction=False)
+        for channel, payload in messages:
+            pipe.publish(channel, payload)
+        pipe.execute()
+    except redis.RedisError:
+        logger.warning('Could not publish change events.', exc_info=True)
+
+
+def publish_events(events: Iterable[tuple[Iterable[Optional[int]], dict]]):
+    """Publish (user ids, event) pairs after transaction commit."""
+    if not settings.EVENTS_REDIS_URL:
+        return
+    messages = {
+        (user_channel(pk), json.dumps(event, sort_keys=True))
+        for user_ids, event in events for pk in user_ids if pk
+    }
+    if messages:
+        transaction.on_commit(lambda: send_events(messages))
+
+
+def publish_event(user_ids: Iterable[Optional[int]], event: dict):
+    """Publish event to users after transaction commit."""
+    publish_events([(user_ids, event)])
+
+
+def format_event(event: dict) -> str:
+    """Return event as a Server-Sent Events message."""
+    return f'event: {event["type"]}\ndata: {json.dumps(event)}\n\n'
+
+
+class EventBroker:
+    """Fan out one Redis subscription to every stream of an event loop.
+
+    Each user channel is subscribed once however many streams the user
+    has open, idle streams cost a queue and no Redis connection.
+    """
+
+    def __init__(self, pubsub):
+        self.pubsub = pubsub
+        self.queues = defaultdict(set)
+        self.lock = asyncio.Lock()
+        self.reader = None
+
+    async def subscribe(self, user_id: int) -> asyncio.Queue:
+        """Return queue receiving events of user."""
+        queue = asyncio.Queue(settings.EVENTS_QUEUE_SIZE)
+        channel = user_channel(user_id)
+        async with self.lock:
+            if not self.queues[channel]:
+                await self.pubsub.subscribe(channel)
+            self.queues[channel].add(queue)
+            if self.reader is None or self.reader.done():
+                self.reader = asyncio.create_task(self.read())
+        return queue
+
+    async def unsubscribe(self, user_id: int, queue: asyncio.Queue):
+        channel = user_channel(user_id)
+        async with self.lock:
+            self.queues[channel].discard(queue)
+            if not self.queues[channel]:
+                del self.queues[channel]
+                await self.pubsub.unsubscribe(channel)
+
+    async def read(self):
+        """Deliver messages to queues while anyone is subscribed."""
+        while self.queues:
+            try:
+                message = await self.pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=1.0)
+            except redis.RedisError:
+                logger.warning('Event subscription failed.', exc_info=True)
+                self.notify_all(RESYNC_EVENT)
+                await asyncio.sleep(1.0)
+                continue
+            if message is None or message['type'] != 'message':
+                continue
+            channel = message['channel']
+            if isinstance(channel, bytes):
+                channel = channel.decode()
+            self.deliver(self.queues.get(channel, ()),
+                         json.loads(message['data']))
+
+    def notify_all(self, event):
+        self.deliver(
+            [queue for queues in self.queues.values() for queue in queues],
+            event)
+
+    def deliver(self, queues, event):
+        for queue in queues:
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RESYNC_EVENT)
+
+
+def get_broker() -> EventBroker:
+    """Return broker of the running event loop."""
+    loop = asyncio.get_running_loop()
+    if loop not in _brokers:
+        client = redis.asyncio.Redis.from_url(settings.EVENTS_REDIS_URL)
+        _brokers[loop] = EventBroker(client.pubsub())
+    return _brokers[loop]
+
+
+async def stream_events(broker: EventBroker, user_id: int):
+    """Yield Server-Sent Events of user until the client disconnects."""
+    queue = await broker.subscribe(user_id)
+    try:
+        yield f'retry: {settings.EVENTS_RETRY_MS}\n\n'
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    queue.get(), settings.EVENTS_KEEPALIVE)
+            except asyncio.TimeoutError:
+                yield ': keepalive\n\n'
+            else:
+                yield format_event(event)
+    finally:
+        await broker.unsubscribe(user_id, queue)
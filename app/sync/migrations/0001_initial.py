@@ -0,0 +1,56 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:51
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('sync_xid', models.BigIntegerField(editable=False, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['sync_xid'], name='tombstone_sync_idx')],
+            },
+        ),
+        migrations.RunSQL(
+            sql='''
+            CREATE FUNCTION sync_set_xid() RETURNS trigger AS $$
+            BEGIN
+                NEW.sync_xid := pg_current_xact_id()::text::bigint;
+                RETURN NEW;
+            END $$ LANGUAGE plpgsql;
+            CREATE FUNCTION sync_record_tombstone() RETURNS trigger AS $$
+            BEGIN
+                INSERT INTO sync_tombstone (model, object_id, created_at)
+                VALUES (TG_ARGV[0], OLD.id, now());
+                RETURN OLD;
+            END $$ LANGUAGE plpgsql;
+            CREATE TRIGGER tombstone_sync_xid_update
+            BEFORE INSERT ON sync_tombstone
+            FOR EACH ROW EXECUTE FUNCTION sync_set_xid();
+            ''',
+            reverse_sql='''
+            DROP TRIGGER IF EXISTS tombstone_sync_xid_update
+                ON sync_tombstone;
+            DROP FUNCTION IF EXISTS sync_record_tombstone();
+            DROP FUNCTION IF EXISTS sync_set_xid();
+            ''',
+        ),
+    ]
@@ -0,0 +1,33 @@
+"""
+Database models for the delta sync API.
+"""
+
+from django.db import models
+from django.conf import settings
+from django.utils import timezone
+
+
+class Tombstone(models.Model):
+    """Row deleted, or hidden from one user, since some sync token.
+
+    Task deletes are written by a database trigger for every user, meeting
+    deletes and removed participants by signals for the participants.
+    `sync_xid` is set by a trigger to the writing transaction id.
+    """
+    model = models.CharField(max_length=20)
+    object_id = models.BigIntegerField()
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=True, blank=True, related_name='+'
+    )
+    sync_xid = models.BigIntegerField(null=True, editable=False)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['sync_xid'], name='tombstone_sync_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.model} {self.object_id}'
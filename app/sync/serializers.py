@@ -0,0 +1,89 @@
+"""
+Serializers for the sync API View.
+"""
+import base64
+import binascii
+import json
+import re
+
+from rest_framework import serializers
+
+SNAPSHOT_RE = re.compile(r'^\d+:\d+:(\d+(,\d+)*)?$')
+
+
+def encode_token(snapshot, taken_at):
+    """Return sync token for a pg_snapshot text taken at a Unix time."""
+    return base64.urlsafe_b64encode(
+        f'{snapshot}@{taken_at}'.encode()).decode()
+
+
+def encode_cursor(snapshot, taken_at, after):
+    """Return cursor of the next full sync page.
+
+    after maps each kind to the last id sent, or None once it is done.
+    """
+    return base64.urlsafe_b64encode(json.dumps(
+        {'s': snapshot, 't': taken_at, 'a': after}).encode()).decode()
+
+
+class ChangesQuerySerializer(serializers.Serializer):
+    """Serializer for validating sync query parameters."""
+    token = serializers.CharField(
+        max_length=2000, required=False,
+        help_text='Token returned by the previous sync, omit for a full one.')
+    cursor = serializers.CharField(
+        max_length=2000, required=False,
+        help_text='Next page of a full sync, its token is only complete '
+                  'once no next page is returned.')
+
+    def validate_token(self, value):
+        """Return (pg_snapshot text, Unix time) the token was made of.
+
+        Tokens made before they carried a time are dated 0.
+        """
+        try:
+            snapshot, _, taken_at = base64.urlsafe_b64decode(
+                value.encode()).decode().partition('@')
+            taken_at = int(taken_at or 0)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            snapshot = ''
+        if not SNAPSHOT_RE.match(snapshot):
+            raise serializers.ValidationError('Invalid sync token.')
+        return snapshot, taken_at
+
+    def validate_cursor(self, value):
+        """Return (snapshot, Unix time, last id per kind) of the cursor."""
+        try:
+            data = json.loads(base64.urlsafe_b64decode(value.encode()))
+            snapshot, taken_at, after = data['s'], data['t'], data['a']
+            valid = SNAPSHOT_RE.match(snapshot) and \
+                isinstance(taken_at, int) and all(
+                    after.get(kind) is None or isinstance(after[kind], int)
+                    for kind in ('tasks', 'meetings'))
+        except (binascii.Error, ValueError, TypeError, KeyError,
+                AttributeError):
+            valid = False
+        if not valid:
+            raise serializers.ValidationError('Invalid sync cursor.')
+        return snapshot, taken_at, after
+
+    def validate(self, attrs):
+        if 'token' in attrs and 'cursor' in attrs:
+            raise serializers.ValidationError(
+                'Pass either a token or a cursor.')
+        return attrs
+
+
+class ChangeSetSerializer(serializers.Serializer):
+    """Serializer for rows of one kind changed since a token."""
+    updated = serializers.ListField(child=serializers.DictField())
+    deleted = serializers.ListField(child=serializers.IntegerField())
+
+
+class ChangesSerializer(serializers.Serializer):
+    """Serializer for the sync response."""
+    token = serializers.CharField()
+    next = serializers.CharField(
+        allow_null=True, help_text='Cursor of the next full sync page.')
+    tasks = ChangeSetSerializer()
+    meetings = ChangeSetSerializer()
@@ -0,0 +1,101 @@
+"""
+Signal handlers that record tombstones for rows leaving a user's view
+and publish change events to the users concerned.
+"""
+from django.conf import settings
+from django.db.models.signals import (
+    post_save, pre_delete, post_delete, m2m_changed
+)
+from django.dispatch import receiver
+
+from core.signals import comment_task_owners
+from meeting.models import Meeting
+from sync.events import publish_event, publish_events
+from sync.models import Tombstone
+from task.models import Task, Comment
+
+
+@receiver(m2m_changed, sender=Meeting.participants.through)
+def meeting_participants_removed(sender, instance, action, reverse,
+                                 pk_set, **kwargs):
+    """Tell removed participants to drop the meeting on next sync."""
+    if action not in ('pre_remove', 'pre_clear'):
+        return
+    if reverse:
+        meeting_ids = pk_set if action == 'pre_remove' else \
+            instance.meetings.values_list('id', flat=True)
+        pairs = [(meeting_id, instance.pk) for meeting_id in meeting_ids]
+    else:
+        user_ids = pk_set if action == 'pre_remove' else \
+            instance.participants.values_list('id', flat=True)
+        pairs = [(instance.pk, user_id) for user_id in user_ids]
+    Tombstone.objects.bulk_create([
+        Tombstone(model='meeting', object_id=meeting_id, user_id=user_id)
+        for meeting_id, user_id in pairs
+    ])
+    publish_events(
+        ([user_id], {'type': 'meeting', 'action': 'deleted',
+                     'id': meeting_id})
+        for meeting_id, user_id in pairs)
+
+
+@receiver(pre_delete, sender=Meeting)
+def meeting_deleted(sender, instance, **kwargs):
+    """Tell participants to drop the deleted meeting on next sync."""
+    Tombstone.objects.bulk_create([
+        Tombstone(model='meeting', object_id=instance.pk, user_id=user_id)
+        for user_id in instance.participants.values_list('id', flat=True)
+    ])
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def publish_task_event(sender, instance, created=False, **kwargs):
+    action = 'deleted' if kwargs['signal'] is post_delete else \
+        'created' if created else 'updated'
+    # Owners before saving are stored by core.signals.remember_task_owners.
+    previous = getattr(instance, '_dashboard_previous', None) or ()
+    publish_event(
+        {instance.user_id, instance.assign_to_id, *previous},
+        {'type': 'task', 'action': action, 'id': instance.pk})
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def publish_comment_event(sender, instance, created=False, **kwargs):
+    if not settings.EVENTS_REDIS_URL:
+        return
+    action = 'deleted' if kwargs['signal'] is post_delete else \
+        'created' if created else 'updated'
+    publish_event(
+        {instance.user_id, *comment_task_owners(instance)},
+        {'type': 'comment', 'action': action, 'id': instance.pk,
+         'task': instance.task_id})
+
+
+@receiver(post_save, sender=Meeting)
+@receiver(pre_delete, sender=Meeting)
+def publish_meeting_event(sender, instance, created=False, **kwargs):
+    if not settings.EVENTS_REDIS_URL:
+        return
+    action = 'deleted' if kwargs.get('signal') is pre_delete else \
+        'created' if created else 'updated'
+    publish_event(
+        {instance.user_id,
+         *instance.participants.values_list('id', flat=True)},
+        {'type': 'meeting', 'action': action, 'id': instance.pk})
+
+
+@receiver(m2m_changed, sender=Meeting.participants.through)
+def publish_participants_event(sender, instance, action, reverse, pk_set,
+                               **kwargs):
+    """Tell current participants about the changed meeting."""
+    if action != 'post_add':
+        return
+    if reverse:
+        publish_events(
+            ([instance.pk], {'type': 'meeting', 'action': 'updated',
+                             'id': meeting_id})
+            for meeting_id in pk_set)
+    else:
+        publish_meeting_event(sender, instance)
@@ -0,0 +1,241 @@
+"""
+Tests for change events.
+"""
+import asyncio
+import json
+from datetime import date
+from unittest.mock import patch
+
+import redis
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.services import claim_task
+from meeting.models import Meeting
+from sync.events import (
+    EventBroker, RESYNC_EVENT, send_events, stream_events, user_channel
+)
+from task.models import Task, Comment
+
+EVENTS_URL = reverse('sync:events')
+REDIS_URL = 'redis://redis:6379/2'
+
+
+def published(send):
+    """Return set of (user id, event) sent through mocked send_events."""
+    prefix = user_channel('')
+    return {
+        (int(channel[len(prefix):]), payload)
+        for call in send.call_args_list
+        for channel, payload in call.args[0]
+    }
+
+
+def event(**fields):
+    return json.dumps(fields, sort_keys=True)
+
+
+@override_settings(EVENTS_REDIS_URL=REDIS_URL)
+@patch('sync.events.send_events')
+class PublishEventTests(TestCase):
+    """Test events published by model changes."""
+    def setUp(self):
+        self.manager = get_user_model().objects.create_user(
+            email='manager@example.com', is_manager=True)
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com')
+        self.task = Task.objects.create(
+            user=self.manager, description='Task',
+            deadline=date(2026, 5, 1))
+
+    def test_task_assignment_published_to_owners(self, send):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.assign_to = self.user
+            self.task.save()
+
+        expected = event(type='task', action='updated', id=self.task.id)
+        self.assertEqual(published(send), {
+            (self.manager.id, expected), (self.user.id, expected)})
+
+    def test_nothing_published_without_redis(self, send):
+        with override_settings(EVENTS_REDIS_URL=None), \
+                self.captureOnCommitCallbacks(execute=True):
+            self.task.delete()
+
+        send.assert_not_called()
+
+    def test_comment_published_to_task_owners(self, send):
+        self.task.assign_to = self.user
+        self.task.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            comment = Comment.objects.create(
+                user=self.user, task=self.task, text='Done soon')
+
+        expected = event(type='comment', action='created', id=comment.id,
+                         task=self.task.id)
+        self.assertEqual(published(send), {
+            (self.manager.id, expected), (self.user.id, expected)})
+
+    def test_comment_owners_read_once(self, send):
+        with CaptureQueriesContext(connection) as queries:
+            Comment.objects.create(
+                user=self.user, task=self.task, text='Done soon')
+
+        owner_queries = [
+            query for query in queries if query['sql'].startswith(
+                'SELECT "task_task"."user_id", "task_task"."assign_to_id"')]
+        self.assertEqual(len(owner_queries), 1)
+
+    def test_meeting_participants_not_read_without_redis(self, send):
+        meeting = Meeting.objects.create(
+            user=self.manager, title='Planning', date=timezone.now())
+
+        def participant_queries():
+            with CaptureQueriesContext(connection) as queries:
+                meeting.save()
+            return [query for query in queries
+                    if 'meeting_meeting_participants' in query['sql']]
+
+        published_reads = participant_queries()
+        with override_settings(EVENTS_REDIS_URL=None):
+            self.assertEqual(
+                len(participant_queries()), len(published_reads) - 1)
+
+    def test_removed_participant_gets_deleted_event(self, send):
+        meeting = Meeting.objects.create(
+            user=self.manager, title='Planning', date=timezone.now())
+        meeting.participants.add(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            meeting.participants.remove(self.user)
+
+        self.assertIn(
+            (self.user.id, event(type='meeting', action='deleted',
+                                 id=meeting.id)),
+            published(send))
+
+    def test_claim_published(self, send):
+        with self.captureOnCommitCallbacks(execute=True):
+            claim_task(self.task.id, self.user)
+
+        expected = event(type='task', action='updated', id=self.task.id)
+        self.assertEqual(published(send), {
+            (self.manager.id, expected), (self.user.id, expected)})
+
+    def test_bulk_assign_published(self, send):
+        client = APIClient()
+        client.force_authenticate(self.manager)
+        with self.captureOnCommitCallbacks(execute=True):
+            res = client.post(
+                reverse('task:bulk-assign'),
+                {'ids': [self.task.id], 'assign_to': self.user.id},
+                format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn(
+            (self.user.id, event(type='task', action='updated',
+                                 id=self.task.id)),
+            published(send))
+
+
+class SendEventsTests(SimpleTestCase):
+    """Test publishing to Redis."""
+    def test_publish_failure_is_logged(self):
+        with patch('sync.events.get_client',
+                   side_effect=redis.ConnectionError), \
+                self.assertLogs('sync.events', 'WARNING'):
+            send_events({(user_channel(1), event(type='task'))})
+
+
+class FakePubSub:
+    """In memory stand-in for a Redis pub/sub connection."""
+    def __init__(self):
+        self.channels = []
+        self.messages = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        self.channels.append(channel)
+
+    async def unsubscribe(self, channel):
+        self.channels.remove(channel)
+
+    async def get_message(self, ignore_subscribe_messages, timeout):
+        try:
+            return await asyncio.wait_for(self.messages.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def publish(self, channel, data):
+        self.messages.put_nowait(
+            {'type': 'message', 'channel': channel.encode(), 'data': data})
+
+
+class EventBrokerTests(SimpleTestCase):
+    """Test fan out of subscribed channels to streams."""
+    async def test_streams_share_subscription(self):
+        pubsub = FakePubSub()
+        broker = EventBroker(pubsub)
+        first = stream_events(broker, 1)
+        second = stream_events(broker, 1)
+        self.assertEqual(await anext(first), 'retry: 5000\n\n')
+        await anext(second)
+
+        pubsub.publish(user_channel(1), event(type='task', id=5))
+        pubsub.publish(user_channel(2), event(type='task', id=6))
+
+        for stream in (first, second):
+            self.assertEqual(
+                await anext(stream),
+                'event: task\ndata: {"id": 5, "type": "task"}\n\n')
+        self.assertEqual(pubsub.channels, [user_channel(1)])
+        await first.aclose()
+        self.assertEqual(pubsub.channels, [user_channel(1)])
+        await second.aclose()
+        self.assertEqual(pubsub.channels, [])
+
+    @override_settings(EVENTS_KEEPALIVE=0.01)
+    async def test_keepalive_when_idle(self):
+        stream = stream_events(EventBroker(FakePubSub()), 1)
+        await anext(stream)
+
+        self.assertEqual(await anext(stream), ': keepalive\n\n')
+        await stream.aclose()
+
+    @override_settings(EVENTS_QUEUE_SIZE=2)
+    async def test_slow_client_told_to_resync(self):
+        broker = EventBroker(FakePubSub())
+        queue = await broker.subscribe(1)
+
+        broker.deliver([queue], {'type': 'task', 'id': 1})
+        broker.deliver([queue], {'type': 'task', 'id': 2})
+        broker.deliver([queue], {'type': 'task', 'id': 3})
+
+        self.assertEqual(queue.get_nowait(), RESYNC_EVENT)
+        self.assertTrue(queue.empty())
+        await broker.unsubscribe(1, queue)
+
+
+class EventStreamViewTests(TestCase):
+    """Test the event stream endpoint."""
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='testpass123')
+
+    def test_auth_required(self):
+        res = self.client.get(EVENTS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(EVENTS_REDIS_URL=None)
+    def test_unavailable_without_redis(self):
+        self.client.force_login(self.user)
+
+        res = self.client.get(EVENTS_URL)
+
+        self.assertEqual(
+            res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
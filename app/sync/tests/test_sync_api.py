@@ -0,0 +1,217 @@
+"""
+Tests for the sync API.
+"""
+
+import base64
+import time
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.services import prune_tombstones
+from task.models import Task
+from meeting.models import Meeting
+from sync.models import Tombstone
+
+
+CHANGES_URL = reverse('sync:changes')
+
+
+class PublicSyncAPITests(TestCase):
+    """Test unauthenticated API requests."""
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_auth_required(self):
+        res = self.client.get(CHANGES_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PrivateSyncAPITests(TransactionTestCase):
+    """Test authenticated API requests.
+
+    Changes are tracked by committing transaction, so every write here
+    has to commit.
+    """
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='testpass123'
+        )
+        self.other = get_user_model().objects.create_user(
+            email='other@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(self.user)
+        self.task = Task.objects.create(
+            user=self.user, description='Write report',
+            deadline=date(2026, 5, 1))
+        self.meeting = Meeting.objects.create(
+            user=self.user, title='Planning', date=timezone.now())
+        self.meeting.participants.add(self.user)
+        self.hidden = Meeting.objects.create(
+            user=self.other, title='Hidden', date=timezone.now())
+        self.hidden.participants.add(self.other)
+
+    def sync(self, token=None):
+        params = {'token': token} if token else {}
+        res = self.client.get(CHANGES_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.json()
+
+    def test_full_sync_without_token(self):
+        data = self.sync()
+
+        self.assertEqual(
+            [task['id'] for task in data['tasks']['updated']],
+            [self.task.id])
+        self.assertNotIn('sync_xid', data['tasks']['updated'][0])
+        self.assertEqual(
+            [meeting['id'] for meeting in data['meetings']['updated']],
+            [self.meeting.id])
+        self.assertTrue(data['token'])
+
+    @override_settings(SYNC_PAGE_SIZE=1)
+    def test_full_sync_in_pages(self):
+        second = Task.objects.create(
+            user=self.user, description='Second task',
+            deadline=date(2026, 5, 2))
+        first = self.sync()
+        second.status = 'done'
+        second.save()
+
+        res = self.client.get(CHANGES_URL, {'cursor': first['next']})
+        last = res.json()
+
+        self.assertEqual(
+            [task['id'] for task in first['tasks']['updated']],
+            [self.task.id])
+        self.assertEqual(
+            [meeting['id'] for meeting in first['meetings']['updated']],
+            [self.meeting.id])
+        self.assertEqual(
+            [task['id'] for task in last['tasks']['updated']], [second.id])
+        self.assertEqual(last['meetings']['updated'], [])
+        self.assertIsNone(last['next'])
+        self.assertEqual(last['token'], first['token'])
+        # Changes made while paging come again with the token.
+        self.assertEqual(
+            [task['id'] for task in
+             self.sync(last['token'])['tasks']['updated']],
+            [second.id])
+
+    def test_no_changes_since_token(self):
+        token = self.sync()['token']
+
+        data = self.sync(token)
+
+        self.assertEqual(data['tasks'], {'updated': [], 'deleted': []})
+        self.assertEqual(data['meetings'], {'updated': [], 'deleted': []})
+
+    def test_changed_rows_since_token(self):
+        token = self.sync()['token']
+        self.task.status = 'done'
+        self.task.save()
+        created = Task.objects.create(
+            user=self.user, description='New task',
+            deadline=date(2026, 5, 2))
+        Task.objects.filter(pk=created.pk).update(description='Renamed')
+
+        data = self.sync(token)
+
+        self.assertEqual(
+            [(task['id'], task['status'], task['description'])
+             for task in data['tasks']['updated']],
+            [(self.task.id, 'done', 'Write report'),
+             (created.id, 'opened', 'Renamed')])
+        self.assertEqual(data['meetings']['updated'], [])
+        self.assertEqual(self.sync(data['token'])['tasks']['updated'], [])
+
+    def test_deleted_rows_since_token(self):
+        token = self.sync()['token']
+        task_id, meeting_id = self.task.id, self.meeting.id
+        hidden_id = self.hidden.id
+        self.task.delete()
+        self.meeting.delete()
+        self.hidden.delete()
+
+        data = self.sync(token)
+
+        self.assertEqual(data['tasks'], {'updated': [], 'deleted': [task_id]})
+        # Meetings of other users are not told about.
+        self.assertEqual(data['meetings']['deleted'], [meeting_id])
+        self.assertTrue(Tombstone.objects.filter(
+            object_id=hidden_id, user=self.other).exists())
+
+    def test_removed_participant_gets_tombstone(self):
+        token = self.sync()['token']
+        self.meeting.participants.remove(self.user)
+        self.hidden.participants.add(self.user)
+
+        data = self.sync(token)
+
+        self.assertEqual(
+            [meeting['id'] for meeting in data['meetings']['updated']],
+            [self.hidden.id])
+        self.assertEqual(data['meetings']['deleted'], [self.meeting.id])
+
+    def test_participant_added_back_is_not_deleted(self):
+        token = self.sync()['token']
+        self.user.meetings.clear()
+        self.meeting.participants.add(self.user)
+
+        data = self.sync(token)
+
+        self.assertEqual(
+            [meeting['id'] for meeting in data['meetings']['updated']],
+            [self.meeting.id])
+        self.assertEqual(data['meetings']['deleted'], [])
+
+    def test_expired_token_needs_full_sync(self):
+        token = self.sync()['token']
+
+        with override_settings(SYNC_TOMBSTONE_RETENTION_DAYS=0), \
+                patch('sync.views.time.time', return_value=time.time() + 1):
+            res = self.client.get(CHANGES_URL, {'token': token})
+
+        self.assertEqual(res.status_code, status.HTTP_410_GONE)
+        self.assertEqual(res.json()['detail'],
+                         'Sync token expired, sync again without a token.')
+
+    def test_token_without_time_expired(self):
+        snapshot = base64.urlsafe_b64decode(
+            self.sync()['token']).decode().partition('@')[0]
+        token = base64.urlsafe_b64encode(snapshot.encode()).decode()
+
+        res = self.client.get(CHANGES_URL, {'token': token})
+
+        self.assertEqual(res.status_code, status.HTTP_410_GONE)
+
+    def test_prune_old_tombstones(self):
+        self.task.delete()
+        Tombstone.objects.update(
+            created_at=timezone.now() - timedelta(days=31))
+        self.meeting.delete()
+
+        self.assertEqual(prune_tombstones(), 1)
+        self.assertEqual(
+            list(Tombstone.objects.values_list('model', flat=True)),
+            ['meeting'])
+
+    def test_invalid_token(self):
+        res = self.client.get(CHANGES_URL, {'token': 'not-a-token'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_cursor(self):
+        res = self.client.get(CHANGES_URL, {'cursor': 'not-a-cursor'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,13 @@
+"""
+URL mapping for the sync API.
+"""
+from django.urls import path
+from sync.views import ChangesAPIView, event_stream
+
+
+app_name = 'sync'
+
+urlpatterns = [
+    path('changes/', ChangesAPIView.as_view(), name='changes'),
+    path('events/', event_stream, name='events'),
+]
@@ -0,0 +1,186 @@
+"""
+Views for the delta sync API.
+"""
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection
+from django.db.models import (
+    BigIntegerField, BooleanField, CharField, Func, Q, Value
+)
+from django.http import HttpResponse, StreamingHttpResponse
+from drf_spectacular.utils import extend_schema
+from rest_framework import generics, permissions, status
+from rest_framework.exceptions import APIException, AuthenticationFailed
+from rest_framework.response import Response
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from core.values import build_rows, compile_row_converters
+from meeting.models import Meeting
+from meeting.serializers import MeetingSerializer
+from sync.events import get_broker, stream_events
+from sync.models import Tombstone
+from sync.serializers import (
+    ChangesQuerySerializer, ChangesSerializer, encode_cursor, encode_token
+)
+from task.models import Task
+from task.serializers import TaskSerializer
+
+
+class Xid8(Func):
+    """Transaction id stored as bigint, cast to xid8."""
+    template = '%(expressions)s::text::xid8'
+    output_field = BigIntegerField()
+
+
+class Snapshot(Func):
+    """Text of pg_current_snapshot(), cast back to pg_snapshot."""
+    template = '%(expressions)s::pg_snapshot'
+    output_field = CharField()
+
+
+class VisibleInSnapshot(Func):
+    """Whether the transaction that wrote xid is seen by snapshot."""
+    function = 'pg_visible_in_snapshot'
+    output_field = BooleanField()
+
+    def __init__(self, xid, snapshot, **extra):
+        super().__init__(Xid8(xid), Snapshot(snapshot), **extra)
+
+
+def changed_since(queryset, snapshot):
+    """Return rows written by transactions the snapshot did not see.
+
+    Every transaction below the snapshot xmin had finished when it was
+    taken, so the range condition is an index probe and the visibility
+    check only runs on the few rows written after it.
+    """
+    if snapshot is None:
+        return queryset
+    xmin = int(snapshot.split(':')[0])
+    return queryset.filter(sync_xid__gte=xmin).alias(
+        seen=VisibleInSnapshot('sync_xid', Value(snapshot))).filter(seen=False)
+
+
+class TokenExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = 'Sync token expired, sync again without a token.'
+    default_code = 'token_expired'
+
+
+def tombstone_retention():
+    """Return seconds tombstones are kept for."""
+    return settings.SYNC_TOMBSTONE_RETENTION_DAYS * 86400
+
+
+class ChangesAPIView(generics.GenericAPIView):
+    """Return tasks and meetings changed since a sync token.
+
+    A full sync is sent in pages of SYNC_PAGE_SIZE rows per kind, all
+    read after the snapshot of the first page. Rows changed while paging
+    are sent again by the next sync with its token. Tokens older than
+    the tombstone retention answer 410, deletes may have been pruned.
+    """
+    serializer_class = ChangesSerializer
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_current_snapshot(self):
+        """Return snapshot of transactions committed so far and its time."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT pg_current_snapshot()::text, '
+                'extract(epoch FROM now())::bigint')
+            return cursor.fetchone()
+
+    def get_rows(self, serializer_class, queryset, limit=None):
+        """Return representations, from values() rows where possible."""
+        serializer = serializer_class(many=True)
+        converters = compile_row_converters(serializer.child, queryset.model)
+        if converters is None:
+            queryset = serializer_class.optimize_queryset(queryset)
+            return serializer_class(queryset[:limit], many=True).data
+        lookups = {lookup for lookup, _, _ in converters}
+        return build_rows(queryset.values(*lookups)[:limit], converters)
+
+    def get_deleted(self, model, snapshot, updated):
+        """Return ids of rows deleted or hidden since snapshot."""
+        rows = changed_since(Tombstone.objects.filter(
+            Q(user=None) | Q(user=self.request.user), model=model), snapshot)
+        visible = {row['id'] for row in updated}
+        return sorted(set(rows.values_list('object_id', flat=True)) - visible)
+
+    @extend_schema(parameters=[ChangesQuerySerializer])
+    def get(self, request):
+        params = ChangesQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        snapshot, taken_at = params.validated_data.get('token', (None, None))
+        if snapshot and taken_at < time.time() - tombstone_retention():
+            raise TokenExpired()
+        if 'cursor' in params.validated_data:
+            current, current_at, after = params.validated_data['cursor']
+        else:
+            # Taken before reading rows, so a write committing meanwhile
+            # is sent again on the next sync instead of being missed.
+            current, current_at = self.get_current_snapshot()
+            after = None if snapshot else {'tasks': 0, 'meetings': 0}
+
+        page_size = settings.SYNC_PAGE_SIZE
+        changes = {'token': encode_token(current, current_at), 'next': None}
+        following = {}
+        for name, model, serializer_class, queryset in (
+            ('tasks', 'task', TaskSerializer, Task.objects.all()),
+            ('meetings', 'meeting', MeetingSerializer,
+             Meeting.objects.filter(id__in=request.user.meetings.values(
+                 'id'))),
+        ):
+            if after is None:
+                updated = self.get_rows(
+                    serializer_class,
+                    changed_since(queryset, snapshot).order_by('id'))
+                changes[name] = {
+                    'updated': updated,
+                    'deleted': self.get_deleted(model, snapshot, updated),
+                }
+                continue
+            updated = [] if after.get(name) is None else self.get_rows(
+                serializer_class,
+                queryset.filter(id__gt=after[name]).order_by('id'),
+                page_size + 1)
+            following[name] = None
+            if len(updated) > page_size:
+                updated = updated[:page_size]
+                following[name] = updated[-1]['id']
+            changes[name] = {'updated': updated, 'deleted': []}
+        if any(following.values()):
+            changes['next'] = encode_cursor(current, current_at, following)
+        return Response(changes)
+
+
+def get_stream_user(request):
+    """Return user authenticated by JWT or session, else None."""
+    try:
+        authenticated = JWTAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return None
+    if authenticated is not None:
+        return authenticated[0]
+    return request.user if request.user.is_authenticated else None
+
+
+async def event_stream(request):
+    """Stream task, comment and meeting events of the user as SSE."""
+    if request.method != 'GET':
+        return HttpResponse(status=405, headers={'Allow': 'GET'})
+    user = await sync_to_async(get_stream_user)(request)
+    if user is None:
+        return HttpResponse(status=401)
+    if not settings.EVENTS_REDIS_URL:
+        return HttpResponse(status=503)
+    response = StreamingHttpResponse(
+        stream_events(get_broker(), user.pk),
+        content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
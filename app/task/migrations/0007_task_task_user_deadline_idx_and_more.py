@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-17 22:54
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('task', '0006_alter_comment_text'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['user', 'deadline'], name='task_user_deadline_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['assign_to', 'deadline'], name='task_assign_deadline_idx'),
+        ),
+    ]
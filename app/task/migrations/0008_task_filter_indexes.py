@@ -0,0 +1,36 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:02
+
+# Index audit for task list filters:
+#   user [+ deadline range]       -> task_user_deadline_idx
+#   assign_to / unassigned
+#     [+ deadline range]          -> task_assign_deadline_idx
+#   status [+ deadline range]     -> task_status_deadline_idx
+#   deadline range                -> task_deadline_idx
+#   overdue                       -> task_overdue_idx (partial, not done)
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('task', '0007_task_task_user_deadline_idx_and_more'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['status', 'deadline'], name='task_status_deadline_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['deadline'], name='task_deadline_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(condition=models.Q(('status', 'done'), _negated=True), fields=['deadline'], name='task_overdue_idx'),
+        ),
+    ]
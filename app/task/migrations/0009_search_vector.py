@@ -0,0 +1,57 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:04
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('task', '0008_task_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunSQL(
+            sql='''
+            CREATE TRIGGER task_search_vector_update
+            BEFORE INSERT OR UPDATE ON task_task
+            FOR EACH ROW EXECUTE FUNCTION tsvector_update_trigger(
+                search_vector, 'pg_catalog.english', description);
+            CREATE TRIGGER comment_search_vector_update
+            BEFORE INSERT OR UPDATE ON task_comment
+            FOR EACH ROW EXECUTE FUNCTION tsvector_update_trigger(
+                search_vector, 'pg_catalog.english', text);
+            UPDATE task_task SET search_vector =
+                to_tsvector('pg_catalog.english', description);
+            UPDATE task_comment SET search_vector =
+                to_tsvector('pg_catalog.english', text);
+            ''',
+            reverse_sql='''
+            DROP TRIGGER IF EXISTS task_search_vector_update ON task_task;
+            DROP TRIGGER IF EXISTS comment_search_vector_update
+                ON task_comment;
+            ''',
+        ),
+        AddIndexConcurrently(
+            model_name='comment',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='comment_search_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='task',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='task_search_idx'),
+        ),
+    ]
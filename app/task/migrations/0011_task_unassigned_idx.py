@@ -0,0 +1,20 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:40
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('task', '0010_updated_at'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(condition=models.Q(('assign_to', None)), fields=['user', 'deadline', 'id'], name='task_unassigned_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:47
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('task', '0011_task_unassigned_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(blank=True, choices=[('opened', 'opened'), ('in_progress', 'in progress'), ('done', 'done')], max_length=15)),
+                ('to_status', models.CharField(choices=[('opened', 'opened'), ('in_progress', 'in progress'), ('done', 'done')], max_length=15)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('actor', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('assign_to', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('task', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='events', to='task.task')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['task', 'created_at'], name='taskevent_task_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:52
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('sync', '0001_initial'),
+        ('task', '0012_taskevent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='sync_xid',
+            field=models.BigIntegerField(editable=False, null=True),
+        ),
+        migrations.RunSQL(
+            sql='''
+            CREATE TRIGGER task_sync_xid_update
+            BEFORE INSERT OR UPDATE ON task_task
+            FOR EACH ROW EXECUTE FUNCTION sync_set_xid();
+            CREATE TRIGGER task_tombstone
+            AFTER DELETE ON task_task
+            FOR EACH ROW EXECUTE FUNCTION sync_record_tombstone('task');
+            UPDATE task_task SET sync_xid = pg_current_xact_id()::text::bigint;
+            ''',
+            reverse_sql='''
+            DROP TRIGGER IF EXISTS task_sync_xid_update ON task_task;
+            DROP TRIGGER IF EXISTS task_tombstone ON task_task;
+            ''',
+        ),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['sync_xid'], name='task_sync_idx'),
+        ),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 4.2.30 on 2026-10-18 00:11
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('task', '0013_sync_xid'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='last_activity_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+        migrations.RunSQL(
+            sql='''
+            UPDATE task_task task SET
+                comment_count = coalesce(comments.count, 0),
+                last_activity_at = greatest(task.updated_at, comments.last)
+            FROM task_task source LEFT JOIN (
+                SELECT task_id, count(*) AS count, max(updated_at) AS last
+                FROM task_comment GROUP BY task_id
+            ) comments ON comments.task_id = source.id
+            WHERE source.id = task.id;
+            CREATE FUNCTION task_keep_activity() RETURNS trigger AS $$
+            BEGIN
+                -- Counters change only through the comment trigger below,
+                -- a save with stale values keeps the stored ones.
+                IF pg_trigger_depth() = 1 THEN
+                    NEW.comment_count := OLD.comment_count;
+                    NEW.last_activity_at := greatest(
+                        OLD.last_activity_at, NEW.updated_at);
+                END IF;
+                RETURN NEW;
+            END $$ LANGUAGE plpgsql;
+            CREATE TRIGGER task_keep_activity
+            BEFORE UPDATE ON task_task
+            FOR EACH ROW EXECUTE FUNCTION task_keep_activity();
+            CREATE FUNCTION comment_task_activity() RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP = 'DELETE' THEN
+                    UPDATE task_task SET
+                        comment_count = greatest(comment_count - 1, 0),
+                        updated_at = now()
+                    WHERE id = OLD.task_id;
+                    RETURN OLD;
+                END IF;
+                UPDATE task_task SET
+                    comment_count = comment_count + (TG_OP = 'INSERT')::int,
+                    last_activity_at = greatest(last_activity_at, now()),
+                    updated_at = now()
+                WHERE id = NEW.task_id;
+                RETURN NEW;
+            END $$ LANGUAGE plpgsql;
+            CREATE TRIGGER comment_task_activity
+            AFTER INSERT OR UPDATE OR DELETE ON task_comment
+            FOR EACH ROW EXECUTE FUNCTION comment_task_activity();
+            ''',
+            reverse_sql='''
+            DROP TRIGGER IF EXISTS comment_task_activity ON task_comment;
+            DROP TRIGGER IF EXISTS task_keep_activity ON task_task;
+            DROP FUNCTION IF EXISTS comment_task_activity();
+            DROP FUNCTION IF EXISTS task_keep_activity();
+            ''',
+        ),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['-last_activity_at', '-id'], name='task_activity_idx'),
+        ),
+    ]
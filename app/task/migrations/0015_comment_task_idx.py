@@ -0,0 +1,20 @@
+# Generated by Django 4.2.30 on 2026-10-18 00:19
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('task', '0014_activity'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='comment',
+            index=models.Index(fields=['task', '-id'], name='comment_task_idx'),
+        ),
+    ]
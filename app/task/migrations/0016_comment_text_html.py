@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-18 00:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task', '0015_comment_task_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='text_html',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunSQL(
+            sql='''
+            -- Rendering stored HTML is no activity on the task.
+            DROP TRIGGER comment_task_activity ON task_comment;
+            CREATE TRIGGER comment_task_activity
+            AFTER INSERT OR DELETE OR UPDATE OF text, task_id
+            ON task_comment
+            FOR EACH ROW EXECUTE FUNCTION comment_task_activity();
+            ''',
+            reverse_sql='''
+            DROP TRIGGER comment_task_activity ON task_comment;
+            CREATE TRIGGER comment_task_activity
+            AFTER INSERT OR UPDATE OR DELETE ON task_comment
+            FOR EACH ROW EXECUTE FUNCTION comment_task_activity();
+            ''',
+        ),
+    ]
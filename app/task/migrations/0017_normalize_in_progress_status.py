@@ -0,0 +1,36 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:10
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task', '0016_comment_text_html'),
+        ('user', '0007_userstats'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql='''
+            -- claim_task used to write 'in progress' instead of the
+            -- choice value, those tasks were left out of stats counters.
+            UPDATE task_task SET status = 'in_progress', updated_at = now()
+            WHERE status = 'in progress';
+            UPDATE task_taskevent SET from_status = 'in_progress'
+            WHERE from_status = 'in progress';
+            UPDATE task_taskevent SET to_status = 'in_progress'
+            WHERE to_status = 'in progress';
+            UPDATE user_userstats stats
+            SET in_progress_tasks = tasks.count
+            FROM (
+                SELECT assign_to_id, count(*) FROM task_task
+                WHERE status = 'in_progress' AND assign_to_id IS NOT NULL
+                GROUP BY assign_to_id
+            ) tasks
+            WHERE stats.user_id = tasks.assign_to_id
+                AND stats.in_progress_tasks <> tasks.count;
+            ''',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
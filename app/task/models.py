@@ -4,6 +4,9 @@ Database Task model.
 
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 
 
 class Task(models.Model):
@@ -28,6 +31,38 @@ class Task(models.Model):
         blank=True,
         related_name='tasks'
         )
+    updated_at = models.DateTimeField(auto_now=True)
+    # Kept by database triggers on comments, saving a task never
+    # overwrites them.
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    last_activity_at = models.DateTimeField(
+        default=timezone.now, editable=False)
+    search_vector = SearchVectorField(null=True, editable=False)
+    sync_xid = models.BigIntegerField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['user', 'deadline'], name='task_user_deadline_idx'),
+            models.Index(
+                fields=['assign_to', 'deadline'],
+                name='task_assign_deadline_idx'),
+            models.Index(
+                fields=['status', 'deadline'],
+                name='task_status_deadline_idx'),
+            models.Index(fields=['deadline'], name='task_deadline_idx'),
+            models.Index(
+                fields=['deadline'], name='task_overdue_idx',
+                condition=~models.Q(status='done')),
+            models.Index(
+                fields=['user', 'deadline', 'id'], name='task_unassigned_idx',
+                condition=models.Q(assign_to=None)),
+            GinIndex(fields=['search_vector'], name='task_search_idx'),
+            models.Index(fields=['sync_xid'], name='task_sync_idx'),
+            models.Index(
+                fields=['-last_activity_at', '-id'],
+                name='task_activity_idx'),
+        ]
 
     def __str__(self):
         return self.description
@@ -41,11 +76,51 @@ class Comment(models.Model):
         related_name='comments'
     )
     text = models.TextField()
+    text_html = models.TextField(blank=True, default='', editable=False)
     date = models.DateField(auto_now=True)
     task = models.ForeignKey(
         Task, on_delete=models.CASCADE,
         related_name='comments'
     )
+    updated_at = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='comment_search_idx'),
+            models.Index(fields=['task', '-id'], name='comment_task_idx'),
+        ]
 
     def __str__(self):
         return self.text
+
+
+class TaskEvent(models.Model):
+    """Append-only record of a task status or assignee change."""
+    task = models.ForeignKey(
+        Task, on_delete=models.CASCADE,
+        related_name='events', db_index=False
+    )
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True, related_name='+'
+    )
+    from_status = models.CharField(
+        max_length=15, choices=Task.task_status, blank=True)
+    to_status = models.CharField(max_length=15, choices=Task.task_status)
+    assign_to = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True, related_name='+'
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['task', 'created_at'], name='taskevent_task_idx'),
+        ]
+
+    def __str__(self):
+        return f'task {self.task_id}: {self.from_status} -> {self.to_status}'
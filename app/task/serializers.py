@@ -2,30 +2,185 @@
 Serializers for the task API View.
 """
 
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils import timezone
 from rest_framework import serializers
+from core.fieldsets import ExpandableFieldsMixin
+from core.html import sanitize_html
 from task.models import Task, Comment
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     """Serializer for the comment object."""
     class Meta:
         model = Comment
-        fields = '__all__'
+        exclude = ['search_vector']
         read_only_fields = ['id']
 
+    def validate(self, attrs):
+        if 'text' in attrs:
+            attrs['text_html'] = sanitize_html(attrs['text'])
+        return attrs
 
-class TaskSerializer(serializers.ModelSerializer):
+
+class TaskSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     """Serializer for the tasks."""
 
     class Meta:
         model = Task
-        fields = '__all__'
+        exclude = ['search_vector', 'sync_xid']
         read_only_fields = ['id']
 
 
 class TaskDetailSerializer(TaskSerializer):
-    """Serializer for task detail."""
-    comments = CommentSerializer(many=True, required=False)
+    """Serializer for task detail with its latest comments.
+
+    `comment_count` is the total, older comments are paged through the
+    comments action of the task.
+    """
+    expandable_fields = {'comments': CommentSerializer}
+    related_limits = {'comments': 'TASK_COMMENTS_PAGE_SIZE'}
 
     class Meta(TaskSerializer.Meta):
-        fields = TaskSerializer.Meta.fields
+        exclude = TaskSerializer.Meta.exclude
+
+
+class TaskFilterSerializer(serializers.Serializer):
+    """Serializer for validating task list query parameters."""
+    status = serializers.ChoiceField(
+        choices=Task.task_status, required=False)
+    assign_to = serializers.IntegerField(min_value=1, required=False)
+    user = serializers.IntegerField(min_value=1, required=False)
+    deadline_before = serializers.DateField(required=False)
+    deadline_after = serializers.DateField(required=False)
+    unassigned = serializers.BooleanField(
+        required=False, default=False,
+        help_text='Only tasks nobody has taken yet.')
+    overdue = serializers.BooleanField(
+        required=False, default=False,
+        help_text='Only not done tasks with a past deadline.')
+    ordering = serializers.ChoiceField(
+        choices=['-id', '-last_activity_at'], required=False, default='-id',
+        help_text='Newest tasks or most recently active first.')
+
+    def validate(self, attrs):
+        if attrs.get('unassigned') and attrs.get('assign_to'):
+            raise serializers.ValidationError(
+                'assign_to cannot be combined with unassigned.')
+        before = attrs.get('deadline_before')
+        after = attrs.get('deadline_after')
+        if before and after and after > before:
+            raise serializers.ValidationError(
+                'deadline_after must not be later than deadline_before.')
+        return attrs
+
+
+class TaskBoardQuerySerializer(serializers.Serializer):
+    """Serializer for validating board query parameters."""
+    team = serializers.IntegerField(
+        min_value=1, required=False,
+        help_text='Tasks of team members and of the team manager.')
+    manager = serializers.IntegerField(
+        min_value=1, required=False, help_text='Tasks created by manager.')
+    limit = serializers.IntegerField(
+        min_value=1, max_value=100, required=False,
+        default=settings.TASK_BOARD_COLUMN_LIMIT,
+        help_text='Tasks shown per status column.')
+
+    def validate(self, attrs):
+        if attrs.get('team') and attrs.get('manager'):
+            raise serializers.ValidationError(
+                'team cannot be combined with manager.')
+        return attrs
+
+
+class TaskBoardColumnSerializer(serializers.Serializer):
+    """Serializer for a status column of the task board."""
+    status = serializers.ChoiceField(choices=Task.task_status)
+    total = serializers.IntegerField()
+    tasks = TaskSerializer(many=True)
+
+
+class BulkTaskListSerializer(serializers.ListSerializer):
+    """List serializer saving tasks with one query per batch."""
+    batch_size = 1000
+
+    def to_internal_value(self, data):
+        """Validate items and resolve all assignees in one query."""
+        items = super().to_internal_value(data)
+        ids = {item['assign_to_id'] for item in items
+               if item.get('assign_to_id')}
+        found = set(get_user_model().objects.filter(
+            id__in=ids).values_list('id', flat=True))
+        errors = [
+            {'assign_to': [f'Invalid pk "{item["assign_to_id"]}" - '
+                           'object does not exist.']}
+            if item.get('assign_to_id') and item['assign_to_id'] not in found
+            else {}
+            for item in items
+        ]
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return items
+
+    def create(self, validated_data):
+        tasks = [Task(**item) for item in validated_data]
+        return Task.objects.bulk_create(tasks, batch_size=self.batch_size)
+
+    def update(self, queryset, validated_data):
+        tasks = queryset.in_bulk(
+            [item['id'] for item in validated_data if 'id' in item])
+        errors = [
+            {} if item.get('id') in tasks else {'id': ['Task not found.']}
+            for item in validated_data
+        ]
+        if any(errors):
+            raise serializers.ValidationError(errors)
+
+        fields = {'updated_at'}
+        now = timezone.now()
+        for item in validated_data:
+            task = tasks[item['id']]
+            task.updated_at = now
+            for attr, value in item.items():
+                if attr != 'id':
+                    setattr(task, attr, value)
+                    fields.add(attr)
+        Task.objects.bulk_update(
+            tasks.values(), fields, batch_size=self.batch_size)
+        return [tasks[item['id']] for item in validated_data]
+
+
+class TaskBulkCreateSerializer(serializers.ModelSerializer):
+    """Serializer for an item of bulk task creation."""
+    assign_to = serializers.IntegerField(
+        source='assign_to_id', required=False, allow_null=True)
+
+    class Meta:
+        model = Task
+        fields = ['id', 'description', 'status', 'deadline', 'assign_to']
+        read_only_fields = ['id']
+        list_serializer_class = BulkTaskListSerializer
+
+
+class TaskBulkUpdateSerializer(TaskBulkCreateSerializer):
+    """Serializer for an item of bulk task update."""
+    id = serializers.IntegerField()
+
+
+class TaskBulkAssignSerializer(serializers.Serializer):
+    """Serializer for assigning many tasks to a user."""
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False,
+        max_length=settings.TASK_BULK_MAX_SIZE)
+    assign_to = serializers.PrimaryKeyRelatedField(
+        queryset=get_user_model().objects.all(), allow_null=True)
+
+
+class TaskBulkStatusSerializer(serializers.Serializer):
+    """Serializer for changing status of many tasks."""
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False,
+        max_length=settings.TASK_BULK_MAX_SIZE)
+    status = serializers.ChoiceField(choices=Task.task_status)
@@ -2,7 +2,7 @@
 Tests for the comments API.
 """
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 
@@ -22,6 +22,11 @@ def detail_url(comment_id):
     return url
 
 
+def task_comments_url(task_id):
+    """Create and return url of comments of a task."""
+    return reverse('task:task-comments', args=[task_id])
+
+
 def create_comment(user, task, **params):
     """Create and return a comment sample."""
     defaults = {
@@ -64,7 +69,7 @@ class PrivateCommentsAPITests(TestCase):
         serializer = CommentSerializer(comments, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_update_comment(self):
         """Test updating a task."""
@@ -107,3 +112,58 @@ class PrivateCommentsAPITests(TestCase):
         self.assertTrue(Comment.objects.filter(id=comment.id).exists())
         res2 = self.client.patch(detail_url(comment.id), {'text': ''})
         self.assertEqual(res2.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_task_comments_paged_newest_first(self):
+        """Test comments of a task are paged by id descending."""
+        task = create_task()
+        first, second, third = (
+            create_comment(self.user, task, text=str(i)) for i in range(3))
+        create_comment(self.user, create_task())
+
+        res = self.client.get(task_comments_url(task.id), {'page_size': 2})
+        older = self.client.get(res.data['next'])
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data['results'],
+            CommentSerializer([third, second], many=True).data)
+        self.assertEqual(
+            [comment['id'] for comment in older.data['results']],
+            [first.id])
+        self.assertIsNone(older.data['next'])
+
+    def test_task_comments_of_missing_task(self):
+        """Test comments of a missing task are not found."""
+        res = self.client.get(task_comments_url(create_task().id + 1))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(TASK_COMMENTS_PAGE_SIZE=2)
+    def test_task_detail_inlines_latest_comments(self):
+        """Test task detail renders latest comments and their total."""
+        task = create_task()
+        comments = [create_comment(self.user, task) for _ in range(3)]
+        url = reverse('task:task-detail', args=[task.id])
+
+        res = self.client.get(url, {'expand': 'comments'})
+        updated = self.client.patch(url, {'description': 'Changed'})
+
+        self.assertEqual(
+            [comment['id'] for comment in res.data['comments']],
+            [comments[2].id, comments[1].id])
+        self.assertEqual(res.data['comment_count'], 3)
+        self.assertEqual(updated.data['comments'],
+                         [comments[2].id, comments[1].id])
+
+    def test_update_comment_stores_sanitized_html(self):
+        """Test comment text is rendered to safe HTML on write."""
+        comment = create_comment(self.user, create_task())
+
+        res = self.client.patch(
+            detail_url(comment.id),
+            {'text': '<em>Soon</em><script>alert(1)</script>'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['text_html'], '<em>Soon</em>')
+        comment.refresh_from_db()
+        self.assertEqual(comment.text_html, '<em>Soon</em>')
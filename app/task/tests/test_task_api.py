@@ -6,16 +6,24 @@ from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 
-from task.models import Task, Comment
+from task.models import Task, Comment, TaskEvent
 from task.serializers import TaskSerializer, TaskDetailSerializer
+from team.models import Team
 
 from rest_framework import status
 from rest_framework.test import APIClient
+from rest_framework.renderers import JSONRenderer
+from unittest.mock import patch
 from datetime import datetime
+import pytz
+import csv
+import json
 
 
 TASK_URL = reverse('task:task-list')
 CREATE_TASK_URL = reverse('task:create')
+BULK_TASK_URL = reverse('task:bulk')
+BOARD_URL = reverse('task:task-board')
 
 
 def detail_url(task_id):
@@ -110,7 +118,7 @@ class PrivateUserTaskAPITests(TestCase):
         serializer = TaskSerializer(tasks, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(serializer.data, res.data)
+        self.assertEqual(serializer.data, res.data['results'])
 
     def test_get_task_detail(self):
         """test get recipe detail."""
@@ -173,8 +181,583 @@ class PrivateUserTaskAPITests(TestCase):
             user=self.user, task=task1, text='Comment for task1')
         Comment.objects.create(
             user=self.user, task=task2, text='Comment for task2')
-        res = self.client.get(detail_url(task1.id))
+        res = self.client.get(detail_url(task1.id), {'expand': 'comments'})
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(len(res.data['comments']), 1)
         self.assertEqual(res.data['comments'][0]['id'], comment1.id)
         self.assertEqual(res.data['comments'][0]['text'], 'Comment for task1')
+
+    def test_task_list_built_from_values(self):
+        """Test list matches serializer without loading model instances."""
+        create_task(status='done', assign_to=self.user)
+        create_task(deadline='2025-07-01')
+
+        with patch.object(Task, 'from_db') as mock_from_db:
+            res = self.client.get(TASK_URL)
+
+        mock_from_db.assert_not_called()
+        serializer = TaskSerializer(
+            Task.objects.order_by('-id'), many=True)
+        self.assertEqual(
+            JSONRenderer().render(res.data['results']),
+            JSONRenderer().render(serializer.data))
+
+    def test_order_tasks_by_last_activity(self):
+        """Test tasks with recent comments come first."""
+        quiet, busy, old = (
+            create_task(last_activity_at=datetime(*day, tzinfo=pytz.UTC))
+            for day in ((2025, 1, 1), (2025, 1, 2), (2024, 1, 1)))
+        Comment.objects.create(user=self.user, task=quiet, text='Ping')
+
+        res = self.client.get(TASK_URL, {'ordering': '-last_activity_at'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([task['id'] for task in res.data['results']],
+                         [quiet.id, busy.id, old.id])
+        self.assertEqual(res.data['results'][0]['comment_count'], 1)
+        self.assertEqual(res.data['results'][1]['comment_count'], 0)
+
+    def test_ordered_tasks_next_page(self):
+        """Test cursor of an ordered list continues in that order."""
+        early, late = (
+            create_task(last_activity_at=datetime(*day, tzinfo=pytz.UTC))
+            for day in ((2025, 1, 1), (2025, 1, 2)))
+
+        first = self.client.get(
+            TASK_URL, {'ordering': '-last_activity_at', 'page_size': 1})
+        second = self.client.get(first.data['next'])
+
+        self.assertEqual(
+            [task['id'] for task in first.data['results']
+             + second.data['results']], [late.id, early.id])
+
+    def test_ordered_tasks_pages_within_one_millisecond(self):
+        """Test descending cursor does not skip rows in one millisecond."""
+        tasks = [
+            create_task(last_activity_at=datetime(
+                2025, 1, 1, 0, 0, 0, microsecond, tzinfo=pytz.UTC))
+            for microsecond in (500100, 500200, 500300)]
+
+        seen, url = [], TASK_URL
+        params = {'ordering': '-last_activity_at', 'page_size': 1}
+        while url and len(seen) <= len(tasks):
+            res = self.client.get(url, params)
+            seen += [task['id'] for task in res.data['results']]
+            url, params = res.data['next'], None
+
+        self.assertEqual(seen, [task.id for task in reversed(tasks)])
+
+    def test_task_detail_comment_ids_by_default(self):
+        """Test comments are rendered as ids unless expanded."""
+        task = create_task()
+        comment = Comment.objects.create(
+            user=self.user, task=task, text='Comment')
+
+        res = self.client.get(detail_url(task.id))
+
+        self.assertEqual(res.data['comments'], [comment.id])
+
+    def test_task_list_sparse_fields(self):
+        """Test list renders only requested fields."""
+        task = create_task()
+
+        res = self.client.get(TASK_URL, {'fields': 'id,status'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data['results'], [{'id': task.id, 'status': 'opened'}])
+
+    def test_task_list_unknown_field(self):
+        """Test unknown field name is rejected."""
+        create_task()
+
+        res = self.client.get(TASK_URL, {'fields': 'id,secret'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_tasks_keyset_pagination(self):
+        """Test walking task pages forward and back with cursors."""
+        tasks = [create_task() for _ in range(5)]
+        ids = [task.id for task in reversed(tasks)]
+
+        res1 = self.client.get(TASK_URL, {'page_size': 2})
+        self.assertEqual([t['id'] for t in res1.data['results']], ids[:2])
+        self.assertIsNone(res1.data['previous'])
+
+        res2 = self.client.get(res1.data['next'])
+        self.assertEqual([t['id'] for t in res2.data['results']], ids[2:4])
+
+        res3 = self.client.get(res2.data['next'])
+        self.assertEqual([t['id'] for t in res3.data['results']], ids[4:])
+        self.assertIsNone(res3.data['next'])
+
+        res4 = self.client.get(res3.data['previous'])
+        self.assertEqual([t['id'] for t in res4.data['results']], ids[2:4])
+
+    def test_tasks_page_size_capped(self):
+        """Test requested page size is limited by maximum."""
+        create_task()
+        create_task()
+        with self.settings(API_MAX_PAGE_SIZE=1):
+            res = self.client.get(TASK_URL, {'page_size': 1000})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 1)
+
+    def test_tasks_invalid_cursor(self):
+        """Test malformed cursor is rejected."""
+        res = self.client.get(TASK_URL, {'cursor': 'not-a-cursor'})
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_filter_tasks_by_status_and_assignee(self):
+        """Test filtering tasks by status and assignee."""
+        task = create_task(status='in_progress', assign_to=self.user)
+        create_task(status='in_progress')
+        create_task(status='done', assign_to=self.user)
+
+        res = self.client.get(
+            TASK_URL, {'status': 'in_progress', 'assign_to': self.user.id})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([t['id'] for t in res.data['results']], [task.id])
+
+    def test_filter_tasks_by_creator_and_deadline(self):
+        """Test filtering tasks by creator and deadline range."""
+        task = create_task(user=self.user, deadline='2025-06-10')
+        create_task(user=self.user, deadline='2025-07-10')
+        create_task(deadline='2025-06-10')
+
+        res = self.client.get(TASK_URL, {
+            'user': self.user.id,
+            'deadline_after': '2025-06-01',
+            'deadline_before': '2025-06-30',
+        })
+
+        self.assertEqual([t['id'] for t in res.data['results']], [task.id])
+
+    def test_filter_unassigned_and_overdue_tasks(self):
+        """Test filtering unassigned and overdue tasks."""
+        overdue = create_task(deadline='2020-01-01')
+        create_task(deadline='2020-01-01', status='done')
+        create_task(deadline='2020-01-01', assign_to=self.user)
+        create_task(deadline='2999-01-01')
+
+        res = self.client.get(
+            TASK_URL, {'unassigned': 'true', 'overdue': 'true'})
+
+        self.assertEqual([t['id'] for t in res.data['results']], [overdue.id])
+
+    def test_filter_tasks_invalid_params(self):
+        """Test invalid filter values are rejected."""
+        for params in [
+            {'status': 'unknown'},
+            {'assign_to': 'me'},
+            {'deadline_before': '01-06-2025'},
+            {'unassigned': 'true', 'assign_to': self.user.id},
+        ]:
+            res = self.client.get(TASK_URL, params)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BulkTaskAPITests(TestCase):
+    """Test bulk task API requests."""
+    def setUp(self):
+        self.client = APIClient()
+        self.manager = get_user_model().objects.create(
+            email='manager@example.com',
+            password='testpass123',
+            is_manager=True
+        )
+        self.user = get_user_model().objects.create(
+            email='user@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(self.manager)
+
+    def test_bulk_create_tasks(self):
+        """Test creating many tasks in one request."""
+        payload = [
+            {'description': f'Task {i}', 'deadline': '2025-06-01'}
+            for i in range(20)
+        ]
+        payload[0]['assign_to'] = self.user.id
+
+        with self.assertNumQueries(6):
+            res = self.client.post(BULK_TASK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data), 20)
+        self.assertEqual(Task.objects.filter(user=self.manager).count(), 20)
+        self.assertEqual(Task.objects.get(assign_to=self.user).description,
+                         'Task 0')
+
+    def test_bulk_create_returns_item_errors(self):
+        """Test invalid items are reported and nothing is created."""
+        payload = [
+            {'description': 'Valid', 'deadline': '2025-06-01'},
+            {'description': 'No deadline'},
+            {'description': 'Bad user', 'deadline': '2025-06-01',
+             'assign_to': 999999},
+        ]
+        res = self.client.post(BULK_TASK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn('deadline', res.data[1])
+        self.assertFalse(Task.objects.exists())
+
+        res = self.client.post(BULK_TASK_URL, payload[::2], format='json')
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn('assign_to', res.data[1])
+
+    def test_bulk_create_requires_manager(self):
+        """Test employees cannot create tasks in bulk."""
+        self.client.force_authenticate(self.user)
+        res = self.client.post(BULK_TASK_URL, [
+            {'description': 'Task', 'deadline': '2025-06-01'}
+            ], format='json')
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_bulk_partial_update(self):
+        """Test updating many tasks by id."""
+        task1 = create_task(user=self.manager)
+        task2 = create_task(user=self.manager)
+        payload = [
+            {'id': task1.id, 'status': 'done'},
+            {'id': task2.id, 'assign_to': self.user.id,
+             'description': 'Reassigned'},
+        ]
+        res = self.client.patch(BULK_TASK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        task1.refresh_from_db()
+        task2.refresh_from_db()
+        self.assertEqual(task1.status, 'done')
+        self.assertEqual(task2.assign_to, self.user)
+        self.assertEqual(task2.description, 'Reassigned')
+
+    def test_bulk_partial_update_unknown_task(self):
+        """Test unknown ids are reported and nothing is changed."""
+        task = create_task(user=self.manager)
+        payload = [
+            {'id': task.id, 'status': 'done'},
+            {'id': 999999, 'status': 'done'},
+        ]
+        res = self.client.patch(BULK_TASK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn('id', res.data[1])
+        task.refresh_from_db()
+        self.assertEqual(task.status, 'opened')
+
+    def test_bulk_assign_and_status(self):
+        """Test reassigning and changing status of many tasks."""
+        tasks = [create_task(user=self.manager) for _ in range(3)]
+        ids = [task.id for task in tasks]
+
+        res = self.client.post(
+            reverse('task:bulk-assign'),
+            {'ids': ids + [999999], 'assign_to': self.user.id},
+            format='json')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['updated'], 3)
+        self.assertEqual(list(res.data['errors']), [999999])
+        self.assertEqual(Task.objects.filter(assign_to=self.user).count(), 3)
+
+        res = self.client.post(
+            reverse('task:bulk-status'),
+            {'ids': ids, 'status': 'in_progress'}, format='json')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            Task.objects.filter(status='in_progress').count(), 3)
+
+
+class TaskExportAPITests(TestCase):
+    """Test streaming task export."""
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create(
+            email='user@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_export_tasks_csv(self):
+        """Test exporting filtered tasks as CSV."""
+        task = create_task(description='Write, report', status='done')
+        create_task(status='opened')
+
+        res = self.client.get(
+            reverse('task:task-export', args=['csv']), {'status': 'done'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'], 'text/csv')
+        rows = list(csv.reader(
+            b''.join(res.streaming_content).decode().splitlines()))
+        self.assertEqual(rows[0], [
+            'id', 'description', 'status', 'deadline', 'user', 'assign_to'])
+        self.assertEqual(rows[1:], [
+            [str(task.id), 'Write, report', 'done', '2025-06-01', '', '']])
+
+    def test_export_tasks_ndjson(self):
+        """Test exporting tasks as NDJSON."""
+        task = create_task(assign_to=self.user)
+
+        res = self.client.get(reverse('task:task-export', args=['ndjson']))
+
+        self.assertEqual(res['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(res.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line) for line in lines], [{
+            'id': task.id, 'description': task.description,
+            'status': 'opened', 'deadline': '2025-06-01',
+            'user': None, 'assign_to': self.user.id,
+        }])
+
+
+class ConditionalTaskAPITests(TestCase):
+    """Test ETag support of task APIs."""
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='testpass123',
+        )
+        self.client.force_authenticate(self.user)
+        self.task = create_task()
+
+    def test_list_not_modified(self):
+        """Test unchanged task list answers 304 with one query."""
+        res = self.client.get(TASK_URL)
+        etag = res['ETag']
+
+        with self.assertNumQueries(1):
+            res = self.client.get(TASK_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res['ETag'], etag)
+        self.assertEqual(res.content, b'')
+
+    def test_list_changed_after_update_and_delete(self):
+        """Test list ETag changes when tasks change or go away."""
+        other = create_task()
+        etag = self.client.get(TASK_URL)['ETag']
+        self.task.status = 'done'
+        self.task.save()
+
+        res = self.client.get(TASK_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        etag = res['ETag']
+        self.task.delete()
+        res = self.client.get(TASK_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [task['id'] for task in res.data['results']], [other.id])
+
+    def test_list_version_scoped_to_page(self):
+        """Test changes on other pages keep the page ETag."""
+        newest = create_task()
+        params = {'page_size': 1}
+        etag = self.client.get(TASK_URL, params)['ETag']
+        self.task.status = 'done'
+        self.task.save()
+
+        res = self.client.get(TASK_URL, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        newest.status = 'done'
+        newest.save()
+        res = self.client.get(TASK_URL, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_detail_changes_with_comments(self):
+        """Test detail ETag follows comments rendered inline."""
+        url = detail_url(self.task.id)
+        res = self.client.get(url)
+        self.assertIn('Last-Modified', res)
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=res['ETag'])
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Comment.objects.create(user=self.user, task=self.task, text='Hi')
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=res['ETag'])
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['comments']), 1)
+
+    def test_bulk_status_changes_version(self):
+        """Test bulk updates bump the task version."""
+        manager = get_user_model().objects.create_user(
+            email='manager@example.com',
+            password='testpass123',
+            is_manager=True
+        )
+        url = detail_url(self.task.id)
+        etag = self.client.get(url)['ETag']
+        self.client.force_authenticate(manager)
+        self.client.post(reverse('task:bulk-status'), {
+            'ids': [self.task.id], 'status': 'done'}, format='json')
+
+        self.client.force_authenticate(self.user)
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['status'], 'done')
+
+
+class ClaimTaskAPITests(TestCase):
+    """Test claiming tasks through the API."""
+    def setUp(self):
+        self.client = APIClient()
+        self.manager = get_user_model().objects.create_user(
+            email='manager@example.com',
+            password='testpass123',
+            is_manager=True
+        )
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='testpass123',
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_claim_task(self):
+        """Test task is claimed once and then conflicts."""
+        task = create_task(user=self.manager)
+        url = reverse('task:task-claim', args=[task.id])
+
+        res = self.client.post(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['assign_to'], self.user.id)
+        self.assertEqual(res.data['status'], 'in_progress')
+
+        res = self.client.post(url)
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+
+    def test_claim_missing_task(self):
+        """Test claiming not existing task returns 404."""
+        res = self.client.post(reverse('task:task-claim', args=[1000]))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_claim_next(self):
+        """Test claim next hands out earliest task until none is left."""
+        create_task(user=self.manager, deadline='2025-06-02')
+        first = create_task(user=self.manager, deadline='2025-06-01')
+        url = reverse('task:task-claim-next')
+
+        res = self.client.post(url)
+        self.assertEqual(res.data['id'], first.id)
+        self.client.post(url)
+        res = self.client.post(url)
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+
+
+class TaskEventAPITests(TestCase):
+    """Test task API records status history."""
+    def setUp(self):
+        self.client = APIClient()
+        self.manager = get_user_model().objects.create_user(
+            email='manager@example.com',
+            password='testpass123',
+            is_manager=True
+        )
+        self.client.force_authenticate(self.manager)
+
+    def test_create_and_update_record_events(self):
+        """Test creating and finishing a task leaves two events."""
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(
+                CREATE_TASK_URL, get_sample_task_payload())
+        task_id = res.data['id']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(detail_url(task_id), {'status': 'done'})
+            self.client.patch(detail_url(task_id), {'description': 'New'})
+
+        events = TaskEvent.objects.filter(task_id=task_id).order_by('id')
+        self.assertEqual(
+            [(e.from_status, e.to_status) for e in events],
+            [('', 'opened'), ('opened', 'done')])
+        self.assertTrue(all(e.actor == self.manager for e in events))
+
+    def test_bulk_status_records_events_in_one_insert(self):
+        """Test bulk status change saves all events with one query."""
+        tasks = [create_task(user=self.manager) for _ in range(3)]
+        create_task(user=self.manager, status='done')
+        ids = [task.id for task in tasks]
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.client.post(
+                reverse('task:bulk-status'),
+                {'ids': ids, 'status': 'done'}, format='json')
+        with self.assertNumQueries(1):
+            for callback in callbacks:
+                callback()
+
+        self.assertEqual(TaskEvent.objects.filter(
+            task_id__in=ids, from_status='opened', to_status='done'
+            ).count(), 3)
+
+
+class TaskBoardAPITests(TestCase):
+    """Test the task board API."""
+    def setUp(self):
+        self.client = APIClient()
+        users = get_user_model().objects
+        self.manager = users.create_user(
+            email='manager@example.com', is_manager=True)
+        self.team = Team.objects.create(name='Alpha', manager=self.manager)
+        self.member = users.create_user(
+            email='member@example.com', team=self.team)
+        self.client.force_authenticate(self.member)
+
+    def test_board_columns_limited_with_totals(self):
+        """Test each column holds earliest tasks and the column total."""
+        for day in (5, 1, 3, 2):
+            create_task(user=self.manager, deadline=f'2025-06-0{day}')
+        create_task(user=self.manager, assign_to=self.member,
+                    status='in_progress')
+        for _ in range(3):
+            create_task(user=self.manager, status='done')
+        create_task(description='Other manager')
+
+        with self.assertNumQueries(1):
+            res = self.client.get(BOARD_URL, {'limit': 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(column['status'], column['total'], len(column['tasks']))
+             for column in res.data],
+            [('opened', 4, 2), ('in_progress', 1, 1), ('done', 3, 2)])
+        self.assertEqual(
+            [task['deadline'] for task in res.data[0]['tasks']],
+            ['2025-06-01', '2025-06-02'])
+
+    def test_board_skips_unknown_status(self):
+        """Test tasks with a status outside the choices are left out."""
+        create_task(user=self.manager)
+        create_task(user=self.manager, status='in progress')
+
+        res = self.client.get(BOARD_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([column['total'] for column in res.data], [1, 0, 0])
+
+    def test_board_of_manager(self):
+        """Test board of tasks created by a manager."""
+        other = get_user_model().objects.create_user(
+            email='other@example.com', is_manager=True)
+        create_task(user=other)
+        create_task(user=self.manager)
+
+        res = self.client.get(BOARD_URL, {'manager': other.id})
+
+        self.assertEqual(res.data[0]['total'], 1)
+
+    def test_board_requires_team_or_manager(self):
+        """Test user without team has to choose a board."""
+        loner = get_user_model().objects.create_user(
+            email='loner@example.com')
+        self.client.force_authenticate(loner)
+
+        res = self.client.get(BOARD_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -2,8 +2,11 @@
 Test for Task model.
 """
 
+from datetime import timedelta
+
 from django.test import TestCase
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from ..import models
 
 
@@ -39,3 +42,45 @@ class ModelTaskTest(TestCase):
             text='An example comment'
         )
         self.assertEqual(str(comment), comment.text)
+
+    def test_comments_update_task_activity(self):
+        """Test comment count and last activity follow comments."""
+        user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='testpass123',
+        )
+        last_week = timezone.now() - timedelta(days=7)
+        task = models.Task.objects.create(
+            description='some description',
+            deadline='2025-06-01',
+            last_activity_at=last_week
+        )
+        first = models.Comment.objects.create(
+            user=user, task=task, text='First')
+        models.Comment.objects.create(user=user, task=task, text='Second')
+        task.refresh_from_db()
+        self.assertEqual(task.comment_count, 2)
+        self.assertGreater(task.last_activity_at, last_week)
+
+        first.delete()
+        task.refresh_from_db()
+        self.assertEqual(task.comment_count, 1)
+
+    def test_stale_save_keeps_comment_count(self):
+        """Test saving a task loaded before a comment keeps the count."""
+        user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='testpass123',
+        )
+        task = models.Task.objects.create(
+            description='some description',
+            deadline='2025-06-01'
+        )
+        models.Comment.objects.create(user=user, task=task, text='Comment')
+
+        task.status = 'done'
+        task.save()
+
+        task.refresh_from_db()
+        self.assertEqual(task.comment_count, 1)
+        self.assertEqual(task.status, 'done')
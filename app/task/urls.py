@@ -2,7 +2,9 @@
 URL mapping for the task API.
 """
 from django.urls import path, include
-from task.views import CreateTaskAPIView, ManageTasksAPIView, CommentAPIView
+from task.views import (
+    CreateTaskAPIView, ManageTasksAPIView, CommentAPIView, BulkTaskAPIView
+)
 from rest_framework.routers import DefaultRouter
 
 
@@ -14,5 +16,11 @@ app_name = 'task'
 
 urlpatterns = [
     path('create/', CreateTaskAPIView.as_view(), name='create'),
+    path('bulk/', BulkTaskAPIView.as_view(
+        {'post': 'create', 'patch': 'partial_update'}), name='bulk'),
+    path('bulk/assign/', BulkTaskAPIView.as_view(
+        {'post': 'assign'}), name='bulk-assign'),
+    path('bulk/status/', BulkTaskAPIView.as_view(
+        {'post': 'change_status'}), name='bulk-status'),
     path('', include(router.urls)),
 ]
@@ -1,18 +1,46 @@
 """
 Views for the task API.
 """
-from rest_framework import generics, permissions, mixins, viewsets
+from rest_framework import generics, permissions, mixins, viewsets, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+from django.utils.functional import cached_property
+from drf_spectacular.utils import extend_schema, extend_schema_view
 
 from task.serializers import (
     TaskSerializer,
     TaskDetailSerializer,
-    CommentSerializer
+    CommentSerializer,
+    TaskFilterSerializer,
+    TaskBulkCreateSerializer,
+    TaskBulkUpdateSerializer,
+    TaskBulkAssignSerializer,
+    TaskBulkStatusSerializer,
+    TaskBoardQuerySerializer,
+    TaskBoardColumnSerializer
 )
 from core.permissions import IsManagerOrReadOnly, IsOwnerOrReadOnly
+from core.services import (
+    invalidate_task_dashboards, claim_task, claim_next_task,
+    task_event, record_task_events, task_stats, change_user_stats
+)
+from core.export import stream_export, EXPORT_FORMATS
+from core.conditional import ConditionalGetMixin
+from core.fieldsets import SparseFieldsetMixin
+from core.throttling import TokenBucketThrottle
+from core.values import ValuesListMixin, build_rows, compile_row_converters
+from sync.events import publish_events
 
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
-from task.models import Task, Comment
+from task.models import Task, Comment, TaskEvent
+from team.models import Team
 
 
 class CreateTaskAPIView(generics.CreateAPIView):
@@ -20,13 +48,20 @@ class CreateTaskAPIView(generics.CreateAPIView):
     serializer_class = TaskSerializer
     authentication_classes = [JWTAuthentication]
     permission_classes = [permissions.IsAuthenticated, IsManagerOrReadOnly]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'task_create'
 
     def perform_create(self, serializer):
         """Create a new task."""
-        serializer.save(user=self.request.user)
+        task = serializer.save(user=self.request.user)
+        record_task_events([task_event(task, self.request.user.id, '')])
 
 
-class ManageTasksAPIView(mixins.DestroyModelMixin,
+@extend_schema_view(list=extend_schema(parameters=[TaskFilterSerializer]))
+class ManageTasksAPIView(ConditionalGetMixin,
+                         SparseFieldsetMixin,
+                         ValuesListMixin,
+                         mixins.DestroyModelMixin,
                          mixins.UpdateModelMixin,
                          mixins.ListModelMixin,
                          mixins.RetrieveModelMixin,
@@ -36,12 +71,55 @@ class ManageTasksAPIView(mixins.DestroyModelMixin,
     authentication_classes = [JWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
     queryset = Task.objects.all()
+    lookup_value_regex = r'\d+'
+    etag_related = ('comments',)
+
+    export_fields = {
+        'id': 'id',
+        'description': 'description',
+        'status': 'status',
+        'deadline': 'deadline',
+        'user': 'user_id',
+        'assign_to': 'assign_to_id',
+    }
 
     def get_queryset(self):
+        if self.action in ('list', 'export'):
+            return self.filter_tasks(self.queryset).order_by('-id')
+        return self.queryset.order_by('-id')
+
+    @cached_property
+    def filter_params(self):
+        """Return validated task filter query parameters."""
+        params = TaskFilterSerializer(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        return params.validated_data
+
+    def get_cursor_ordering(self):
+        """Return ordering requested for the task list."""
         if self.action == 'list':
-            return self.queryset.order_by('-id')
-        else:
-            return self.queryset.prefetch_related('comments').order_by('-id')
+            return self.filter_params['ordering']
+        return '-id'
+
+    def filter_tasks(self, queryset):
+        """Filter tasks by validated query parameters."""
+        data = self.filter_params
+        if 'status' in data:
+            queryset = queryset.filter(status=data['status'])
+        if 'assign_to' in data:
+            queryset = queryset.filter(assign_to_id=data['assign_to'])
+        if 'user' in data:
+            queryset = queryset.filter(user_id=data['user'])
+        if 'deadline_before' in data:
+            queryset = queryset.filter(deadline__lte=data['deadline_before'])
+        if 'deadline_after' in data:
+            queryset = queryset.filter(deadline__gte=data['deadline_after'])
+        if data['unassigned']:
+            queryset = queryset.filter(assign_to=None)
+        if data['overdue']:
+            queryset = queryset.filter(
+                deadline__lt=timezone.localdate()).exclude(status='done')
+        return queryset
 
     def get_serializer_class(self):
         """Return the serializer class for request."""
@@ -49,10 +127,260 @@ class ManageTasksAPIView(mixins.DestroyModelMixin,
             return TaskSerializer
         return self.serializer_class
 
+    def perform_update(self, serializer):
+        """Save task and record status or assignee change."""
+        previous = (serializer.instance.status,
+                    serializer.instance.assign_to_id)
+        task = serializer.save()
+        record_task_events([task_event(task, self.request.user.id, *previous)])
+
+    @extend_schema(responses=CommentSerializer(many=True))
+    @action(detail=True, url_path='comments', url_name='comments')
+    def task_comments(self, request, pk=None):
+        """Page comments of task newest first."""
+        if not Task.objects.filter(id=pk).exists():
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        converters = compile_row_converters(CommentSerializer(), Comment)
+        rows = Comment.objects.filter(task_id=pk).values(
+            *{lookup for lookup, _, _ in converters})
+        page = self.paginate_queryset(rows)
+        return self.get_paginated_response(build_rows(page, converters))
+
+    @extend_schema(request=None, responses=TaskSerializer)
+    @action(detail=True, methods=['post'])
+    def claim(self, request, pk=None):
+        """Take unassigned task, 409 if somebody has already taken it."""
+        if not claim_task(int(pk), request.user):
+            if not Task.objects.filter(id=pk).exists():
+                return Response(status=status.HTTP_404_NOT_FOUND)
+            return Response(
+                {'detail': 'Task has already been taken.'},
+                status=status.HTTP_409_CONFLICT)
+        return Response(TaskSerializer(Task.objects.get(id=pk)).data)
+
+    @extend_schema(request=None, responses=TaskSerializer)
+    @action(detail=False, methods=['post'], url_path='claim-next')
+    def claim_next(self, request):
+        """Take available task with the earliest deadline."""
+        task = claim_next_task(request.user)
+        if task is None:
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        return Response(TaskSerializer(task).data)
 
-class CommentAPIView(viewsets.ModelViewSet):
+    def get_board_tasks(self, data):
+        """Return tasks of the requested team or manager."""
+        user = self.request.user
+        if 'manager' in data:
+            return Task.objects.filter(user_id=data['manager'])
+        team_id = data.get('team')
+        if team_id is None:
+            if user.is_manager:
+                return Task.objects.filter(user=user)
+            if user.team_id is None:
+                raise ValidationError('Pass team or manager.')
+            team_id = user.team_id
+        return Task.objects.filter(
+            Q(assign_to__team_id=team_id) |
+            Q(user_id__in=Team.objects.filter(
+                pk=team_id).values('manager_id')))
+
+    @extend_schema(parameters=[TaskBoardQuerySerializer],
+                   responses=TaskBoardColumnSerializer(many=True))
+    @action(detail=False)
+    def board(self, request):
+        """Return earliest tasks and total of every status column."""
+        params = TaskBoardQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        converters = compile_row_converters(TaskSerializer(), Task)
+        lookups = {lookup for lookup, _, _ in converters}
+        columns = {value: {'status': value, 'total': 0, 'tasks': []}
+                   for value, _ in Task.task_status}
+        # Rows with a status outside the choices have no column.
+        rows = self.get_board_tasks(params.validated_data).filter(
+            status__in=columns
+        ).annotate(
+            position=Window(
+                RowNumber(), partition_by=F('status'),
+                order_by=(F('deadline').asc(), F('id').asc())),
+            total=Window(Count('id'), partition_by=F('status')),
+        ).filter(
+            position__lte=params.validated_data['limit']
+        ).order_by('status', 'position').values(*lookups, 'total')
+
+        for row in rows:
+            column = columns[row['status']]
+            column['total'] = row['total']
+            column['tasks'].append(row)
+        for column in columns.values():
+            column['tasks'] = build_rows(column['tasks'], converters)
+        return Response(list(columns.values()))
+
+    @extend_schema(parameters=[TaskFilterSerializer])
+    @action(detail=False, url_path=f'export/(?P<file_format>{EXPORT_FORMATS})')
+    def export(self, request, file_format):
+        """Stream filtered tasks as CSV or NDJSON."""
+        return stream_export(
+            self.get_queryset(), self.export_fields, file_format, 'tasks')
+
+
+class CommentAPIView(ConditionalGetMixin, SparseFieldsetMixin,
+                     ValuesListMixin, viewsets.ModelViewSet):
     """View for managing comments APIs."""
     serializer_class = CommentSerializer
     authentication_classes = [JWTAuthentication]
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrReadOnly]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'comment'
     queryset = Comment.objects.all().order_by('-id')
+
+
+class BulkTaskAPIView(viewsets.GenericViewSet):
+    """View for creating and changing many tasks at once."""
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [permissions.IsAuthenticated, IsManagerOrReadOnly]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'task_create'
+    queryset = Task.objects.all()
+
+    def get_serializer_class(self):
+        """Return the serializer class for request."""
+        if self.action == 'create':
+            return TaskBulkCreateSerializer
+        if self.action == 'assign':
+            return TaskBulkAssignSerializer
+        if self.action == 'change_status':
+            return TaskBulkStatusSerializer
+        return TaskBulkUpdateSerializer
+
+    def get_serializer(self, *args, **kwargs):
+        if self.action in ('create', 'partial_update'):
+            kwargs.update(many=True, max_length=settings.TASK_BULK_MAX_SIZE)
+        return super().get_serializer(*args, **kwargs)
+
+    def invalidate_dashboards(self, owners):
+        """Invalidate dashboards for (creator, assignee) pairs."""
+        for user_id, assign_to_id in set(owners):
+            invalidate_task_dashboards(user_id, assign_to_id)
+
+    def publish_changes(self, action, changes):
+        """Publish task events for (task id, user ids) pairs."""
+        publish_events(
+            (user_ids, {'type': 'task', 'action': action, 'id': pk})
+            for pk, user_ids in changes)
+
+    def create(self, request):
+        """Create tasks from a list."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            tasks = serializer.save(user=request.user)
+            self.invalidate_dashboards(
+                (task.user_id, task.assign_to_id) for task in tasks)
+            record_task_events(
+                task_event(task, request.user.id, '') for task in tasks)
+            change_user_stats(
+                task_stats(task.assign_to_id, task.status) for task in tasks)
+            self.publish_changes('created', (
+                (task.id, [task.user_id, task.assign_to_id])
+                for task in tasks))
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def partial_update(self, request):
+        """Update tasks listed with their ids."""
+        serializer = self.get_serializer(
+            self.get_queryset(), data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        ids = [item['id'] for item in serializer.validated_data
+               if 'id' in item]
+        with transaction.atomic():
+            previous = {
+                pk: (user_id, assign_to_id, task_status, grade)
+                for pk, user_id, assign_to_id, task_status, grade in
+                self.get_queryset().select_for_update(of=('self',)).filter(
+                    id__in=ids).values_list(
+                        'id', 'user_id', 'assign_to_id', 'status',
+                        'evaluation__grade')
+            }
+            tasks = serializer.save()
+            self.invalidate_dashboards([
+                (user_id, assign_to_id)
+                for user_id, assign_to_id, _, _ in previous.values()
+            ] + [(task.user_id, task.assign_to_id) for task in tasks])
+            record_task_events(
+                task_event(task, request.user.id, previous[task.id][2],
+                           previous[task.id][1])
+                for task in tasks)
+            change_user_stats(
+                change for task in tasks for change in (
+                    task_stats(*previous[task.id][1:], sign=-1),
+                    task_stats(task.assign_to_id, task.status,
+                               previous[task.id][3])))
+            self.publish_changes('updated', (
+                (task.id, [task.user_id, task.assign_to_id,
+                           *previous[task.id][:2]])
+                for task in tasks))
+        return Response(serializer.data)
+
+    def update_many(self, ids, **fields):
+        """Set fields on tasks and return ids that were not found."""
+        with transaction.atomic():
+            tasks = self.get_queryset().select_for_update(
+                of=('self',)).filter(id__in=ids)
+            owners = list(tasks.values_list(
+                'id', 'user_id', 'assign_to_id', 'status',
+                'evaluation__grade'))
+            tasks.update(**fields, updated_at=timezone.now())
+            record_task_events(
+                TaskEvent(
+                    task_id=pk, actor_id=self.request.user.id,
+                    from_status=task_status,
+                    to_status=fields.get('status', task_status),
+                    assign_to_id=fields.get('assign_to_id', assign_to_id))
+                for pk, _, assign_to_id, task_status, _ in owners
+                if fields.get('status', task_status) != task_status or
+                fields.get('assign_to_id', assign_to_id) != assign_to_id)
+            new_assign_to = fields.get('assign_to_id')
+            self.invalidate_dashboards(
+                pair for _, user_id, assign_to_id, _, _ in owners
+                for pair in [
+                    (user_id, assign_to_id),
+                    (user_id, new_assign_to if 'assign_to_id' in fields
+                     else assign_to_id),
+                ])
+            change_user_stats(
+                change for _, _, assign_to_id, task_status, grade in owners
+                for change in (
+                    task_stats(assign_to_id, task_status, grade, sign=-1),
+                    task_stats(fields.get('assign_to_id', assign_to_id),
+                               fields.get('status', task_status), grade)))
+            self.publish_changes('updated', (
+                (pk, [user_id, assign_to_id, new_assign_to])
+                for pk, user_id, assign_to_id, _, _ in owners))
+        found = {owner[0] for owner in owners}
+        return [pk for pk in ids if pk not in found]
+
+    def assign(self, request):
+        """Assign listed tasks to a user."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        assign_to = serializer.validated_data['assign_to']
+        missing = self.update_many(
+            serializer.validated_data['ids'],
+            assign_to_id=assign_to.id if assign_to else None)
+        return self.bulk_response(serializer.validated_data['ids'], missing)
+
+    def change_status(self, request):
+        """Change status of listed tasks."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        missing = self.update_many(
+            serializer.validated_data['ids'],
+            status=serializer.validated_data['status'])
+        return self.bulk_response(serializer.validated_data['ids'], missing)
+
+    def bulk_response(self, ids, missing):
+        """Return count of updated tasks and per-id errors."""
+        return Response({
+            'updated': len(set(ids)) - len(set(missing)),
+            'errors': {pk: 'Task not found.' for pk in missing},
+        })
@@ -11,6 +11,7 @@ class Team(models.Model):
     manager = models.ForeignKey(
         'user.User', on_delete=models.SET_NULL,
         null=True, related_name='team_manager')
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
@@ -5,9 +5,10 @@ Serializers for the team API View.
 from rest_framework import serializers
 from team.models import Team
 from user.serializers import UserSerializer
+from core.fieldsets import ExpandableFieldsMixin
 
 
-class TeamSerializer(serializers.ModelSerializer):
+class TeamSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     """Serializer for list team object."""
     class Meta:
         model = Team
@@ -17,7 +18,32 @@ class TeamSerializer(serializers.ModelSerializer):
 
 class TeamDetailSerializer(TeamSerializer):
     """Serializer for team object."""
-    members = UserSerializer(many=True, required=False)
+    expandable_fields = {'members': UserSerializer}
 
     class Meta(TeamSerializer.Meta):
         fields = TeamSerializer.Meta.fields
+
+
+class MemberWorkloadSerializer(serializers.Serializer):
+    """Serializer for task counts of a team member."""
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    email = serializers.EmailField()
+    opened = serializers.IntegerField()
+    in_progress = serializers.IntegerField()
+    done = serializers.IntegerField()
+    overdue = serializers.IntegerField()
+    average_grade = serializers.FloatField(allow_null=True)
+
+
+class TeamWorkloadSerializer(serializers.Serializer):
+    """Serializer for task counts of a team and its members."""
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    manager = serializers.IntegerField(allow_null=True)
+    opened = serializers.IntegerField()
+    in_progress = serializers.IntegerField()
+    done = serializers.IntegerField()
+    overdue = serializers.IntegerField()
+    average_grade = serializers.FloatField(allow_null=True)
+    members = MemberWorkloadSerializer(many=True)
@@ -2,18 +2,25 @@
 Tests for the team API.
 """
 
+from datetime import timedelta
+
 from django.test import TestCase
 from django.urls import reverse
+from django.core.cache import cache
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 
 from rest_framework.test import APIClient
 from rest_framework import status
 
 from team.models import Team
+from task.models import Task
+from evaluation.models import Evaluation
 from team.serializers import TeamSerializer, TeamDetailSerializer
 
 
 TEAM_URL = reverse('team:team-list')
+WORKLOAD_URL = reverse('team:team-workload')
 
 
 def detail_url(team_id):
@@ -62,8 +69,8 @@ class PrivateCommentsUserAPITests(TestCase):
         teams = Team.objects.all().order_by('-id')
         serializer = TeamSerializer(teams, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 2)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(len(res.data['results']), 2)
+        self.assertEqual(res.data['results'], serializer.data)
 
 
 class PrivateCommentsAdminUserAPITests(TestCase):
@@ -125,3 +132,151 @@ class PrivateCommentsAdminUserAPITests(TestCase):
         team.refresh_from_db()
         self.assertEqual(team.manager, manager)
         self.assertEqual(team.name, 'test')
+
+    def test_new_member_changes_team_etag(self):
+        """Test team detail ETag changes when a member joins."""
+        team = Team.objects.create(name='test')
+        url = detail_url(team.id)
+        etag = self.client.get(url)['ETag']
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        get_user_model().objects.create_user(
+            email='user@example.com',
+            password='test123',
+            team=team
+        )
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['members']), 1)
+
+    def test_expanded_members_answered_in_full(self):
+        """Test expanded members are not versioned by the team."""
+        team = Team.objects.create(name='test')
+        member = get_user_model().objects.create_user(
+            email='user@example.com', password='test123', team=team)
+        url = detail_url(team.id) + '?expand=members'
+        res = self.client.get(url)
+        self.assertNotIn('ETag', res)
+
+        task = Task.objects.create(
+            description='New', deadline='2025-06-01', assign_to=member)
+        res = self.client.get(url, HTTP_IF_NONE_MATCH='"stale"')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['members'][0]['tasks'], [task.id])
+
+    def test_expand_members_and_tasks(self):
+        """Test nested members and tasks are read with one query each."""
+        team = Team.objects.create(name='test')
+        for i in range(3):
+            user = get_user_model().objects.create_user(
+                email=f'user{i}@example.com',
+                password='test123',
+                team=team
+            )
+            Task.objects.create(
+                description='Task', deadline='2025-06-01', assign_to=user)
+        url = detail_url(team.id)
+
+        res = self.client.get(url)
+        self.assertEqual(len(res.data['members']), 3)
+        self.assertIsInstance(res.data['members'][0], int)
+
+        with self.assertNumQueries(3):
+            res = self.client.get(url, {'expand': 'members.tasks'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        member = res.data['members'][0]
+        self.assertEqual(member['tasks'][0]['description'], 'Task')
+        self.assertNotIn('search_vector', member['tasks'][0])
+
+
+class TeamWorkloadAPITests(TestCase):
+    """Test team workload API requests."""
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        users = get_user_model().objects
+        self.manager = users.create_user(
+            email='manager@example.com', is_manager=True)
+        self.team = Team.objects.create(name='Alpha', manager=self.manager)
+        self.busy = users.create_user(
+            email='busy@example.com', name='Busy', team=self.team)
+        self.idle = users.create_user(
+            email='idle@example.com', name='Idle', team=self.team)
+        self.other_team = Team.objects.create(name='Beta')
+        today = timezone.localdate()
+        for status_, deadline in (
+            ('opened', today - timedelta(days=1)),
+            ('in_progress', today),
+            ('in_progress', today - timedelta(days=3)),
+            ('done', today - timedelta(days=5)),
+            ('done', today),
+        ):
+            Task.objects.create(
+                user=self.manager, assign_to=self.busy, status=status_,
+                description='Task', deadline=deadline)
+        for grade, task in zip((4, 5), Task.objects.filter(status='done')):
+            Evaluation.objects.create(
+                user=self.manager, grade=grade, task_id=task)
+
+    def test_manager_sees_team_counts(self):
+        """Test counts and average grade per team and member."""
+        self.client.force_authenticate(self.manager)
+
+        res = self.client.get(WORKLOAD_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 1)
+        team = res.data[0]
+        self.assertEqual(
+            [team[key] for key in (
+                'name', 'opened', 'in_progress', 'done', 'overdue',
+                'average_grade')],
+            ['Alpha', 1, 2, 2, 2, 4.5])
+        members = {member['name']: member for member in team['members']}
+        self.assertEqual(members['Busy']['in_progress'], 2)
+        self.assertEqual(members['Busy']['average_grade'], 4.5)
+        self.assertEqual(members['Idle']['opened'], 0)
+        self.assertIsNone(members['Idle']['average_grade'])
+
+    def test_admin_sees_all_teams_from_one_query(self):
+        """Test workload is computed with one query and then cached."""
+        admin = get_user_model().objects.create_superuser(
+            email='admin@example.com', password='testpass123')
+        self.client.force_authenticate(admin)
+
+        with self.assertNumQueries(1):
+            res = self.client.get(WORKLOAD_URL)
+        with self.assertNumQueries(0):
+            self.client.get(WORKLOAD_URL)
+
+        self.assertEqual([team['name'] for team in res.data],
+                         ['Alpha', 'Beta'])
+        self.assertEqual(res.data[1]['members'], [])
+
+    def test_member_of_other_team_sees_only_own_team(self):
+        """Test teams of others are hidden."""
+        outsider = get_user_model().objects.create_user(
+            email='outsider@example.com', team=self.other_team)
+        self.client.force_authenticate(outsider)
+
+        res = self.client.get(WORKLOAD_URL)
+
+        self.assertEqual([team['name'] for team in res.data], ['Beta'])
+
+    def test_task_change_invalidates_workload(self):
+        """Test cached workload is dropped when a task changes."""
+        self.client.force_authenticate(self.manager)
+        self.client.get(WORKLOAD_URL)
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.create(
+                user=self.manager, assign_to=self.idle,
+                description='New', deadline=timezone.localdate())
+
+        res = self.client.get(WORKLOAD_URL)
+
+        members = {member['name']: member
+                   for member in res.data[0]['members']}
+        self.assertEqual(members['Idle']['opened'], 1)
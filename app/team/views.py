@@ -2,17 +2,26 @@
 Views for team API.
 """
 
+from drf_spectacular.utils import extend_schema
 from rest_framework import viewsets, permissions
+from rest_framework.decorators import action
+from rest_framework.response import Response
 
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
-from team.serializers import TeamDetailSerializer, TeamSerializer
+from team.serializers import (
+    TeamDetailSerializer, TeamSerializer, TeamWorkloadSerializer
+)
 from team.models import Team
 
 from core.permissions import IsAdminOrReadOnly
+from core.conditional import ConditionalGetMixin
+from core.fieldsets import SparseFieldsetMixin
+from core.services import get_team_workload
 
 
-class TeamAPIView(viewsets.ModelViewSet):
+class TeamAPIView(ConditionalGetMixin, SparseFieldsetMixin,
+                  viewsets.ModelViewSet):
     """View for managing team APIs."""
     serializer_class = TeamDetailSerializer
     authentication_classes = [JWTAuthentication]
@@ -20,13 +29,16 @@ class TeamAPIView(viewsets.ModelViewSet):
     queryset = Team.objects.all()
 
     def get_queryset(self):
-        if self.action == 'list':
-            return self.queryset.order_by('-id')
-        else:
-            return self.queryset.prefetch_related('members').order_by('-id')
+        return self.queryset.order_by('-id')
 
     def get_serializer_class(self):
         """Return the serializer class for request."""
         if self.action == 'list':
             return TeamSerializer
         return self.serializer_class
+
+    @extend_schema(responses=TeamWorkloadSerializer(many=True))
+    @action(detail=False)
+    def workload(self, request):
+        """Return task counts and average grade per team and member."""
+        return Response(get_team_workload(request.user))
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 00:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0005_alter_user_email'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='receive_digest',
+            field=models.BooleanField(default=True),
+        ),
+    ]
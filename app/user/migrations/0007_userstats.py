@@ -0,0 +1,64 @@
+# Generated by Django 4.2.30 on 2026-10-18 00:30
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0006_user_receive_digest'),
+        ('task', '0016_comment_text_html'),
+        ('evaluation', '0005_updated_at'),
+        ('meeting', '0010_sync_xid'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('open_tasks', models.IntegerField(default=0)),
+                ('in_progress_tasks', models.IntegerField(default=0)),
+                ('done_tasks', models.IntegerField(default=0)),
+                ('graded_tasks', models.IntegerField(default=0)),
+                ('grade_sum', models.IntegerField(default=0)),
+                ('upcoming_meetings', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunSQL(
+            sql='''
+            INSERT INTO user_userstats (
+                user_id, open_tasks, in_progress_tasks, done_tasks,
+                graded_tasks, grade_sum, upcoming_meetings)
+            SELECT u.id,
+                coalesce(tasks.open, 0), coalesce(tasks.in_progress, 0),
+                coalesce(tasks.done, 0), coalesce(tasks.graded, 0),
+                coalesce(tasks.grade_sum, 0), coalesce(meetings.count, 0)
+            FROM user_user u LEFT JOIN (
+                SELECT task.assign_to_id,
+                    count(*) FILTER (WHERE task.status = 'opened') AS open,
+                    count(*) FILTER (
+                        WHERE task.status = 'in_progress') AS in_progress,
+                    count(*) FILTER (WHERE task.status = 'done') AS done,
+                    count(evaluation.id) FILTER (
+                        WHERE task.status = 'done') AS graded,
+                    sum(evaluation.grade) FILTER (
+                        WHERE task.status = 'done') AS grade_sum
+                FROM task_task task
+                LEFT JOIN evaluation_evaluation evaluation
+                    ON evaluation.task_id_id = task.id
+                GROUP BY task.assign_to_id
+            ) tasks ON tasks.assign_to_id = u.id LEFT JOIN (
+                SELECT participant.user_id, count(*) AS count
+                FROM meeting_meeting_participants participant
+                JOIN meeting_meeting meeting
+                    ON meeting.id = participant.meeting_id
+                WHERE meeting.date >= date_trunc('day', now())
+                GROUP BY participant.user_id
+            ) meetings ON meetings.user_id = u.id;
+            ''',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -37,6 +37,7 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_manager = models.BooleanField(default=False)
     is_staff = models.BooleanField(default=False)
     is_active = models.BooleanField(default=True)
+    receive_digest = models.BooleanField(default=True)
     team = models.ForeignKey(
         'team.Team', on_delete=models.SET_NULL,
         null=True, related_name='members'
@@ -47,3 +48,31 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     def __str__(self):
         return self.name
+
+
+class UserStats(models.Model):
+    """Counters of tasks assigned to user and of upcoming meetings.
+
+    Kept up to date by signals and bulk writes, rebuilt from the source
+    tables by the reconcile_user_stats command.
+    """
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True,
+        related_name='stats'
+    )
+    open_tasks = models.IntegerField(default=0)
+    in_progress_tasks = models.IntegerField(default=0)
+    done_tasks = models.IntegerField(default=0)
+    graded_tasks = models.IntegerField(default=0)
+    grade_sum = models.IntegerField(default=0)
+    upcoming_meetings = models.IntegerField(default=0)
+
+    @property
+    def average_grade(self):
+        """Return average grade of done tasks, None if none is graded."""
+        if not self.graded_tasks:
+            return None
+        return self.grade_sum / self.graded_tasks
+
+    def __str__(self):
+        return f'stats of {self.user_id}'
@@ -6,17 +6,19 @@ from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
 from task.serializers import TaskSerializer
+from core.fieldsets import ExpandableFieldsMixin
+from user.models import UserStats
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     """Serializer for the user object."""
-    tasks = TaskSerializer(many=True, required=False)
+    expandable_fields = {'tasks': TaskSerializer}
 
     class Meta:
         model = get_user_model()
         fields = [
             'id', 'email', 'password', 'name', 'is_manager',
-            'is_superuser', 'tasks'
+            'is_superuser', 'receive_digest', 'tasks'
             ]
         extra_kwargs = {'password': {'write_only': True, 'min_length': 5}}
 
@@ -34,3 +36,12 @@ class UserSerializer(serializers.ModelSerializer):
             user.save()
 
         return user
+
+
+class UserStatsSerializer(serializers.ModelSerializer):
+    """Serializer for the stats of a user."""
+    average_grade = serializers.FloatField(read_only=True, allow_null=True)
+
+    class Meta:
+        model = UserStats
+        exclude = ['user']
@@ -4,17 +4,15 @@ URL mapping for the user API.
 
 from django.urls import path
 from user import views
-from rest_framework_simplejwt.views import (
-    TokenObtainPairView,
-    TokenRefreshView,
-)
+from rest_framework_simplejwt.views import TokenRefreshView
 
 
 app_name = 'user'
 
 urlpatterns = [
     path('create/', views.CreateUserView.as_view(), name='create'),
-    path('token/', TokenObtainPairView.as_view(), name='token'),
+    path('token/', views.TokenView.as_view(), name='token'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('me/', views.ManageUserView.as_view(), name='me'),
+    path('me/stats/', views.UserStatsView.as_view(), name='me-stats'),
 ]
@@ -2,8 +2,12 @@
 Views for the user API.
 """
 from rest_framework import generics, permissions
-from user.serializers import UserSerializer
+from user.serializers import UserSerializer, UserStatsSerializer
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.views import TokenObtainPairView
+from core.fieldsets import SparseFieldsetMixin
+from core.services import get_user_stats
+from core.throttling import TokenBucketThrottle
 
 
 class CreateUserView(generics.CreateAPIView):
@@ -11,7 +15,14 @@ class CreateUserView(generics.CreateAPIView):
     serializer_class = UserSerializer
 
 
-class ManageUserView(generics.RetrieveUpdateDestroyAPIView):
+class TokenView(TokenObtainPairView):
+    """Obtain JWT pair, throttled like the login page."""
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'login'
+
+
+class ManageUserView(SparseFieldsetMixin,
+                     generics.RetrieveUpdateDestroyAPIView):
     """Manage the authenticated user."""
     serializer_class = UserSerializer
     authentication_classes = [JWTAuthentication]
@@ -20,3 +31,14 @@ class ManageUserView(generics.RetrieveUpdateDestroyAPIView):
     def get_object(self):
         """Retrieve and return the authenticated user."""
         return self.request.user
+
+
+class UserStatsView(generics.RetrieveAPIView):
+    """Task, grade and meeting figures of the authenticated user."""
+    serializer_class = UserStatsSerializer
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_object(self):
+        """Retrieve and return stats of the authenticated user."""
+        return get_user_stats(self.request.user)